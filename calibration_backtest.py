@@ -0,0 +1,391 @@
+"""
+calibration_backtest.py — walk-forward replay of the calibration constants.
+
+CAL_HALF_LIFE_WEEKS, CAL_MIN_SAMPLES, CAL_MAX_FACTOR and PARLAY_CAL_MIN_SAMPLES
+were tuned by hand, and the only way to see what a change does was to ship it
+and wait weeks for legs to resolve. This replays the resolved log instead, one
+simulated morning at a time:
+
+  - each morning's leg and parlay factors are rebuilt from the parlays logged
+    on earlier days only — the same dedupe, recency weighting and clamps as
+    parlay_tracker.get_calibration / get_parlay_calibration, per sport, which
+    is how daily_parlay_gen asks for them
+  - that day's legs are re-priced under those factors, and its parlays are
+    re-priced from the re-priced legs times the parlay factor for their size
+  - the result is scored: log-loss and Brier on unique props and on parlays,
+    and flat-bet ROI on the parlays the candidate would have recommended
+
+A logged predicted_hit_rate already has the factor in force that morning baked
+in. That factor is read back from calibration_history.jsonl where a snapshot
+exists, otherwise taken from this replay under the shipped constants, and
+divided out before the candidate's is applied — so the shipped constants score
+as (very nearly) what was actually logged.
+
+Legs are assumed resolved by the morning after the day they were logged on;
+the log keeps no resolution timestamp, and the nightly resolver makes that the
+normal case.
+
+    python calibration_backtest.py --half-life 2,3,4 --min-samples 10,15,25
+
+sweeps the grid over a process pool and prints the runs best-first.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import parlay_tracker as pt
+
+DEFAULT_PARAMS = {
+    "half_life_weeks":    pt.CAL_HALF_LIFE_WEEKS,
+    "min_samples":        pt.CAL_MIN_SAMPLES,
+    "max_factor":         pt.CAL_MAX_FACTOR,
+    "min_factor":         pt.CAL_MIN_FACTOR,
+    "parlay_min_samples": pt.PARLAY_CAL_MIN_SAMPLES,
+}
+SWEEP_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+RANK_BY = "leg_log_loss"
+
+# The same bounds the model and the parlay builder clip to.
+LEG_RATE_BOUNDS = (0.03, 0.97)
+PARLAY_PROB_BOUNDS = (0.001, 0.99)
+
+
+# ── History ──────────────────────────────────────────────────────────────────
+
+def _latest(n_days: int, n_scopes: int, day, scope, wk) -> np.ndarray:
+    """
+    (n_days + 1, n_scopes): the newest week ordinal logged in each scope before each
+    morning — the week the running sums decay against. NaN until a scope has one.
+    """
+    out = np.full((n_days + 1, n_scopes), -np.inf)
+    dated = ~np.isnan(wk)
+    np.maximum.at(out, (day[dated] + 1, scope[dated]), wk[dated])
+    out = np.maximum.accumulate(out, axis=0)
+    out[np.isinf(out)] = np.nan
+    return out
+
+
+def _logged_factors(days, scopes: list, groups: pd.Index, fallback: np.ndarray) -> np.ndarray:
+    """
+    The leg factors actually in force each morning: the calibration_history snapshot
+    for that day where one was taken, the replay under the shipped constants otherwise.
+    A stat missing from a snapshot's sport was not calibrated yet, i.e. 1.0.
+    """
+    out = fallback.copy()
+    day_pos = {d: i for i, d in enumerate(days)}
+    try:
+        with open(pt.CAL_HISTORY_PATH, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    except (FileNotFoundError, ValueError):
+        return out
+    sport_of = groups.str.split("\x1f").str[0]
+    stat_of = groups.str.split("\x1f").str[1]
+    for rec in records:
+        i = day_pos.get(rec.get("date"))
+        if i is None:
+            continue
+        for sport, factors in (rec.get("legs") or {}).items():
+            if sport not in scopes:
+                continue
+            cols = np.flatnonzero(sport_of == sport)
+            out[i, cols] = [float(factors.get(stat_of[c], 1.0)) for c in cols]
+    return out
+
+
+def load_history(sport: str | None = None, start: date | None = None,
+                 end: date | None = None) -> dict:
+    """
+    Flatten the log — archive included — into the arrays a replay needs. Everything
+    is plain numpy so one copy can be shipped to each worker of a sweep.
+
+    start/end bound the days that are *scored*; earlier days still feed the factors.
+    """
+    parlays, legs = pt._frames()
+    parlays = pt._sport_rows(parlays, sport)
+    legs = pt._sport_rows(legs, sport)
+    parlays = parlays[parlays["generated_at"].str.len() >= 10]
+
+    day_str = parlays["generated_at"].str[:10]
+    days = np.array(sorted(day_str.unique()))
+    scopes = sorted(parlays["sport"].dropna().unique())
+    scope_pos = {s: i for i, s in enumerate(scopes)}
+    parlays = parlays.assign(day=np.searchsorted(days, day_str.to_numpy()),
+                             scope=parlays["sport"].map(scope_pos))
+    parlays = parlays[parlays["scope"].notna()]
+    parlays["scope"] = parlays["scope"].astype(int)
+
+    legs = legs.join(parlays.set_index("pos")[["day", "scope", "week_ord", "model_epoch"]],
+                     on="pos", how="inner")
+    leg_codes, leg_groups = pd.factorize(legs["sport"].astype(str) + "\x1f"
+                                         + legs["stat_type"].astype(str))
+    legs = legs.assign(group=leg_codes)
+    leg_scope = np.array([scope_pos[g.split("\x1f")[0]] for g in leg_groups], dtype=int)
+
+    # Parlays grouped by (sport, leg count), the key their factor is looked up by.
+    p_codes, p_groups = pd.factorize(parlays["sport"].astype(str) + "\x1f"
+                                     + parlays["n_legs"].astype(str))
+    parlays = parlays.assign(group=p_codes)
+    p_scope = np.array([scope_pos[g.split("\x1f")[0]] for g in p_groups], dtype=int)
+
+    first = (legs[legs["resolved"]]
+             .drop_duplicates(["sport", "prop_key"], keep="first"))
+    graded = parlays[parlays["resolved"] & (parlays["model_epoch"] == pt._MODEL_EPOCH)]
+    settled = parlays[parlays["resolved"]]
+    settled_legs = legs[legs["pos"].isin(settled["pos"])]
+
+    lo = 0 if start is None else int(np.searchsorted(days, start.isoformat()))
+    hi = len(days) if end is None else int(np.searchsorted(days, end.isoformat(), "right"))
+
+    def _f(s):
+        return s.to_numpy(dtype=float)
+
+    def _i(s):
+        return s.to_numpy(dtype=int)
+
+    history = {
+        "n_days":        len(days),
+        "days":          days,
+        "scopes":        scopes,
+        "window":        (lo, hi),
+        "leg_scope":     leg_scope,
+        "parlay_scope":  p_scope,
+        "leg_latest":    _latest(len(days), len(scopes), _i(parlays["day"]),
+                                 _i(parlays["scope"]), _f(parlays["week_ord"])),
+        "parlay_latest": _latest(len(days), len(scopes), _i(graded["day"]),
+                                 _i(graded["scope"]), _f(graded["week_ord"])),
+        # One row per prop, on the day the log first saw it resolved — what leg
+        # calibration is built from, and what leg accuracy is scored on.
+        "props": {
+            "day":   _i(first["day"]),
+            "group": _i(first["group"]),
+            "wk":    _f(first["week_ord"]),
+            "pred":  _f(first["predicted_hit_rate"]),
+            "act":   _f(first["hit"]),
+        },
+        "graded": {
+            "day":   _i(graded["day"]),
+            "group": _i(graded["group"]),
+            "wk":    _f(graded["week_ord"]),
+            "pred":  _f(graded["predicted_prob"]),
+            "act":   _i(graded["hit"]).astype(float),
+        },
+        # Every settled parlay and its legs, re-priced and bet each run.
+        "parlays": {
+            "day":    _i(settled["day"]),
+            "group":  _i(settled["group"]),
+            "hit":    _i(settled["hit"]).astype(float),
+            "payout": _f(settled["payout"]),
+        },
+        "parlay_legs": {
+            "parlay": np.searchsorted(settled["pos"].to_numpy(), _i(settled_legs["pos"])),
+            "day":    _i(settled_legs["day"]),
+            "group":  _i(settled_legs["group"]),
+            "rate":   _f(settled_legs["predicted_hit_rate"]),
+        },
+    }
+    shipped = _walk_forward(history["props"], history["n_days"], len(leg_groups), leg_scope,
+                            history["leg_latest"], DEFAULT_PARAMS["half_life_weeks"],
+                            DEFAULT_PARAMS["min_samples"], DEFAULT_PARAMS["min_factor"],
+                            DEFAULT_PARAMS["max_factor"])
+    history["logged_factors"] = _logged_factors(days, scopes, leg_groups, shipped[:-1])
+    history["leg_groups"] = list(leg_groups)
+    history["parlay_groups"] = list(p_groups)
+    return history
+
+
+# ── Replay ───────────────────────────────────────────────────────────────────
+
+def _walk_forward(rows: dict, n_days: int, n_groups: int, group_scope: np.ndarray,
+                  latest: np.ndarray, half_life: float, min_samples: float,
+                  lo: float, hi: float) -> np.ndarray:
+    """
+    (n_days + 1, n_groups) factors, one row per morning, the last being the morning
+    after the final day. Row d counts only rows logged before day d. 1.0 where a
+    group has not reached min_samples.
+
+    Each row's weight 0.5 ** ((latest - wk) / half_life) is split into a per-row
+    2 ** ((wk - base) / half_life), summed once with a running total over days, and a
+    per-morning 2 ** -((latest - base) / half_life) — so every morning costs one
+    rescale rather than a pass over its history. Undated rows weigh 1, as in the
+    tracker's _DecayedSums.
+    """
+    day, group, wk = rows["day"], rows["group"], rows["wk"]
+    dated = ~np.isnan(wk)
+    base = np.nanmin(wk) if dated.any() else 0.0
+    w = np.where(dated, 2.0 ** ((np.where(dated, wk, base) - base) / half_life), 1.0)
+    decayed = np.zeros((3, n_days + 1, n_groups))
+    flat = np.zeros((3, n_days + 1, n_groups))
+    for acc, m in ((decayed, dated), (flat, ~dated)):
+        idx = (day[m] + 1, group[m])
+        np.add.at(acc[0], idx, w[m] * rows["pred"][m])
+        np.add.at(acc[1], idx, w[m] * rows["act"][m])
+        np.add.at(acc[2], idx, w[m])
+    scale = np.nan_to_num(2.0 ** (-(latest[:, group_scope] - base) / half_life))
+    predicted, actual, weight = decayed.cumsum(axis=1) * scale + flat.cumsum(axis=1)
+    ok = (weight >= min_samples) & (predicted > 0)
+    raw = actual / np.where(predicted > 0, predicted, 1.0)
+    return np.where(ok, np.round(np.clip(raw, lo, hi), 4), 1.0)
+
+
+def _scores(prob: np.ndarray, outcome: np.ndarray) -> tuple:
+    """(log-loss, Brier), or (None, None) with nothing to score."""
+    if not len(outcome):
+        return None, None
+    p = np.clip(prob, 1e-6, 1 - 1e-6)
+    log_loss = -(outcome * np.log(p) + (1 - outcome) * np.log(1 - p)).mean()
+    return round(float(log_loss), 5), round(float(((prob - outcome) ** 2).mean()), 5)
+
+
+def backtest(params: dict | None = None, history: dict | None = None) -> dict:
+    """
+    Replay the log under one set of calibration constants (keys of DEFAULT_PARAMS;
+    missing ones keep their shipped value) and score it over history's window.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    history = history if history is not None else load_history()
+    n_days = history["n_days"]
+    lo, hi = history["window"]
+    half_life = float(params["half_life_weeks"])
+    if half_life <= 0:
+        raise ValueError("half_life_weeks must be positive")
+
+    leg_f = _walk_forward(history["props"], n_days, len(history["leg_groups"]),
+                          history["leg_scope"], history["leg_latest"], half_life,
+                          params["min_samples"], params["min_factor"], params["max_factor"])
+    parlay_f = _walk_forward(history["graded"], n_days, len(history["parlay_groups"]),
+                             history["parlay_scope"], history["parlay_latest"], half_life,
+                             params["parlay_min_samples"], pt.PARLAY_CAL_MIN_FACTOR,
+                             pt.PARLAY_CAL_MAX_FACTOR)
+    logged = history["logged_factors"]
+
+    def _reprice(day, group, rate):
+        return np.clip(rate / logged[day, group] * leg_f[day, group], *LEG_RATE_BOUNDS)
+
+    props = history["props"]
+    in_window = (props["day"] >= lo) & (props["day"] < hi)
+    leg_prob = _reprice(props["day"][in_window], props["group"][in_window],
+                        props["pred"][in_window])
+    leg_ll, leg_brier = _scores(leg_prob, props["act"][in_window])
+
+    # A parlay's probability is its legs' product (taken as a sum of logs) times the
+    # factor for its size, as parlay_model._build_parlays prices it.
+    pl, par = history["parlay_legs"], history["parlays"]
+    log_rate = np.log(_reprice(pl["day"], pl["group"], pl["rate"]))
+    raw = np.exp(np.bincount(pl["parlay"], weights=log_rate, minlength=len(par["day"])))
+    prob = np.clip(raw * parlay_f[par["day"], par["group"]], *PARLAY_PROB_BOUNDS)
+    in_window = (par["day"] >= lo) & (par["day"] < hi)
+    prob, hit, payout = prob[in_window], par["hit"][in_window], par["payout"][in_window]
+    parlay_ll, parlay_brier = _scores(prob, hit)
+
+    # Flat 1-unit stakes on what the candidate recommends (EV > 0 on its own
+    # probability); gross payouts, so a win nets payout - 1.
+    bet = prob * payout - 1.0 > 0
+    profit = np.where(hit > 0, np.maximum(payout - 1.0, 0.0), -1.0)
+    n_bets = int(bet.sum())
+
+    return {
+        "params":          params,
+        "n_props":         int(len(leg_prob)),
+        "leg_log_loss":    leg_ll,
+        "leg_brier":       leg_brier,
+        "n_parlays":       int(len(prob)),
+        "parlay_log_loss": parlay_ll,
+        "parlay_brier":    parlay_brier,
+        "n_bets":          n_bets,
+        "roi_pct":         round(float(profit[bet].sum()) / n_bets * 100, 1) if n_bets else None,
+        # What these constants would ship this morning.
+        "factors": {
+            "legs":    {g: float(f) for g, f in zip(history["leg_groups"], leg_f[-1]) if f != 1.0},
+            "parlays": {g: float(f) for g, f in zip(history["parlay_groups"], parlay_f[-1])
+                        if f != 1.0},
+        },
+    }
+
+
+# ── Sweeps ───────────────────────────────────────────────────────────────────
+# Workers are handed the history once, by the pool initializer, instead of with
+# every task; a run is then a few array passes, so the pool's cost is pickling
+# the params back and forth.
+_WORKER_HISTORY: dict | None = None
+
+
+def _init_worker(history: dict) -> None:
+    global _WORKER_HISTORY
+    _WORKER_HISTORY = history
+
+
+def _run(params: dict) -> dict:
+    return backtest(params, _WORKER_HISTORY)
+
+
+def sweep(grid: dict, history: dict | None = None, workers: int = SWEEP_WORKERS,
+          rank_by: str = RANK_BY) -> list:
+    """
+    Backtest every combination of grid ({param: [values]}) across a process pool,
+    best first by rank_by (lower is better; runs with nothing to score go last).
+    """
+    history = history if history is not None else load_history()
+    keys = list(grid)
+    runs = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+    if workers <= 1 or len(runs) <= 1:
+        results = [backtest(p, history) for p in runs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(history,)) as pool:
+            results = list(pool.map(_run, runs, chunksize=max(1, len(runs) // (workers * 4))))
+    return sorted(results, key=lambda r: (r[rank_by] is None, r[rank_by] or 0.0))
+
+
+def _values(kind):
+    return lambda text: [kind(v) for v in text.split(",") if v.strip()]
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--sport", choices=["NBA", "WNBA", "MLB"])
+    ap.add_argument("--start", type=date.fromisoformat, help="first scored day (YYYY-MM-DD)")
+    ap.add_argument("--end", type=date.fromisoformat, help="last scored day (YYYY-MM-DD)")
+    ap.add_argument("--half-life", type=_values(float), dest="half_life_weeks")
+    ap.add_argument("--min-samples", type=_values(float), dest="min_samples")
+    ap.add_argument("--max-factor", type=_values(float), dest="max_factor")
+    ap.add_argument("--min-factor", type=_values(float), dest="min_factor")
+    ap.add_argument("--parlay-min-samples", type=_values(float), dest="parlay_min_samples")
+    ap.add_argument("--workers", type=int, default=SWEEP_WORKERS)
+    ap.add_argument("--rank-by", default=RANK_BY,
+                    choices=["leg_log_loss", "leg_brier", "parlay_log_loss", "parlay_brier"])
+    ap.add_argument("--top", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    grid = {k: getattr(args, k) or [v] for k, v in DEFAULT_PARAMS.items()}
+    history = load_history(args.sport, args.start, args.end)
+    lo, hi = history["window"]
+    print(f"Replaying {history['n_days']} days, scoring {hi - lo} "
+          f"({history['days'][lo] if hi > lo else '-'} .. "
+          f"{history['days'][hi - 1] if hi > lo else '-'}), "
+          f"{int(np.prod([len(v) for v in grid.values()]))} parameter sets")
+    results = sweep(grid, history, args.workers, args.rank_by)
+
+    print(f"\n  {'half':>5} {'min':>5} {'max':>5} {'floor':>5} {'pmin':>5} | "
+          f"{'leg LL':>7} {'leg BS':>7} | {'par LL':>7} {'par BS':>7} | {'bets':>5} {'ROI%':>6}")
+    shipped = {k: float(v) for k, v in DEFAULT_PARAMS.items()}
+    for r in results[:args.top]:
+        p = r["params"]
+        mark = "*" if {k: float(v) for k, v in p.items()} == shipped else " "
+        print(f"{mark} {p['half_life_weeks']:>5g} {p['min_samples']:>5g} {p['max_factor']:>5g} "
+              f"{p['min_factor']:>5g} {p['parlay_min_samples']:>5g} | "
+              f"{r['leg_log_loss'] or 0:>7.4f} {r['leg_brier'] or 0:>7.4f} | "
+              f"{r['parlay_log_loss'] or 0:>7.4f} {r['parlay_brier'] or 0:>7.4f} | "
+              f"{r['n_bets']:>5} {r['roi_pct'] if r['roi_pct'] is not None else '-':>6}")
+    print("\n  * = the shipped constants")
+
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    main()
@@ -8,18 +8,28 @@ builds safe + value parlays, and logs them to parlay_log.json.
 The prediction model itself (hit-rate calculators, BvP, game-log fetchers,
 parlay builder) lives in parlay_model.py, shared with nba_prop_dashboard.py,
 so the two stop drifting apart.
+
+Each stage checkpoints to logs/runs/<date>/, so a rerun the same day picks up
+where a failed one stopped; --from-stage {resolve,fetch,score,build,log} redoes
+that stage and everything after it.
 """
-import sys, time, os, re, requests, pandas as pd
-from datetime import datetime
+import sys, time, os, re, json, shutil, argparse, threading, pandas as pd
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from pathlib import Path
 sys.stdout.reconfigure(encoding="utf-8")
 
 # parlay_tracker / parlay_model live in the same directory
 sys.path.insert(0, os.path.dirname(__file__))
+import http_client
 import parlay_tracker
 import parlay_model as pm
 
 LOG_PATH = Path(__file__).parent / "logs" / "daily_parlay_gen.log"
+RUNS_PATH = LOG_PATH.with_name("daily_parlay_gen_runs.jsonl")
+RUN_ROOT  = LOG_PATH.with_name("runs")
 
 
 class _Tee:
@@ -80,6 +90,162 @@ UD_NBA_STAT_MAP = {
     "Blocked Shots": "Blocked Shots", "Steals": "Steals", "Turnovers": "Turnovers",
 }
 
+# ── Run metrics ────────────────────────────────────────────────────────────
+# The run log said how many parlays a run made, not where its time went, so a
+# 20-minute run could have been FanDuel, the MLB resolver or scoring. Each stage
+# is timed under stage() — resolve (and each sport's resolver), then per sport
+# the calibration read, per-book fetches, id resolution, log prefetch, and per
+# book scoring, build and logging — and http_client keeps a per-host ledger.
+# Both go to RUNS_PATH as one JSON line per run, for day-over-day comparison,
+# and into the log as a summary. Stages of different sports and books overlap,
+# so their seconds do not add up to the run's wall time.
+_stages: list = []
+_stages_lock = threading.Lock()
+
+
+@contextmanager
+def stage(name, sport=None, book=None):
+    """Time a block as one stage of this run."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _stages_lock:
+            _stages.append({"stage": name, "sport": sport, "book": book,
+                            "seconds": round(time.perf_counter() - start, 3)})
+
+
+def add_stage(name, seconds, sport=None, book=None):
+    """Record a stage that was timed elsewhere."""
+    with _stages_lock:
+        _stages.append({"stage": name, "sport": sport, "book": book, "seconds": seconds})
+
+
+def report_run(started, wall_s, parlays):
+    """Print the stage and HTTP summary and append the run's JSON line to RUNS_PATH."""
+    with _stages_lock:
+        stages = list(_stages)
+        _stages.clear()
+    http = http_client.http_ledger(reset=True)
+
+    print("  Stage timings (wall s; sports and books overlap, so these exceed the run):")
+    by_stage = defaultdict(list)
+    for st in stages:
+        by_stage[st["stage"]].append(st)
+    for name, rows in by_stage.items():
+        slowest = max(rows, key=lambda r: r["seconds"])
+        where = "/".join(x for x in (slowest["sport"], slowest["book"]) if x)
+        line = f"    {name:16s} {sum(r['seconds'] for r in rows):7.1f}s"
+        if len(rows) > 1:
+            line += f"  over {len(rows)}, slowest {where or '-'} {slowest['seconds']:.1f}s"
+        print(line)
+    if http:
+        print(f"\n  HTTP by host:{'requests':>34} {'MB':>7} {'total s':>8} {'p95 s':>6} {'errors':>6}")
+        for host, h in http.items():
+            print(f"    {host:36s} {h['requests']:8d} {h['bytes'] / 1e6:7.1f} "
+                  f"{h['total_s']:8.1f} {h['p95_s']:6.2f} {h['errors']:6d}")
+
+    record = {
+        "run":      started.isoformat(timespec="seconds"),
+        "wall_s":   round(wall_s, 3),
+        "parlays":  parlays,
+        "scored_leg_cache": dict(_scored_counts),
+        "stages":   stages,
+        "http":     http,
+    }
+    try:
+        RUNS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(RUNS_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"  Could not append run metrics to {RUNS_PATH.name}: {e}")
+
+
+# ── Checkpoints ────────────────────────────────────────────────────────────
+# A run that died halfway — a FanDuel timeout, a crash in NBA scoring — used to
+# start over: re-resolve, refetch every book, rescore every sport. Each stage now
+# leaves its output in a directory for the day (RUN_ROOT/YYYY-MM-DD): the
+# resolve counts, then per sport and book the fetched board, the scored legs, the
+# built parlays and the logged counts. A rerun the same day loads what is there
+# and does only what is missing; --from-stage redoes the named stage and every
+# stage after it, so "--from-stage build" rebuilds and relogs from the scored
+# legs. Relogging is safe: log_parlays skips parlay ids it already holds.
+#
+# A stage that runs makes every later checkpoint of that book stale, so those
+# are redone too — except that a refetched board carrying the same payload digest
+# as the one today's legs were scored from (PrizePicks and Underdog; see _boards)
+# keeps the score, build and log checkpoints. "--from-stage fetch" therefore only
+# rescores the books whose boards moved. A failed or empty fetch leaves no board,
+# so the rerun asks the book again.
+STAGES        = ("resolve", "fetch", "score", "build", "log")
+RUN_KEEP_DAYS = 7
+_run_dir  = None       # set by open_run(); None means no checkpoints
+_redo: set = set()
+
+
+def open_run(now, from_stage=None):
+    """Point checkpoints at today's run directory and drop those past RUN_KEEP_DAYS."""
+    global _run_dir, _redo
+    _run_dir = RUN_ROOT / now.strftime("%Y-%m-%d")
+    _redo = set(STAGES[STAGES.index(from_stage):]) if from_stage else set()
+    if from_stage == "fetch":
+        _redo = {"fetch"}      # later stages follow from whether the board changed
+    try:
+        _run_dir.mkdir(parents=True, exist_ok=True)
+        cutoff = (now - timedelta(days=RUN_KEEP_DAYS)).strftime("%Y-%m-%d")
+        for old in RUN_ROOT.iterdir():
+            if old.is_dir() and re.fullmatch(r"\d{4}-\d{2}-\d{2}", old.name) \
+                    and old.name < cutoff:
+                shutil.rmtree(old, ignore_errors=True)
+    except OSError as e:
+        print(f"  Checkpoints disabled — {RUN_ROOT} is not writable ({e}).")
+        _run_dir = None
+
+
+def _checkpoint_path(name, sport=None, book=None):
+    stem = "_".join(x.lower() for x in (sport, book, name) if x)
+    return _run_dir / (stem + (".pkl" if name == "fetch" else ".json"))
+
+
+def load_checkpoint(name, sport=None, book=None):
+    """A stage's saved output from earlier today, or None when the stage has to run."""
+    if _run_dir is None or name in _redo:
+        return None
+    path = _checkpoint_path(name, sport, book)
+    if not path.exists():
+        return None
+    try:
+        if name == "fetch":
+            return pd.read_pickle(path)
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None    # a torn or unreadable checkpoint just means the stage runs again
+
+
+def has_checkpoint(name, sport=None, book=None):
+    """Whether load_checkpoint would have something to load (without loading it)."""
+    return _run_dir is not None and name not in _redo \
+        and _checkpoint_path(name, sport, book).exists()
+
+
+def save_checkpoint(name, value, sport=None, book=None):
+    """Save a stage's output; written aside and renamed, so a crash never leaves half a file."""
+    if _run_dir is None:
+        return
+    path = _checkpoint_path(name, sport, book)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    try:
+        if name == "fetch":
+            value.to_pickle(tmp)
+        else:
+            # Parlays carry numpy scalars (a numpy comparison gives np.bool_).
+            tmp.write_text(json.dumps(value, default=lambda o: o.item()), encoding="utf-8")
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError, AttributeError) as e:
+        tmp.unlink(missing_ok=True)
+        print(f"  Could not checkpoint {path.name}: {e}")
+
+
 # ── Calibration ────────────────────────────────────────────────────────────
 
 def load_cal(sport):
@@ -88,19 +254,30 @@ def load_cal(sport):
     except Exception:
         return {}
 
+# Last parsed board per (book, league): (payload digest, DataFrame). A
+# board whose payload hashes the same as last time is returned as-is — no JSON
+# parse, no DataFrame build. The digest rides along in attrs["board_digest"],
+# and _fetch_board checks it against the board today's legs were scored from.
+_boards: dict = {}
+
 # ── PrizePicks API ─────────────────────────────────────────────────────────
 
 def fetch_prizepicks(league_id: int) -> pd.DataFrame:
     dk_odds = {"goblin": -162, "standard": -100, "demon": 162}
+    prev = _boards.get(("PrizePicks", league_id))
+    # PrizePicks answers a burst with a bare 403 — not one of http_client's
+    # retried statuses — and now and then with an empty board, so both get
+    # another try here.
     for attempt in range(3):
+        if attempt:
+            time.sleep(2)
         try:
-            if attempt:
-                time.sleep(2)
             url = f"https://api.prizepicks.com/projections?league_id={league_id}&per_page=500&single_stat=true"
-            resp = requests.get(url, headers=PP_HEADERS, timeout=15)
-            if resp.status_code != 200:
-                continue
-            payload = resp.json()
+            digest, body = http_client.get_if_changed(url, prev and prev[0],
+                                                      headers=PP_HEADERS, timeout=15)
+            if body is None:
+                return prev[1]
+            payload = json.loads(body)
             player_map, game_map = {}, {}
             for item in payload.get("included", []):
                 if item.get("type") == "new_player":
@@ -140,7 +317,10 @@ def fetch_prizepicks(league_id: int) -> pd.DataFrame:
                     "sportsbook":   "PrizePicks",
                 })
             if rows:
-                return pd.DataFrame(rows)
+                df = pd.DataFrame(rows)
+                df.attrs["board_digest"] = digest
+                _boards[("PrizePicks", league_id)] = (digest, df)
+                return df
         except Exception as e:
             print(f"    PrizePicks attempt {attempt+1} failed: {e}")
     return pd.DataFrame()
@@ -148,107 +328,32 @@ def fetch_prizepicks(league_id: int) -> pd.DataFrame:
 # ── Underdog API ───────────────────────────────────────────────────────────
 
 def fetch_underdog(sport: str) -> pd.DataFrame:
-    sport_id = {"nba": "NBA", "wnba": "WNBA", "mlb": "MLB"}[sport]
-    stat_map  = UD_MLB_STAT_MAP if sport == "mlb" else UD_NBA_STAT_MAP
-    try:
-        resp = requests.get(
-            "https://api.underdogfantasy.com/beta/v5/over_under_lines",
-            headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"},
-            timeout=15,
-        )
-        if resp.status_code != 200:
-            return pd.DataFrame()
-        d = resp.json()
-        player_map     = {p["id"]: p for p in d.get("players", [])}
-        appearance_map = {a["id"]: a for a in d.get("appearances", [])}
-        game_map       = {g["id"]: g for g in d.get("games", [])}
-        rows = []
-        for line in d.get("over_under_lines", []):
-            if line.get("status") != "active":
-                continue
-            ou       = line.get("over_under", {})
-            app_stat = ou.get("appearance_stat", {})
-            st_type  = stat_map.get(app_stat.get("display_stat", "").strip())
-            if not st_type:
-                continue
-            app    = appearance_map.get(app_stat.get("appearance_id", ""), {})
-            player = player_map.get(app.get("player_id", ""), {})
-            if not player or player.get("sport_id") != sport_id:
-                continue
-            try:
-                val = float(line.get("stat_value", 0))
-            except Exception:
-                continue
-            game  = game_map.get(app.get("match_id"), {})
-            name  = f"{player.get('first_name','')} {player.get('last_name','')}".strip()
-            if not name:
-                continue
-            title = game.get("abbreviated_title", "")
-            team  = ""
-            if " @ " in title:
-                away, home = title.split(" @ ", 1)
-                team = away if app.get("team_id") == game.get("away_team_id") else home
-            opts = line.get("options", [])
-            over_opt  = next((o for o in opts if o.get("choice") == "higher"), None)
-            under_opt = next((o for o in opts if o.get("choice") == "lower"), None)
-            if not over_opt:
-                continue
-            try:
-                american = int(str(over_opt.get("american_price", "-110")).replace("+", ""))
-            except Exception:
-                american = -110
-
-            # The price is the sharpest signal on the board and this used to throw it
-            # away, pinning implied_prob at 0.50 for every Underdog leg. That left the
-            # model's "30% market" term a constant, so predictions barely moved with the
-            # line: where the book priced a WNBA leg at 14% it still predicted 26% (those
-            # legs hit 0%), and where the book said 81% it predicted 76% (they hit 84%).
-            # Model-vs-book edge was therefore inverted for WNBA — the legs it liked most
-            # hit least. De-vigged book probability restores the signal.
-            implied_over = pm.american_to_implied(american)
-            implied_under = None
-            if under_opt is not None:
-                try:
-                    under_american = int(str(under_opt.get("american_price", "-110")).replace("+", ""))
-                    implied_under = pm.american_to_implied(under_american)
-                except Exception:
-                    implied_under = None
-            implied = round(pm.devig_two_way(implied_over, implied_under), 4)
-
-            rows.append({
-                "player_name": name, "team": team, "stat_type": st_type,
-                "line_score": val, "odds_type": "standard",
-                "american_odds": american, "implied_prob": implied,
-                "game_id": app.get("match_id", ""), "game_label": title,
-                "start_time": game.get("scheduled_at", ""),
-                "sportsbook": "Underdog",
-            })
-        return pd.DataFrame(rows) if rows else pd.DataFrame()
-    except Exception as e:
-        print(f"    Underdog fetch failed: {e}")
-        return pd.DataFrame()
+    # One shared multi-sport board in parlay_model — MLB, WNBA and NBA runs all
+    # slice the same download instead of fetching it once each.
+    stat_map = UD_MLB_STAT_MAP if sport == "mlb" else UD_NBA_STAT_MAP
+    df = pm.underdog_lines(sport, stat_map)
+    if not df.empty:
+        df["implied_prob"] = df["implied_prob"].round(4)
+    return df
 
 # FanDuel lives in parlay_model so the dashboard and this script cannot drift
 # apart on it — the same mistake that produced two divergent copies of the model.
 fetch_fanduel = pm.fetch_fanduel
 
 # ── Hit-rate adapters ───────────────────────────────────────────────────────
-# Thin shims translating this script's (implied=, cal=, team=) calling
-# convention into parlay_model's canonical (implied_override=, cal_factor=,
-# opp_pitcher_id=) signatures, so score_legs/run_sport/main below are
-# unchanged from before the model logic moved into the shared module.
+# Thin shims over parlay_model's *_rate_parts: the price-free half of each
+# hit-rate calculator (game logs, window math, BvP, Statcast), returning
+# (hist, statcast, n) or None. The book's implied odds and the calibration
+# factor are folded in afterwards by pm._blend_hit_rate.
 
-def mlb_hit_rate(player_name, stat_type, line, odds_type="standard", implied=-1.0, cal=1.0, team=""):
-    return pm._mlb_hit_rate(player_name, stat_type, line, odds_type=odds_type,
-                             implied_override=implied, cal_factor=cal, team=team)
+def mlb_rate_parts(player_name, stat_type, line, team=""):
+    return pm._mlb_rate_parts(player_name, stat_type, line, team=team)
 
-def wnba_hit_rate(player_name, stat_type, line, odds_type="standard", implied=-1.0, cal=1.0, team=""):
-    return pm._wnba_hit_rate(player_name, stat_type, line, odds_type=odds_type,
-                              implied_override=implied, cal_factor=cal)
+def wnba_rate_parts(player_name, stat_type, line, team=""):
+    return pm._wnba_rate_parts(player_name, stat_type, line)
 
-def nba_hit_rate(player_name, stat_type, line, odds_type="standard", implied=-1.0, cal=1.0, team=""):
-    return pm._nba_hit_rate(player_name, stat_type, line, odds_type=odds_type,
-                             implied_override=implied, cal_factor=cal)
+def nba_rate_parts(player_name, stat_type, line, team=""):
+    return pm._nba_rate_parts(player_name, stat_type, line)
 
 def build_parlays(legs, min_legs=2, max_legs=5, top_n=50, pool_size=30, max_leg_uses=6,
                   sportsbook="PrizePicks", parlay_cal=None):
@@ -259,11 +364,135 @@ def build_parlays(legs, min_legs=2, max_legs=5, top_n=50, pool_size=30, max_leg_
                               top_n=top_n, pool_size=pool_size, max_leg_uses=max_leg_uses,
                               sportsbook=sportsbook, parlay_cal=parlay_cal)
 
+# ── Prefetch ───────────────────────────────────────────────────────────────
+# Scoring used to fetch each player's logs from inside the rate calculator, one
+# player at a time, and slept 30 ms per row to stay polite. The dashboard warms
+# its caches on a pool before its scoring loop; this does the same over the
+# union of a sport's boards, so every book then scores from warm caches. The
+# politeness is the transport's job now: http_client's per-host caps and token
+# buckets and parlay_model's nba_api slots bound every fetch made here. Warm-ups
+# that fail are ignored — the calculator simply fetches that entry itself.
+PREFETCH_WORKERS = 8
+MLB_LOG_SEASONS  = ("2025", "2026")    # the tuple _mlb_rate_parts keys its logs on
+
+
+def board_props(boards, stat_types):
+    """Unique (player, stat, team) rows across a sport's boards, for stat_types only."""
+    frames = [b[b["stat_type"].isin(stat_types)] for b in boards if not b.empty]
+    if not frames:
+        return pd.DataFrame(columns=["player_name", "stat_type", "team"])
+    df = pd.concat(frames, ignore_index=True)
+    if "team" not in df.columns:
+        df["team"] = ""
+    return df[["player_name", "stat_type", "team"]].fillna("").astype(str).drop_duplicates()
+
+
+def _warm(calls, during=None):
+    """Run (fn, *args) calls on a bounded pool — and `during` on this thread
+    meanwhile — and wait for all of them."""
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+        futures = [pool.submit(fn, *args) for fn, *args in calls]
+        if during is not None:
+            during()
+        for fut in futures:
+            try:
+                fut.result()
+            except Exception:
+                pass
+
+
+def prefetch_mlb(props):
+    """Warm ids, game logs, BvP pairs and Statcast leaderboards for an MLB board."""
+    with stage("ids", "MLB"):
+        _warm([(pm.get_mlb_player_map,), (pm.mlb_today_pitcher_lookup,)])
+        opp = pm.mlb_today_pitcher_lookup()
+        hitters, pitchers, bvp = set(), set(), set()
+        for row in props.itertuples(index=False):
+            pid = pm.mlb_player_id(row.player_name)
+            if not pid:
+                continue
+            if row.stat_type in pm.MLB_PITCHER_TYPES:
+                pitchers.add(pid)
+                continue
+            hitters.add(pid)
+            if pm.MLB_HIT_COL.get(row.stat_type) in pm.BVP_COL_MAP and opp.get(row.team):
+                bvp.add((int(pid), int(opp[row.team])))
+
+    with stage("prefetch", "MLB"):
+        # Logs go out in a handful of batched people hydrates, alongside the Savant
+        # leaderboards; the second pool only fetches what a failed chunk left cold.
+        _warm([(pm.savant_batter_stats,), (pm.savant_pitcher_stats,)],
+              during=lambda: pm.prefetch_mlb_players(hitters=sorted(hitters),
+                                                     pitchers=sorted(pitchers),
+                                                     seasons=MLB_LOG_SEASONS))
+        cold = ([(pm.get_mlb_hitting_logs, pid, MLB_LOG_SEASONS) for pid in sorted(hitters)
+                 if not pm.get_mlb_hitting_logs.cached(pid, MLB_LOG_SEASONS)]
+                + [(pm.get_mlb_pitching_logs, pid, MLB_LOG_SEASONS) for pid in sorted(pitchers)
+                   if not pm.get_mlb_pitching_logs.cached(pid, MLB_LOG_SEASONS)])
+        _warm(cold + [(pm.mlb_bvp_stats, b, p) for b, p in sorted(bvp)] + [(pm._savant_league,)])
+    return f"{len(hitters)} hitters, {len(pitchers)} pitchers, {len(bvp)} BvP pairs"
+
+
+def prefetch_nba(props):
+    """Warm ids and current-season game logs for an NBA board."""
+    names = sorted(set(props["player_name"]))
+    with stage("ids", "NBA"):
+        with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+            pids = {pid for pid in pool.map(pm.get_player_id, names) if pid}
+    with stage("prefetch", "NBA"):
+        _warm([(pm.get_gamelogs, pid, ("2025-26",)) for pid in sorted(pids)])
+    return f"{len(pids)} players"
+
+
+def prefetch_wnba(props):
+    """Warm ids and current-season game logs for a WNBA board."""
+    names = sorted(set(props["player_name"]))
+    with stage("ids", "WNBA"):
+        pids = {pid for pid in map(pm.get_wnba_player_id, names) if pid}
+    with stage("prefetch", "WNBA"):
+        _warm([(pm.get_wnba_gamelogs, pid, ("2026",)) for pid in sorted(pids)])
+    return f"{len(pids)} players"
+
+# ── Scored-leg cache ───────────────────────────────────────────────────────
+# The same player/stat/line is usually on FanDuel, Underdog and PrizePicks, and
+# scoring it used to run the same game log through the same window math once
+# per book. The rate parts depend only on (sport, player, stat, line), plus the
+# team for MLB, where it picks the opposing pitcher; the basketball parts ignore
+# team, and FanDuel rows have none, so only MLB keys on it. The parts are
+# computed once per run and each book only re-blends them with its own price
+# and the calibration factor, which is a few multiplications. A run is one
+# process, so the cache lives exactly as long as the run. It is single-flight
+# like the model caches under it: the books run side by side, and the second to
+# reach a prop waits for the first one's parts. Hits and misses are reported per
+# book.
+_scored_counts: Counter = Counter()
+_scored_lock = threading.Lock()
+_scored_local = threading.local()
+
+
+@pm._ttl_cache(86400)
+def _scored_parts(sport_label, parts_fn, player_name, stat_type, line, team):
+    _scored_local.computed = True
+    return parts_fn(player_name, stat_type, line, team=team)
+
+
+def cached_rate_parts(sport_label, parts_fn, player_name, stat_type, line, team):
+    """(rate parts, cache hit?) for a prop, computing the parts on first sight."""
+    _scored_local.computed = False
+    parts = _scored_parts(sport_label, parts_fn, player_name, stat_type, line,
+                          team if sport_label == "MLB" else "")
+    hit = not _scored_local.computed
+    with _scored_lock:
+        _scored_counts["hit" if hit else "miss"] += 1
+    return parts, hit
+
 # ── Leg scorer ─────────────────────────────────────────────────────────────
 
-def score_legs(df, cal, stat_types, rate_fn):
+def score_legs(df, cal, stat_types, parts_fn, sport_label):
+    """Score a book's board. Returns (legs, cache hits, cache misses)."""
     df   = df[df["stat_type"].isin(stat_types)].copy()
     legs, seen = [], set()
+    hits = misses = 0
     for _, row in df.iterrows():
         key = (row["player_name"], row["stat_type"])
         if key in seen:
@@ -273,12 +502,15 @@ def score_legs(df, cal, stat_types, rate_fn):
             line = float(row["line_score"])
         except Exception:
             continue
-        rate, n = rate_fn(
-            row["player_name"], row["stat_type"], line,
+        parts, hit = cached_rate_parts(sport_label, parts_fn, row["player_name"],
+                                       row["stat_type"], line, str(row.get("team", "")))
+        hits += hit
+        misses += not hit
+        rate, n = pm._blend_hit_rate(
+            parts,
             odds_type=str(row.get("odds_type", "standard")),
-            implied=float(row.get("implied_prob", -1.0)),
-            cal=cal.get(row["stat_type"], 1.0),
-            team=str(row.get("team", "")),
+            implied_override=float(row.get("implied_prob", -1.0)),
+            cal_factor=cal.get(row["stat_type"], 1.0),
         )
         if n < 3:
             continue
@@ -297,22 +529,37 @@ def score_legs(df, cal, stat_types, rate_fn):
             "hit_rate":      rate,
             "sample_n":      n,
         })
-        time.sleep(0.03)
-    return legs
+    return legs, hits, misses
 
 # ── Per-sport runner ───────────────────────────────────────────────────────
-
-def run_sport(sport_key, sport_label, pp_league_id, stat_types, rate_fn):
-    print(f"\n{'='*62}\n  {sport_label}\n{'='*62}")
+# Every source waits on a different host — FanDuel, Underdog, PrizePicks, then
+# the Stats API or stats.nba.com for game logs — so the nine sport/book runs go
+# side by side and the job takes about as long as its slowest one. Books of a
+# sport score against the same model caches, which are single-flight, so a
+# player on all three boards is fetched once. Within a sport the boards are all
+# fetched first, then the caches are warmed for their union (see Prefetch), then
+# the books are scored. Each run's output is buffered and printed as one block,
+# so the log still reads sport by sport.
+#
+# Calibration is read for every sport before anything is logged, and all
+# tracker writes go through one writer thread: log_parlays never runs
+# alongside another write or a calibration read.
+SPORT_WORKERS = 3
+BOOK_WORKERS  = 3
+
+
+def sport_calibration(sport_label):
+    """(leg factors, parlay factors, report lines) for a sport, read before logging."""
+    out = []
     cal = load_cal(sport_label)
     if cal:
-        print(f"  Calibration: { {k: round(v,3) for k,v in cal.items()} }")
+        out.append(f"  Calibration: { {k: round(v,3) for k,v in cal.items()} }")
 
     try:
         for w in parlay_tracker.get_drift_warnings(sport=sport_label):
-            print(f"  ! DRIFT {w['stat_type']}: predicted {w['predicted_hit_rate']:.1%} "
-                  f"vs actual {w['actual_hit_rate']:.1%} ({w['bias']:+.1%}) "
-                  f"over {w['samples']} props")
+            out.append(f"  ! DRIFT {w['stat_type']}: predicted {w['predicted_hit_rate']:.1%} "
+                       f"vs actual {w['actual_hit_rate']:.1%} ({w['bias']:+.1%}) "
+                       f"over {w['samples']} props")
     except Exception:
         pass
 
@@ -320,56 +567,146 @@ def run_sport(sport_key, sport_label, pp_league_id, stat_types, rate_fn):
     try:
         p_cal = parlay_tracker.get_parlay_calibration(sport=sport_label)
         if p_cal:
-            print(f"  Parlay calibration by pick count: "
-                  f"{ {k: round(v, 3) for k, v in sorted(p_cal.items())} }")
+            out.append(f"  Parlay calibration by pick count: "
+                       f"{ {k: round(v, 3) for k, v in sorted(p_cal.items())} }")
     except Exception:
         pass
+    return cal, p_cal, out
 
-    total = 0
-    # FanDuel leads: it is the only book here that quotes both sides of a prop, so it is
-    # the only one the de-vig can fully use. Underdog and PrizePicks still run — a book
-    # returning nothing (off-season, no slate) must not take the others down with it.
-    for sb, fetch_fn in [("FanDuel",    lambda: fetch_fanduel(sport_key)),
-                          ("Underdog",   lambda: fetch_underdog(sport_key)),
-                          ("PrizePicks", lambda: fetch_prizepicks(pp_league_id))]:
-        print(f"\n  [{sb}]")
-        raw = fetch_fn()
-        if raw.empty:
-            print(f"    No lines — skipping.")
-            continue
-        print(f"    {len(raw)} lines fetched.")
 
-        legs = score_legs(raw, cal, stat_types, rate_fn)
-        print(f"    {len(legs)} legs scored.")
-        if len(legs) < 2:
-            continue
+def log_slate(safe, value, sport_label, sb):
+    """Log a book's safe and value parlays; runs on the tracker writer thread."""
+    s = parlay_tracker.log_parlays(safe,  sport_label, sb, kind="safe")
+    v = parlay_tracker.log_parlays(value, sport_label, sb, kind="value")
+    return s, v
 
-        safe, value = build_parlays(legs, sportsbook=sb, parlay_cal=p_cal)
-        if not safe and not value:
-            continue
-        s = parlay_tracker.log_parlays(safe,  sport_label, sb, kind="safe")
-        v = parlay_tracker.log_parlays(value, sport_label, sb, kind="value")
-
-        # The whole slate is logged — it is the training data. Only the positive-EV ones
-        # are worth betting, so say which those are.
-        rec = [p for p in safe + value if p.get("recommended")]
-        sizes = sorted({p["n"] for p in rec})
-        print(f"    Logged {s} safe + {v} value parlays.")
-        if rec:
-            best = max(rec, key=lambda p: p["ev"])
-            print(f"    RECOMMENDED (positive EV): {len(rec)} of {len(safe) + len(value)} "
-                  f"— pick counts {sizes}, best EV {best['ev']:+.3f} on a {best['n']}-leg.")
-        else:
-            print(f"    RECOMMENDED: none — no positive-EV parlay on the board today.")
-        total += s + v
 
-    if pm._FD_UNMAPPED:
-        # A FanDuel market we can't name is a prop we silently never bet — the same
-        # failure mode as the stat types that went months without resolving.
-        print(f"\n  FanDuel markets with no stat mapping: {sorted(pm._FD_UNMAPPED)}")
-        pm._FD_UNMAPPED.clear()
+def run_book(sb, raw, fresh, sport_label, stat_types, parts_fn, cal, p_cal, writer):
+    """
+    Score, build and log one book's board, picking up from today's checkpoints
+    unless `fresh` (the board itself was just fetched). Returns (parlays logged, lines).
+    """
+    out = [f"\n  [{sb}]"]
+    if raw.empty:
+        out.append(f"    No lines — skipping.")
+        return 0, out
+    out.append(f"    {len(raw)} lines {'fetched' if fresh else 'as checkpointed earlier today'}.")
+
+    legs = None if fresh else load_checkpoint("score", sport_label, sb)
+    if legs is None:
+        fresh = True
+        with stage("score", sport_label, sb):
+            legs, hits, misses = score_legs(raw, cal, stat_types, parts_fn, sport_label)
+        save_checkpoint("score", legs, sport_label, sb)
+        save_checkpoint("digest", raw.attrs.get("board_digest"), sport_label, sb)
+        out.append(f"    {len(legs)} legs scored ({hits} from the scored-leg cache, "
+                   f"{misses} computed).")
+    else:
+        out.append(f"    {len(legs)} legs loaded from the checkpoint.")
+    if len(legs) < 2:
+        return 0, out
+
+    built = None if fresh else load_checkpoint("build", sport_label, sb)
+    if built is None:
+        fresh = True
+        with stage("build", sport_label, sb):
+            safe, value = build_parlays(legs, sportsbook=sb, parlay_cal=p_cal)
+        save_checkpoint("build", {"safe": safe, "value": value}, sport_label, sb)
+    else:
+        safe, value = built["safe"], built["value"]
+    if not safe and not value:
+        return 0, out
+
+    logged = None if fresh else load_checkpoint("log", sport_label, sb)
+    if logged is None:
+        with stage("log", sport_label, sb):     # includes waiting for the writer
+            s, v = writer.submit(log_slate, safe, value, sport_label, sb).result()
+        save_checkpoint("log", {"safe": s, "value": v}, sport_label, sb)
+        out.append(f"    Logged {s} safe + {v} value parlays.")
+    else:
+        s = v = 0
+        out.append(f"    Already logged earlier today ({logged['safe']} safe + "
+                   f"{logged['value']} value parlays).")
+
+    # The whole slate is logged — it is the training data. Only the positive-EV ones
+    # are worth betting, so say which those are.
+    rec = [p for p in safe + value if p.get("recommended")]
+    sizes = sorted({p["n"] for p in rec})
+    if rec:
+        best = max(rec, key=lambda p: p["ev"])
+        out.append(f"    RECOMMENDED (positive EV): {len(rec)} of {len(safe) + len(value)} "
+                   f"— pick counts {sizes}, best EV {best['ev']:+.3f} on a {best['n']}-leg.")
+    else:
+        out.append(f"    RECOMMENDED: none — no positive-EV parlay on the board today.")
+    return s + v, out
+
 
-    return total
+def _fetch_board(fetch_fn, sport_label, sb):
+    """
+    (board, error, fresh) — today's checkpointed board if there is one. A refetched
+    board whose payload digest matches the one today's legs were scored from is
+    not fresh: nothing downstream of it has changed.
+    """
+    raw = load_checkpoint("fetch", sport_label, sb)
+    if raw is not None:
+        return raw, None, False
+    with stage("fetch", sport_label, sb):
+        try:
+            raw = fetch_fn()
+        except Exception as e:
+            return pd.DataFrame(), e, True
+    if raw.empty:
+        return raw, None, True
+    save_checkpoint("fetch", raw, sport_label, sb)
+    digest = raw.attrs.get("board_digest")
+    unchanged = digest is not None and digest == load_checkpoint("digest", sport_label, sb)
+    return raw, None, not unchanged
+
+
+def run_sport(sport_key, sport_label, pp_league_id, stat_types, parts_fn, prefetch_fn,
+              calibration, writer):
+    """
+    Fetch a sport's boards side by side, warm the model caches for all of them at
+    once, then score and log each book side by side. Returns (parlays logged, lines).
+    """
+    cal, p_cal, out = calibration
+    out = [f"\n{'='*62}\n  {sport_label}\n{'='*62}"] + out
+    # FanDuel leads: it is the only book here that quotes both sides of a prop, so it is
+    # the only one the de-vig can fully use. Underdog and PrizePicks still run — a book
+    # returning nothing (off-season, no slate) must not take the others down with it.
+    books = [("FanDuel",    lambda: fetch_fanduel(sport_key)),
+             ("Underdog",   lambda: fetch_underdog(sport_key)),
+             ("PrizePicks", lambda: fetch_prizepicks(pp_league_id))]
+    with ThreadPoolExecutor(max_workers=BOOK_WORKERS) as pool:
+        fetched = list(pool.map(lambda book: _fetch_board(book[1], sport_label, book[0]), books))
+
+    # Only boards that still have to be scored need the caches warm.
+    props = board_props([raw for (sb, _), (raw, _, fresh) in zip(books, fetched)
+                         if fresh or not has_checkpoint("score", sport_label, sb)],
+                        stat_types)
+    if len(props):
+        t0 = time.perf_counter()
+        try:
+            warmed = prefetch_fn(props)
+            out.append(f"  Prefetched {warmed} in {time.perf_counter() - t0:.1f}s.")
+        except Exception as e:
+            out.append(f"  Prefetch failed ({e}) — scoring will fetch as it goes.")
+
+    total = 0
+    with ThreadPoolExecutor(max_workers=BOOK_WORKERS) as pool:
+        futures = [None if err else pool.submit(run_book, sb, raw, fresh, sport_label,
+                                                stat_types, parts_fn, cal, p_cal, writer)
+                   for (sb, _), (raw, err, fresh) in zip(books, fetched)]
+        for (sb, _), (_, err, _), fut in zip(books, fetched, futures):
+            try:
+                if err is not None:
+                    raise err
+                n, lines = fut.result()
+            except Exception as e:
+                n, lines = 0, [f"\n  [{sb}]", f"    Failed: {e}"]
+            total += n
+            out += lines
+    return total, out
 
 # ── Pre-run housekeeping ───────────────────────────────────────────────────
 
@@ -386,13 +723,24 @@ def resolve_pending():
     parlays against stale factors.
     """
     print(f"\n{'='*62}\n  Resolving pending legs\n{'='*62}")
+    done = load_checkpoint("resolve")
+    if done is not None:
+        print(f"  Resolved earlier today — MLB {done['mlb']}, WNBA {done['wnba']}, "
+              f"NBA {done['nba']}; skipping.")
+        return
+    timings = {}
     try:
-        counts = parlay_tracker.resolve_all_legs()
+        with stage("resolve"):
+            counts = parlay_tracker.resolve_all_legs(timings)
         print(f"  Resolved — MLB {counts['mlb']}, WNBA {counts['wnba']}, NBA {counts['nba']}")
+        save_checkpoint("resolve", counts)
     except Exception as e:
         # A resolver outage must not block generation; today's factors just stay put.
         print(f"  Resolution failed ({e}) — continuing with existing calibration.")
         return
+    finally:
+        for step, seconds in timings.items():
+            add_stage(f"resolve_{step}", seconds)
 
     try:
         abandoned = parlay_tracker.get_abandoned_legs()
@@ -425,30 +773,64 @@ def warn_if_stale(now):
 
 # ── Entry point ────────────────────────────────────────────────────────────
 
-def main():
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate and log today's parlays.")
+    ap.add_argument("--from-stage", choices=STAGES,
+                    help="redo this stage and every later one, ignoring today's "
+                         "checkpoints for them (resolve = start over; fetch keeps "
+                         "the later stages of a board that has not changed)")
+    args = ap.parse_args(argv)
+
     now   = datetime.now()
+    t0    = time.perf_counter()
     month = now.month
     print(f"\nKonjure Analytics — Daily Parlay Generator")
-    print(f"Run: {now.strftime('%Y-%m-%d %H:%M')}")
+    print(f"Run: {now.strftime('%Y-%m-%d %H:%M')}"
+          + (f" (from stage: {args.from_stage})" if args.from_stage else ""))
+    open_run(now, args.from_stage)
 
     warn_if_stale(now)
     resolve_pending()
 
-    total = 0
-    total += run_sport("mlb",  "MLB",  2, MLB_STAT_TYPES,  mlb_hit_rate)
-
+    sports = [("mlb", "MLB", 2, MLB_STAT_TYPES, mlb_rate_parts, prefetch_mlb)]
     if 5 <= month <= 9:
-        total += run_sport("wnba", "WNBA", 6, WNBA_STAT_TYPES, wnba_hit_rate)
+        sports.append(("wnba", "WNBA", 6, WNBA_STAT_TYPES, wnba_rate_parts, prefetch_wnba))
     else:
         print("\n  WNBA: off-season — skipping.")
-
     if month >= 10 or month <= 6:
-        total += run_sport("nba",  "NBA",  7, NBA_STAT_TYPES,  nba_hit_rate)
+        sports.append(("nba", "NBA", 7, NBA_STAT_TYPES, nba_rate_parts, prefetch_nba))
     else:
         print("\n  NBA: off-season — skipping.")
 
+    calibration = {}
+    for _, label, *_ in sports:
+        with stage("calibration", label):
+            calibration[label] = sport_calibration(label)
+    total = 0
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tracker") as writer, \
+            ThreadPoolExecutor(max_workers=SPORT_WORKERS) as pool:
+        futures = {pool.submit(run_sport, *args, calibration[args[1]], writer): args[1]
+                   for args in sports}
+        for fut in as_completed(futures):
+            try:
+                n, lines = fut.result()
+            except Exception as e:
+                n, lines = 0, [f"\n  {futures[fut]} failed: {e}"]
+            print("\n".join(lines))
+            total += n
+
+    if pm._FD_UNMAPPED:
+        # A FanDuel market we can't name is a prop we silently never bet — the same
+        # failure mode as the stat types that went months without resolving.
+        print(f"\n  FanDuel markets with no stat mapping: {sorted(pm._FD_UNMAPPED)}")
+        pm._FD_UNMAPPED.clear()
+
     print(f"\n{'='*62}")
     print(f"  Total parlays logged: {total}")
+    print(f"  Scored-leg cache: {_scored_counts['hit']} hits / "
+          f"{_scored_counts['miss']} misses")
+    print(f"  Wall time: {time.perf_counter() - t0:.1f}s\n")
+    report_run(now, time.perf_counter() - t0, total)
     print(f"{'='*62}\n")
 
 if __name__ == "__main__":
@@ -1,14 +1,32 @@
-import sys, os, json, math, requests, time, io, unicodedata
+"""
+hr_picks_today.py — today's home-run board: FanDuel "To Hit A Home Run" prices
+joined to a Statcast matchup model, logged to hr_market_log.json so outcomes can
+backfill and grade it.
+
+build_hr_board(date) is the pipeline and does no logging or printing, so the
+dashboard can import it; running the file is the cron job (resolve the log,
+build, persist, print the boards).
+"""
+import sys, os, json, math, io, argparse, unicodedata
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
 import pandas as pd
-sys.stdout.reconfigure(encoding="utf-8")
 
+import http_client
 import parlay_model as pm
 
 MLB_BASE = "https://statsapi.mlb.com/api/v1"
 MLB_SEASON = "2026"
 LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hr_market_log.json")
 
+# Every fetch in a board build — schedule, rosters, weather, HR/9, handedness,
+# splits, log backfill — is one small request, and the build used to make them
+# one after another. They go out on a pool this wide instead; http_client's host
+# caps and the Stats API token bucket still bound what any one host sees.
+HR_WORKERS = 8
+
 # ── Park factors + venue coords ─────────────────────────────────────────────
 PARK_FACTORS = {
     "Coors Field": 140, "Great American Ball Park": 125,
@@ -69,9 +87,14 @@ PARK_CF_BEARING = {
 # the coefficient never has to be hand-tuned.
 #
 #   hr_index = eff_barrel * air_pull * pit_air * hardhit * platoon * pa_slot * context
-#   lambda   = k * hr_index          (k fit so mean model ≈ mean market over the slate)
+#   lambda   = k * hr_index          (k fit so mean model ≈ mean market over the slate,
+#                                     or per game / per park with fit_by)
 #   P(>=1 HR)= 1 - exp(-lambda)
 #
+# The index is computed as array operations over the whole slate's features (see
+# slate_features), so every rostered hitter with Statcast data is scored — priced
+# or not — and k is fit on the priced ones by Newton's method.
+#
 # Factors (each a ratio to league, clamped, mild exponents to avoid double-counting
 # the barrel rate, which already encodes contact quality):
 #   eff_barrel : batter barrel × pitcher barrel-allowed / league   (log5 matchup)
@@ -83,11 +106,15 @@ PARK_CF_BEARING = {
 #   context    : park factor, temperature, and signed wind DIRECTION (Tier 1)
 LEAGUE_BARREL = 0.065
 MODEL_WEIGHT  = 0.35
-TOP_TO_SCORE  = 60
 MIN_MARKET    = 0.08
 VALUE_EDGE    = 0.03
+MIN_FIT       = 5        # priced hitters needed to fit k (per group with fit_by)
+K_DEFAULT     = 1.7      # k when there are fewer
+K_BOUNDS      = (0.05, 8.0)
 PA_BY_SLOT = {1: 4.65, 2: 4.55, 3: 4.44, 4: 4.34, 5: 4.23, 6: 4.13, 7: 4.02, 8: 3.92, 9: 3.81}
 PA_BASE = 4.23
+# Expected PAs indexed by slot: 0 (no posted lineup) and 10 (past the ninth) are the base.
+_PA_TABLE = np.array([PA_BASE] + [PA_BY_SLOT[i] for i in range(1, 10)] + [PA_BASE])
 
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
@@ -106,7 +133,7 @@ def get_weather(venue):
         url = (f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}"
                f"&current=temperature_2m,wind_speed_10m,wind_direction_10m"
                f"&wind_speed_unit=mph&temperature_unit=fahrenheit&forecast_days=1")
-        cur = requests.get(url, timeout=6).json().get("current", {})
+        cur = http_client.get(url, timeout=6).json().get("current", {})
         return {
             "temp_f": round(float(cur.get("temperature_2m", 75)), 1),
             "wind_mph": round(float(cur.get("wind_speed_10m", 5)), 1),
@@ -134,16 +161,17 @@ def context_boost(venue, weather):
     return 1.0 + park + temp + wind, pf
 
 # ── Pitcher HR/9 (residual + fallback) ──────────────────────────────────────
-_hr9_cache = {}
+# The dashboard imports build_hr_board and stays up for days, so this and the
+# leaderboards below expire like parlay_model's Statcast caches instead of
+# serving the first build's numbers forever.
+@pm._ttl_cache(21600)
 def pitcher_hr9(pid):
     if not pid:
         return 1.1
-    if pid in _hr9_cache:
-        return _hr9_cache[pid]
     val = 1.1
     try:
         url = f"{MLB_BASE}/people/{pid}/stats?stats=season&season={MLB_SEASON}&group=pitching"
-        splits = requests.get(url, timeout=8).json().get("stats", [{}])[0].get("splits", [])
+        splits = http_client.get(url, timeout=8).json().get("stats", [{}])[0].get("splits", [])
         if splits:
             s = splits[0]["stat"]
             ip_str = str(s.get("inningsPitched", "0") or "0")
@@ -154,68 +182,36 @@ def pitcher_hr9(pid):
                 val = round(hr / ip * 9, 2)
     except Exception:
         pass
-    _hr9_cache[pid] = val
     return val
 
 def get_roster(team_id):
     try:
         url = f"{MLB_BASE}/teams/{team_id}/roster?season={MLB_SEASON}&rosterType=active"
-        resp = requests.get(url, timeout=10).json()
+        resp = http_client.get(url, timeout=10).json()
         return [{"name": p["person"]["fullName"], "id": p["person"]["id"]}
                 for p in resp.get("roster", [])
                 if p.get("position", {}).get("abbreviation", "") not in ("P", "RP", "SP")]
     except Exception:
         return []
 
-_hand_cache = {}
 def get_player_hand(pid):
-    if pid in _hand_cache:
-        return _hand_cache[pid]
-    res = ("R", "R")
-    try:
-        resp = requests.get(f"{MLB_BASE}/people/{pid}", timeout=6).json()
-        person = (resp.get("people") or [{}])[0]
-        res = (person.get("batSide", {}).get("code", "R"),
-               person.get("pitchHand", {}).get("code", "R"))
-    except Exception:
-        pass
-    _hand_cache[pid] = res
-    return res
+    return pm.mlb_player_hand(pid)
 
 # ── Platoon splits: batter ISO vs LHP / RHP (Tier 2, rate-level) ─────────────
-_split_cache = {}
 def batter_iso_split(pid):
-    """Returns {'L': iso_vs_lhp, 'R': iso_vs_rhp, 'all': iso_overall} or {}."""
-    if pid in _split_cache:
-        return _split_cache[pid]
-    out = {}
-    try:
-        url = (f"{MLB_BASE}/people/{pid}/stats?stats=statSplits&group=hitting"
-               f"&season={MLB_SEASON}&sitCodes=vr,vl")
-        for st in requests.get(url, timeout=8).json().get("stats", []):
-            for sp in st.get("splits", []):
-                d = sp.get("stat", {})
-                try:
-                    iso = float(d.get("slg", 0)) - float(d.get("avg", 0))
-                    ab = int(d.get("atBats", 0) or 0)
-                except (TypeError, ValueError):
-                    continue
-                code = sp.get("split", {}).get("code")
-                if code == "vl" and ab >= 20:
-                    out["L"] = iso
-                elif code == "vr" and ab >= 20:
-                    out["R"] = iso
-    except Exception:
-        pass
-    _split_cache[pid] = out
-    return out
+    """Returns {'L': iso_vs_lhp, 'R': iso_vs_rhp} or {}."""
+    return pm.mlb_platoon_iso(pid)
 
 # ── Statcast leaderboards (batter + pitcher), one fetch each ────────────────
-_savant = {"batter": {}, "pitcher": {}}
-_league = {}
+LEAGUE_FALLBACK = {"fb": 26.5, "pull": 39.7, "hardhit": 38.3}
+
+@pm._ttl_cache(21600)
 def savant_load(kind):
-    if _savant[kind]:
-        return _savant[kind]
+    """
+    (players, league) for one leaderboard: mlbam id -> Statcast rates, and the
+    league baselines over regulars. Raises when the fetch fails, so a failure is
+    not cached and the next build retries.
+    """
     sels = (["pa", "barrel_batted_rate", "xslg", "xiso", "hard_hit_percent",
              "flyballs_percent", "pull_percent"] if kind == "batter"
             else ["pa", "barrel_batted_rate", "flyballs_percent", "groundballs_percent",
@@ -224,112 +220,142 @@ def savant_load(kind):
            f"?year={MLB_SEASON}&type={kind}&filter=&min=10"
            f"&selections={','.join(sels)}&chart=false&x={sels[1]}&y={sels[1]}&r=no"
            f"&chartType=beeswarm&sort={sels[1]}&sortDir=desc&csv=true")
-    try:
-        r = requests.get(url, timeout=25, headers={"User-Agent": "Mozilla/5.0"})
-        df = pd.read_csv(io.StringIO(r.content.decode("utf-8-sig")))
-        for _, row in df.iterrows():
-            try:
-                pid = int(row["player_id"])
-            except (TypeError, ValueError):
-                continue
-            g = lambda c: (float(row[c]) if pd.notna(row.get(c)) else None)
-            br = g("barrel_batted_rate")
-            _savant[kind][pid] = {
-                "barrel": br / 100 if br is not None else None,
-                "fb": g("flyballs_percent"), "pull": g("pull_percent"),
-                "gb": g("groundballs_percent"), "hardhit": g("hard_hit_percent"),
-                "xiso": g("xiso"), "xslg": g("xslg"),
-                "pa": int(row["pa"]) if pd.notna(row.get("pa")) else 0,
-            }
-        # league baselines over the more-stable regulars (pa>=100)
-        reg = df[df["pa"] >= 100] if "pa" in df.columns else df
-        _league[kind] = {
-            "fb": float(reg["flyballs_percent"].mean()) if "flyballs_percent" in reg else 26.5,
-            "pull": float(reg["pull_percent"].mean()) if "pull_percent" in reg else 39.7,
-            "hardhit": float(reg["hard_hit_percent"].mean()) if "hard_hit_percent" in reg else 38.3,
+    r = http_client.get(url, timeout=25, headers={"User-Agent": "Mozilla/5.0"})
+    df = pd.read_csv(io.StringIO(r.content.decode("utf-8-sig")))
+    players = {}
+    for _, row in df.iterrows():
+        try:
+            pid = int(row["player_id"])
+        except (TypeError, ValueError):
+            continue
+        g = lambda c: (float(row[c]) if pd.notna(row.get(c)) else None)
+        br = g("barrel_batted_rate")
+        players[pid] = {
+            "barrel": br / 100 if br is not None else None,
+            "fb": g("flyballs_percent"), "pull": g("pull_percent"),
+            "gb": g("groundballs_percent"), "hardhit": g("hard_hit_percent"),
+            "xiso": g("xiso"), "xslg": g("xslg"),
+            "pa": int(row["pa"]) if pd.notna(row.get("pa")) else 0,
         }
-    except Exception as e:
-        print(f"  Savant {kind} fetch failed ({e}); using fallbacks.")
-        _league[kind] = {"fb": 26.5, "pull": 39.7, "hardhit": 38.3}
-    return _savant[kind]
+    # league baselines over the more-stable regulars (pa>=100)
+    reg = df[df["pa"] >= 100] if "pa" in df.columns else df
+    league = {
+        "fb": float(reg["flyballs_percent"].mean()) if "flyballs_percent" in reg else LEAGUE_FALLBACK["fb"],
+        "pull": float(reg["pull_percent"].mean()) if "pull_percent" in reg else LEAGUE_FALLBACK["pull"],
+        "hardhit": float(reg["hard_hit_percent"].mean()) if "hard_hit_percent" in reg else LEAGUE_FALLBACK["hardhit"],
+    }
+    return players, league
 
 # ── HR index (proportional to the Poisson mean; k calibrated separately) ────
-def hr_index(pid, opp_pid, mult, slot=None, use_platoon=False):
-    b = savant_load("batter").get(pid) or {}
-    barrel = b.get("barrel")
-    if barrel is None:
-        return None, {}          # no Statcast batter data → skip (fallback handled by caller)
-    lgb = _league["batter"]
-    p = savant_load("pitcher").get(opp_pid) or {}
-
-    # log5 matchup barrel
-    pbrl = p.get("barrel")
-    eff_barrel = barrel * (pbrl / LEAGUE_BARREL if pbrl else 1.0)
-
-    # batter air/pull conversion
-    air_pull = 1.0
-    if b.get("fb") is not None:
-        air_pull *= clamp((b["fb"] / lgb["fb"]) ** 0.5, 0.75, 1.35)
-    if b.get("pull") is not None:
-        air_pull *= clamp((b["pull"] / lgb["pull"]) ** 0.3, 0.85, 1.20)
-
-    # pitcher fly-ball tendency
-    pit_air = clamp((p["fb"] / _league["pitcher"]["fb"]) ** 0.5, 0.80, 1.30) if p.get("fb") else 1.0
-
-    # hard-hit stabiliser (mild)
-    hardhit = clamp((b["hardhit"] / lgb["hardhit"]) ** 0.25, 0.90, 1.15) if b.get("hardhit") else 1.0
-
-    # HR/9 residual (light, and the sole pitcher signal when Statcast is missing)
-    p_hr9 = pitcher_hr9(opp_pid)
-    if pbrl:
-        hr9_f = 1 + 0.4 * (clamp(p_hr9 / 1.1, 0.7, 1.4) - 1)
-    else:
-        hr9_f = clamp(p_hr9 / 1.1, 0.7, 1.4)
-
-    # platoon (rate-level ISO vs hand, else flat hand bonus). Only computed for the
-    # detailed pass — the fit pass leaves it neutral to avoid 260 handedness calls.
-    platoon = 1.0
-    if use_platoon:
-        b_hand = get_player_hand(pid)[0]
-        p_hand = get_player_hand(opp_pid)[1] if opp_pid else "R"
-        spl = batter_iso_split(pid)
-        iso_all = b.get("xiso")
-        iso_vs = spl.get(p_hand)
-        if iso_vs is not None and iso_all and iso_all > 0:
-            platoon = clamp(iso_vs / iso_all, 0.80, 1.30)
-        elif b_hand == "S":
-            platoon = 1.015
-        elif b_hand in ("L", "R") and b_hand != p_hand:
-            platoon = 1.03
-
-    # lineup slot → expected PAs
-    pa_f = (PA_BY_SLOT.get(slot, PA_BASE) / PA_BASE) if slot else 1.0
-
-    idx = eff_barrel * air_pull * pit_air * hardhit * hr9_f * platoon * pa_f * mult
-    detail = {
-        "barrel": round(barrel * 100, 1), "pbrl": round(pbrl * 100, 1) if pbrl else None,
-        "air_pull": round(air_pull, 3), "pit_air": round(pit_air, 3),
-        "hardhit": round(hardhit, 3), "platoon": round(platoon, 3),
-        "pa_f": round(pa_f, 3), "slot": slot, "xiso": b.get("xiso"),
-        "xslg": b.get("xslg"), "fb": b.get("fb"), "pull": b.get("pull"),
-        "pit_fb": p.get("fb"), "hr9": p_hr9,
+def slate_features(ctxs, lineup_slot, savant):
+    """
+    The model inputs for a list of hitter contexts, one array per input and one
+    entry per context (NaN where Statcast has nothing); savant is {kind: players}
+    from savant_load. Handedness, splits and HR/9 come from their caches, so warm
+    those first.
+    """
+    bat, pit = savant["batter"], savant["pitcher"]
+    b = [bat.get(c["pid"]) or {} for c in ctxs]
+    p = [pit.get(c["opp_pid"]) or {} for c in ctxs]
+    col = lambda rows, key: np.array([r.get(key) for r in rows], dtype=float)
+    p_hand = [get_player_hand(c["opp_pid"])[1] if c["opp_pid"] else "R" for c in ctxs]
+    return {
+        "barrel": col(b, "barrel"), "fb": col(b, "fb"), "pull": col(b, "pull"),
+        "hardhit": col(b, "hardhit"), "xiso": col(b, "xiso"),
+        "pbrl": col(p, "barrel"), "pit_fb": col(p, "fb"),
+        "hr9": np.array([pitcher_hr9(c["opp_pid"]) for c in ctxs], dtype=float),
+        "iso_vs": np.array([batter_iso_split(c["pid"]).get(h) for c, h in zip(ctxs, p_hand)],
+                           dtype=float),
+        "b_hand": np.array([get_player_hand(c["pid"])[0] for c in ctxs], dtype=object),
+        "p_hand": np.array(p_hand, dtype=object),
+        "slot": np.array([lineup_slot.get(c["pid"]) or 0 for c in ctxs], dtype=int),
+        "mult": col(ctxs, "mult"),
     }
-    return idx, detail
 
-def fit_k(pairs):
+def hr_index(F, league):
+    """
+    (index, factors) for every row of slate_features(): the HR index, NaN where
+    the batter has no Statcast barrel rate, and each factor as an array. league
+    is {kind: baselines} from savant_load.
+    """
+    lgb, lgp = league["batter"], league["pitcher"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # log5 matchup barrel; a missing or zero pitcher rate counts as league
+        pbrl = np.nan_to_num(F["pbrl"])
+        has_pbrl = pbrl > 0
+        eff_barrel = F["barrel"] * np.where(has_pbrl, pbrl / LEAGUE_BARREL, 1.0)
+
+        # batter air/pull conversion
+        fb, pull = F["fb"], F["pull"]
+        air_pull = (np.where(np.isnan(fb), 1.0, np.clip((fb / lgb["fb"]) ** 0.5, 0.75, 1.35))
+                    * np.where(np.isnan(pull), 1.0,
+                               np.clip((pull / lgb["pull"]) ** 0.3, 0.85, 1.20)))
+
+        # pitcher fly-ball tendency
+        pit_fb = np.nan_to_num(F["pit_fb"])
+        pit_air = np.where(pit_fb > 0, np.clip((pit_fb / lgp["fb"]) ** 0.5, 0.80, 1.30), 1.0)
+
+        # hard-hit stabiliser (mild)
+        hh = np.nan_to_num(F["hardhit"])
+        hardhit = np.where(hh > 0, np.clip((hh / lgb["hardhit"]) ** 0.25, 0.90, 1.15), 1.0)
+
+        # HR/9 residual (light, and the sole pitcher signal when Statcast is missing)
+        hr9 = np.clip(F["hr9"] / 1.1, 0.7, 1.4)
+        hr9_f = np.where(has_pbrl, 1 + 0.4 * (hr9 - 1), hr9)
+
+        # platoon: rate-level ISO vs the starter's hand, else a flat hand bonus
+        xiso, iso_vs, b_hand = np.nan_to_num(F["xiso"]), F["iso_vs"], F["b_hand"]
+        platoon = np.where(
+            ~np.isnan(iso_vs) & (xiso > 0), np.clip(iso_vs / xiso, 0.80, 1.30),
+            np.where(b_hand == "S", 1.015,
+                     np.where(np.isin(b_hand, ("L", "R")) & (b_hand != F["p_hand"]), 1.03, 1.0)))
+
+        # lineup slot → expected PAs
+        pa_f = _PA_TABLE[np.clip(F["slot"], 0, 10)] / PA_BASE
+
+    idx = eff_barrel * air_pull * pit_air * hardhit * hr9_f * platoon * pa_f * F["mult"]
+    factors = {"air_pull": air_pull, "pit_air": pit_air, "hardhit": hardhit,
+               "hr9_f": hr9_f, "platoon": platoon, "pa_f": pa_f}
+    return idx, factors
+
+def _newton_k(idx, market, group, n_groups):
+    """
+    k per group solving mean(1-exp(-k*idx)) = mean(market) within each group. The
+    left side is increasing and concave in k, so Newton from k=0 climbs to the
+    root without overshooting; all groups step together.
+    """
+    n = np.bincount(group, minlength=n_groups)
+    target = np.bincount(group, market, minlength=n_groups) / np.maximum(n, 1)
+    k = np.zeros(n_groups)
+    for _ in range(50):
+        e = np.exp(-k[group] * idx)
+        f = np.bincount(group, 1 - e, minlength=n_groups) / np.maximum(n, 1) - target
+        slope = np.bincount(group, idx * e, minlength=n_groups) / np.maximum(n, 1)
+        step = np.divide(f, slope, out=np.zeros(n_groups), where=slope > 0)
+        k -= step
+        if np.all(np.abs(step) < 1e-10):
+            break
+    return np.clip(k, *K_BOUNDS)
+
+def fit_k(idx, market):
     """Solve k so mean(1-exp(-k*idx)) matches mean(market) across the slate."""
-    if len(pairs) < 5:
-        return 1.7
-    target = sum(m for _, m in pairs) / len(pairs)
-    lo, hi = 0.05, 8.0
-    for _ in range(40):
-        k = (lo + hi) / 2
-        avg = sum(1 - math.exp(-k * i) for i, _ in pairs) / len(pairs)
-        if avg < target:
-            lo = k
-        else:
-            hi = k
-    return (lo + hi) / 2
+    if len(idx) < MIN_FIT:
+        return K_DEFAULT
+    return float(_newton_k(np.asarray(idx, float), np.asarray(market, float),
+                           np.zeros(len(idx), dtype=int), 1)[0])
+
+def fit_k_by(idx, market, groups):
+    """
+    {group: k} fit separately within each group (a game, a park). A group with
+    fewer than MIN_FIT priced hitters gets the slate-wide k.
+    """
+    slate_k = fit_k(idx, market)
+    labels, group = np.unique(np.asarray(groups, dtype=object), return_inverse=True)
+    if not len(labels):
+        return {}
+    ks = _newton_k(np.asarray(idx, float), np.asarray(market, float), group, len(labels))
+    n = np.bincount(group, minlength=len(labels))
+    return {lab: float(k) if cnt >= MIN_FIT else slate_k for lab, k, cnt in zip(labels, ks, n)}
 
 # ── Persistent log + backfill resolver ──────────────────────────────────────
 def load_log():
@@ -338,6 +364,21 @@ def load_log():
     except Exception:
         return []
 
+def _hr_by_date(pid):
+    """{date: home runs} for a hitter over the last two seasons' game logs."""
+    hr_by_date = {}
+    for season in ("2025", "2026"):
+        try:
+            url = f"{MLB_BASE}/people/{pid}/stats?stats=gameLog&season={season}&group=hitting"
+            splits = http_client.get(url, timeout=8).json().get("stats", [{}])[0].get("splits", [])
+            for s in splits:
+                d = s.get("date")
+                if d:
+                    hr_by_date[d] = hr_by_date.get(d, 0) + int(s.get("stat", {}).get("homeRuns", 0) or 0)
+        except Exception:
+            pass
+    return hr_by_date
+
 def resolve_log(entries, today):
     pending = [e for e in entries if e.get("outcome") is None
                and e.get("date", "") < today and e.get("player_id")]
@@ -347,24 +388,15 @@ def resolve_log(entries, today):
     for e in pending:
         by_pid[e["player_id"]].append(e)
     print(f"Resolving {len(pending)} past HR log entr(ies) across {len(by_pid)} player(s)…")
+    with ThreadPoolExecutor(max_workers=HR_WORKERS) as pool:
+        hrs = dict(zip(by_pid, pool.map(_hr_by_date, by_pid)))
     resolved = 0
     for pid, es in by_pid.items():
-        hr_by_date = {}
-        for season in ("2025", "2026"):
-            try:
-                url = f"{MLB_BASE}/people/{pid}/stats?stats=gameLog&season={season}&group=hitting"
-                splits = requests.get(url, timeout=8).json().get("stats", [{}])[0].get("splits", [])
-                for s in splits:
-                    d = s.get("date")
-                    if d:
-                        hr_by_date[d] = hr_by_date.get(d, 0) + int(s.get("stat", {}).get("homeRuns", 0) or 0)
-            except Exception:
-                pass
+        hr_by_date = hrs[pid]
         for e in es:
             if e["date"] in hr_by_date:
                 e["outcome"] = 1 if hr_by_date[e["date"]] > 0 else 0
                 resolved += 1
-        time.sleep(0.03)
     return resolved
 
 def calibration_report(entries):
@@ -380,48 +412,51 @@ def calibration_report(entries):
         line += f"  |  model avg {sum(e['model'] for e in mdl)/len(mdl):.1%}"
     print(line)
 
-# ══════════════════════════════════════════════════════════════════════════
-today = __import__("datetime").datetime.now().strftime("%Y-%m-%d")
-log_entries = load_log()
-try:
-    done = resolve_log(log_entries, today)
-    if done:
-        json.dump(log_entries, open(LOG_PATH, "w", encoding="utf-8"), indent=1)
-        print(f"  resolved {done} outcome(s).")
-except Exception as e:
-    print(f"  (resolver skipped: {e})")
-
-print("Fetching FanDuel MLB home-run lines…")
-fd = pm.fetch_fanduel("mlb")
-hr_market = {}
-if not fd.empty:
-    for _, r in fd[fd["stat_type"] == "Home Runs"].iterrows():
-        hr_market[norm_name(r["player_name"])] = {
-            "player": r["player_name"], "implied": float(r["implied_prob"]),
-            "odds": int(r["american_odds"]),
-        }
-print(f"  {len(hr_market)} players with a FanDuel 'To Hit A Home Run' price.")
-if not hr_market:
-    print("No FanDuel HR lines available right now (lines usually post closer to game time).")
-    sys.exit(0)
-
-print("Loading Statcast leaderboards (batter + pitcher barrels, batted-ball, hard-hit)…")
-savant_load("batter"); savant_load("pitcher")
-print(f"  {len(_savant['batter'])} batters, {len(_savant['pitcher'])} pitchers.")
-
-print(f"Fetching schedule + lineups + rosters for {today}…")
-sched = requests.get(
-    f"{MLB_BASE}/schedule?sportId=1&date={today}&hydrate=probablePitcher,team,venue,lineups",
-    timeout=12,
-).json()
-
-player_ctx = {}
-lineup_slot = {}         # pid -> batting order slot (1-9) when posted
-for de in sched.get("dates", []):
-    for g in de.get("games", []):
+# ── Board pipeline ──────────────────────────────────────────────────────────
+def _warm(pool, fn, args):
+    """Run fn over args on the pool for its cache side effect; failures stay cold."""
+    for fut in [pool.submit(fn, a) for a in args]:
+        try:
+            fut.result()
+        except Exception:
+            pass
+
+def fetch_hr_market():
+    """norm_name -> {player, implied, odds} for every FanDuel 'To Hit A Home Run' price."""
+    fd = pm.fetch_fanduel("mlb")
+    hr_market = {}
+    if not fd.empty:
+        for _, r in fd[fd["stat_type"] == "Home Runs"].iterrows():
+            hr_market[norm_name(r["player_name"])] = {
+                "player": r["player_name"], "implied": float(r["implied_prob"]),
+                "odds": int(r["american_odds"]),
+            }
+    return hr_market
+
+def fetch_schedule(date):
+    return http_client.get(
+        f"{MLB_BASE}/schedule?sportId=1&date={date}&hydrate=probablePitcher,team,venue,lineups",
+        timeout=12,
+    ).json()
+
+def slate_context(sched, pool):
+    """
+    (player_ctx, lineup_slot) for a schedule: norm_name -> game context for every
+    rostered hitter, and pid -> batting-order slot where lineups are posted. The
+    weather per game and the roster per team are fetched side by side.
+    """
+    games = [g for de in sched.get("dates", []) for g in de.get("games", [])]
+    venues = sorted({g.get("venue", {}).get("name", "") for g in games})
+    team_ids = sorted({g["teams"][side]["team"]["id"] for g in games for side in ("away", "home")})
+    weather_by_venue = dict(zip(venues, pool.map(get_weather, venues)))
+    rosters = dict(zip(team_ids, pool.map(get_roster, team_ids)))
+
+    player_ctx = {}
+    lineup_slot = {}         # pid -> batting order slot (1-9) when posted
+    for g in games:
         at, ht = g["teams"]["away"], g["teams"]["home"]
         venue = g.get("venue", {}).get("name", "")
-        weather = get_weather(venue)
+        weather = weather_by_venue[venue]
         mult, pf = context_boost(venue, weather)
         label = f"{at['team'].get('abbreviation','')} @ {ht['team'].get('abbreviation','')}"
         lu = g.get("lineups", {}) or {}
@@ -431,53 +466,122 @@ for de in sched.get("dates", []):
                     lineup_slot[pl["id"]] = i
         for side, team, opp in (("away", at, ht), ("home", ht, at)):
             opp_prob = opp.get("probablePitcher", {}) or {}
-            for h in get_roster(team["team"]["id"]):
+            for h in rosters[team["team"]["id"]]:
                 player_ctx[norm_name(h["name"])] = {
-                    "pid": h["id"], "team": team["team"].get("abbreviation", ""),
+                    "pid": h["id"], "name": h["name"], "team": team["team"].get("abbreviation", ""),
                     "opp_pid": opp_prob.get("id"), "opp_pitcher": opp_prob.get("fullName", "TBD"),
                     "venue": venue, "pf": pf, "mult": mult,
                     "temp_f": weather["temp_f"], "wind_mph": weather["wind_mph"],
                     "wind_dir": weather.get("wind_dir"), "game": label, "dome": venue in DOMES,
                 }
-
-# ── Pass A: fit k on the full priced slate (cheap index, no platoon calls) ──
-joined = []
-for key, mk in hr_market.items():
-    if mk["implied"] < MIN_MARKET:
-        continue
-    ctx = player_ctx.get(key)
-    if ctx:
-        joined.append((mk, ctx))
-joined.sort(key=lambda x: x[0]["implied"], reverse=True)
-
-fit_pairs = []
-for mk, ctx in joined:
-    idx, _ = hr_index(ctx["pid"], ctx["opp_pid"], ctx["mult"],
-                      slot=lineup_slot.get(ctx["pid"]), use_platoon=False)
-    if idx is not None:
-        fit_pairs.append((idx, mk["implied"]))
-K = fit_k(fit_pairs)
-n_lineups = sum(1 for _, ctx in joined if ctx["pid"] in lineup_slot)
-print(f"  matched {len(joined)} priced hitters ({n_lineups} with posted lineups); "
-      f"calibrated k={K:.2f} to market. Scoring top {min(TOP_TO_SCORE, len(joined))}…\n")
-
-# ── Pass B: score the top market threats in full (adds rate-level platoon) ──
-picks = []
-for mk, ctx in joined[:TOP_TO_SCORE]:
-    idx, det = hr_index(ctx["pid"], ctx["opp_pid"], ctx["mult"],
-                        slot=lineup_slot.get(ctx["pid"]), use_platoon=True)
-    if idx is None:
-        continue
-    model_p = round(min(0.60, max(0.01, 1 - math.exp(-K * idx))), 3)
-    market_p = mk["implied"]
-    picks.append({
-        "player": mk["player"], "pid": ctx["pid"], "team": ctx["team"], "game": ctx["game"],
-        "market": market_p, "odds": mk["odds"], "model": model_p,
-        "blended": round(MODEL_WEIGHT * model_p + (1 - MODEL_WEIGHT) * market_p, 3),
-        "edge": round(model_p - market_p, 3),
-        "pitcher": ctx["opp_pitcher"], "venue": ctx["venue"], "pf": ctx["pf"],
-        "temp_f": ctx["temp_f"], "wind_mph": ctx["wind_mph"], "dome": ctx["dome"], **det,
-    })
+    return player_ctx, lineup_slot
+
+def build_hr_board(date=None, fit_by=None):
+    """
+    Build the day's HR board (date as YYYY-MM-DD, default today). Every rostered
+    hitter with Statcast data is scored; k is fit on the priced ones, slate-wide
+    or per "game" / "venue" with fit_by. Returns a dict: date, k (slate-wide),
+    k_by ({game or venue: k} with fit_by), picks (priced, ranked by market),
+    model_only (unpriced hitters, ranked by model), the slate counts —
+    priced, matched, with_lineups, batters/pitchers with Statcast data — and
+    savant_errors ({kind: error} for a leaderboard that failed and fell back to
+    league defaults). picks is empty when FanDuel has no HR prices up yet.
+    Nothing is logged or printed.
+    """
+    if fit_by not in (None, "game", "venue"):
+        raise ValueError(f"fit_by must be None, 'game' or 'venue', not {fit_by!r}")
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    board = {"date": date, "k": None, "k_by": {}, "picks": [], "model_only": [],
+             "priced": 0, "matched": 0, "with_lineups": 0, "batters": 0, "pitchers": 0,
+             "savant_errors": {}}
+    with ThreadPoolExecutor(max_workers=HR_WORKERS) as pool:
+        # The market, both Statcast leaderboards and the schedule are independent.
+        market_f = pool.submit(fetch_hr_market)
+        savant_fs = {kind: pool.submit(savant_load, kind) for kind in ("batter", "pitcher")}
+        sched_f = pool.submit(fetch_schedule, date)
+        hr_market = market_f.result()
+        board["priced"] = len(hr_market)
+        if not hr_market:
+            return board
+        savant, league = {}, {}
+        for kind, f in savant_fs.items():
+            try:
+                savant[kind], league[kind] = f.result()
+            except Exception as e:
+                savant[kind], league[kind] = {}, dict(LEAGUE_FALLBACK)
+                board["savant_errors"][kind] = str(e)
+        board["batters"], board["pitchers"] = len(savant["batter"]), len(savant["pitcher"])
+        player_ctx, lineup_slot = slate_context(sched_f.result(), pool)
+
+        joined = []
+        for key, mk in hr_market.items():
+            if mk["implied"] < MIN_MARKET:
+                continue
+            ctx = player_ctx.get(key)
+            if ctx:
+                joined.append((mk, ctx))
+        board["matched"] = len(joined)
+        board["with_lineups"] = sum(1 for _, ctx in joined if ctx["pid"] in lineup_slot)
+
+        # Priced hitters first, then the rest of the rosters; only hitters with a
+        # Statcast barrel rate can be indexed.
+        priced = {id(ctx) for _, ctx in joined}
+        rows = joined + [(None, ctx) for ctx in player_ctx.values() if id(ctx) not in priced]
+        rows = [(mk, ctx) for mk, ctx in rows
+                if (savant["batter"].get(ctx["pid"]) or {}).get("barrel") is not None]
+
+        # Handedness + platoon splits for every hitter and starter in a few batched
+        # hydrates; HR/9 per starter and anything a failed chunk left cold on the pool.
+        hitters = [ctx["pid"] for _, ctx in rows]
+        starters = sorted({ctx["opp_pid"] for _, ctx in rows if ctx["opp_pid"]})
+        pm.prefetch_mlb_players(hitters=hitters, pitchers=starters, seasons=(), splits=True)
+        _warm(pool, pitcher_hr9, starters)
+        _warm(pool, get_player_hand, hitters + starters)
+        _warm(pool, batter_iso_split, hitters)
+
+    ctxs = [ctx for _, ctx in rows]
+    F = slate_features(ctxs, lineup_slot, savant)
+    idx, factors = hr_index(F, league)
+    is_priced = np.array([mk is not None for mk, _ in rows], dtype=bool)
+    market = np.array([mk["implied"] if mk else np.nan for mk, _ in rows], dtype=float)
+
+    K = board["k"] = fit_k(idx[is_priced], market[is_priced])
+    k_row = np.full(len(rows), K)
+    if fit_by:
+        groups = np.array([ctx[fit_by] for ctx in ctxs], dtype=object)
+        board["k_by"] = fit_k_by(idx[is_priced], market[is_priced], groups[is_priced])
+        k_row = np.array([board["k_by"].get(g, K) for g in groups])
+    model = np.clip(1 - np.exp(-k_row * idx), 0.01, 0.60)
+
+    for i, (mk, ctx) in enumerate(rows):
+        b = savant["batter"][ctx["pid"]]
+        p = savant["pitcher"].get(ctx["opp_pid"]) or {}
+        pbrl = p.get("barrel")
+        pick = {
+            "player": mk["player"] if mk else ctx["name"], "pid": ctx["pid"],
+            "team": ctx["team"], "game": ctx["game"],
+            "market": mk["implied"] if mk else None, "odds": mk["odds"] if mk else None,
+            "model": round(float(model[i]), 3), "k": round(float(k_row[i]), 3),
+            "pitcher": ctx["opp_pitcher"], "venue": ctx["venue"], "pf": ctx["pf"],
+            "temp_f": ctx["temp_f"], "wind_mph": ctx["wind_mph"], "dome": ctx["dome"],
+            "barrel": round(b["barrel"] * 100, 1), "pbrl": round(pbrl * 100, 1) if pbrl else None,
+            "air_pull": round(float(factors["air_pull"][i]), 3),
+            "pit_air": round(float(factors["pit_air"][i]), 3),
+            "hardhit": round(float(factors["hardhit"][i]), 3),
+            "platoon": round(float(factors["platoon"][i]), 3),
+            "pa_f": round(float(factors["pa_f"][i]), 3), "slot": lineup_slot.get(ctx["pid"]),
+            "xiso": b.get("xiso"), "xslg": b.get("xslg"), "fb": b.get("fb"),
+            "pull": b.get("pull"), "pit_fb": p.get("fb"), "hr9": float(F["hr9"][i]),
+        }
+        if mk:
+            pick["blended"] = round(MODEL_WEIGHT * pick["model"] + (1 - MODEL_WEIGHT) * mk["implied"], 3)
+            pick["edge"] = round(pick["model"] - mk["implied"], 3)
+            board["picks"].append(pick)
+        else:
+            board["model_only"].append(pick)
+    board["picks"].sort(key=lambda x: x["market"], reverse=True)
+    board["model_only"].sort(key=lambda x: x["model"], reverse=True)
+    return board
 
 def odds_fmt(o):
     return f"+{o}" if o > 0 else str(o)
@@ -485,56 +589,113 @@ def odds_fmt(o):
 def wx(p):
     return f"{p['temp_f']:.0f}°F (dome)" if p["dome"] else f"{p['temp_f']:.0f}°F / {p['wind_mph']:.0f} mph"
 
-# ── Persist today's board ──────────────────────────────────────────────────
-log_entries = [e for e in log_entries if e.get("date") != today]
-for p in picks:
-    log_entries.append({
-        "date": today, "player": p["player"], "player_id": p["pid"], "team": p["team"],
-        "game": p["game"], "line": 0.5, "market_implied": p["market"], "american_odds": p["odds"],
-        "model": p["model"], "blended": p["blended"], "edge": p["edge"], "k": round(K, 3),
-        "barrel_pct": p["barrel"], "pitcher_barrel_pct": p["pbrl"], "slot": p["slot"],
-        "factors": {"air_pull": p["air_pull"], "pit_air": p["pit_air"], "hardhit": p["hardhit"],
-                    "platoon": p["platoon"], "pa_f": p["pa_f"]},
-        "venue": p["venue"], "pf": p["pf"], "outcome": None,
-    })
-try:
-    json.dump(log_entries, open(LOG_PATH, "w", encoding="utf-8"), indent=1)
-    print(f"Logged {len(picks)} HR market prices → {os.path.basename(LOG_PATH)}")
-except Exception as e:
-    print(f"(could not write log: {e})")
-
-# ── Board 1: most likely to homer (ranked by market) ───────────────────────
-picks.sort(key=lambda x: x["market"], reverse=True)
-print("\n" + "═" * 78)
-print("  MOST LIKELY TO HOMER TODAY — ranked by FanDuel market price")
-print("═" * 78)
-print(f"  {'Player':<21} {'Tm':<4} {'Mkt':>5} {'Odds':>6} {'Model':>6} {'Edge':>6} {'Brl':>4} {'Slot':>4}  Matchup")
-print(f"  {'-'*76}")
-for p in picks[:15]:
-    slot = str(p["slot"]) if p["slot"] else "—"
-    print(f"  {p['player']:<21} {p['team']:<4} {p['market']*100:>4.0f}% {odds_fmt(p['odds']):>6} "
-          f"{p['model']*100:>5.0f}% {p['edge']*100:>+5.0f}% {p['barrel']:>4.1f} {slot:>4}  {p['game']} · PF{p['pf']}")
-
-# ── Board 2: value plays (model beats market) ──────────────────────────────
-value = [p for p in picks if p["edge"] > VALUE_EDGE]
-value.sort(key=lambda x: x["edge"], reverse=True)
-print("\n" + "═" * 78)
-print("  MODEL VALUE PLAYS — advanced-metric model beats the market (lean, not gospel)")
-print("═" * 78)
-if not value:
-    print("  None today — the model doesn't beat the market on any priced hitter.")
-for i, p in enumerate(value[:8], 1):
-    pbrl_s = f"allows {p['pbrl']:.1f}% barrels" if p.get("pbrl") is not None else f"HR/9 {p['hr9']:.2f}"
-    xiso_s = f"xISO {p['xiso']:.3f}" if p.get("xiso") is not None else "xISO —"
-    slot_s = f"bats {p['slot']}" if p["slot"] else "slot TBD"
-    print(f"\n  #{i}  {p['player']} ({p['team']}) — {p['game']}  [{slot_s}]")
-    print(f"      Market {p['market']*100:.0f}% ({odds_fmt(p['odds'])})  |  Model {p['model']*100:.0f}%  |  "
-          f"Edge {p['edge']*100:+.0f}%  |  Blended {p['blended']*100:.0f}%")
-    print(f"      Barrel {p['barrel']:.1f}% · {xiso_s} · FB {p['fb']:.0f}%/Pull {p['pull']:.0f}%  |  vs {p['pitcher']} ({pbrl_s}, FB {p['pit_fb'] or 0:.0f}%)")
-    print(f"      factors: air/pull ×{p['air_pull']:.2f} · pit-air ×{p['pit_air']:.2f} · "
-          f"platoon ×{p['platoon']:.2f} · PA ×{p['pa_f']:.2f}  |  {p['venue']} (PF {p['pf']}) · {wx(p)}")
-
-calibration_report(log_entries)
-print(f"\n{'─'*78}")
-print(f"Market price is the primary signal; the model (k={K:.2f}, auto-fit to market) is a secondary edge read.")
-print("Outcomes backfill automatically on the next run so each factor can be validated over time.")
+# ── Persist today's board ───────────────────────────────────────────────────
+def log_board(log_entries, board):
+    """Replace the board's date in the HR log with its picks and write the log."""
+    today = board["date"]
+    log_entries[:] = [e for e in log_entries if e.get("date") != today]
+    for p in board["picks"]:
+        log_entries.append({
+            "date": today, "player": p["player"], "player_id": p["pid"], "team": p["team"],
+            "game": p["game"], "line": 0.5, "market_implied": p["market"], "american_odds": p["odds"],
+            "model": p["model"], "blended": p["blended"], "edge": p["edge"], "k": p["k"],
+            "barrel_pct": p["barrel"], "pitcher_barrel_pct": p["pbrl"], "slot": p["slot"],
+            "factors": {"air_pull": p["air_pull"], "pit_air": p["pit_air"], "hardhit": p["hardhit"],
+                        "platoon": p["platoon"], "pa_f": p["pa_f"]},
+            "venue": p["venue"], "pf": p["pf"], "outcome": None,
+        })
+    try:
+        json.dump(log_entries, open(LOG_PATH, "w", encoding="utf-8"), indent=1)
+        print(f"Logged {len(board['picks'])} HR market prices → {os.path.basename(LOG_PATH)}")
+    except Exception as e:
+        print(f"(could not write log: {e})")
+
+# ══════════════════════════════════════════════════════════════════════════
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Today's home-run board.")
+    ap.add_argument("--fit-by", choices=("game", "venue"),
+                    help="fit k to the market per game or per park instead of slate-wide")
+    args = ap.parse_args(argv)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    log_entries = load_log()
+    try:
+        done = resolve_log(log_entries, today)
+        if done:
+            json.dump(log_entries, open(LOG_PATH, "w", encoding="utf-8"), indent=1)
+            print(f"  resolved {done} outcome(s).")
+    except Exception as e:
+        print(f"  (resolver skipped: {e})")
+
+    print(f"Building the HR board for {today} (FanDuel HR prices, Statcast, "
+          f"schedule, rosters, weather)…")
+    board = build_hr_board(today, fit_by=args.fit_by)
+    print(f"  {board['priced']} players with a FanDuel 'To Hit A Home Run' price.")
+    if not board["priced"]:
+        print("No FanDuel HR lines available right now (lines usually post closer to game time).")
+        return
+    for kind, e in board["savant_errors"].items():
+        print(f"  Savant {kind} fetch failed ({e}); using fallbacks.")
+    print(f"  {board['batters']} batters, {board['pitchers']} pitchers with Statcast data.")
+    K = board["k"]
+    print(f"  matched {board['matched']} priced hitters ({board['with_lineups']} with posted "
+          f"lineups); calibrated k={K:.2f} to market. Scored "
+          f"{len(board['picks']) + len(board['model_only'])} hitters with Statcast data.")
+    if board["k_by"]:
+        ks = sorted(board["k_by"].values())
+        print(f"  k per {args.fit_by}: {ks[0]:.2f}–{ks[-1]:.2f} over {len(ks)} {args.fit_by}s.")
+    print()
+
+    picks = board["picks"]
+    log_board(log_entries, board)
+
+    # ── Board 1: most likely to homer (ranked by market) ───────────────────────
+    print("\n" + "═" * 78)
+    print("  MOST LIKELY TO HOMER TODAY — ranked by FanDuel market price")
+    print("═" * 78)
+    print(f"  {'Player':<21} {'Tm':<4} {'Mkt':>5} {'Odds':>6} {'Model':>6} {'Edge':>6} {'Brl':>4} {'Slot':>4}  Matchup")
+    print(f"  {'-'*76}")
+    for p in picks[:15]:
+        slot = str(p["slot"]) if p["slot"] else "—"
+        print(f"  {p['player']:<21} {p['team']:<4} {p['market']*100:>4.0f}% {odds_fmt(p['odds']):>6} "
+              f"{p['model']*100:>5.0f}% {p['edge']*100:>+5.0f}% {p['barrel']:>4.1f} {slot:>4}  {p['game']} · PF{p['pf']}")
+
+    # ── Board 2: value plays (model beats market) ──────────────────────────────
+    value = [p for p in picks if p["edge"] > VALUE_EDGE]
+    value.sort(key=lambda x: x["edge"], reverse=True)
+    print("\n" + "═" * 78)
+    print("  MODEL VALUE PLAYS — advanced-metric model beats the market (lean, not gospel)")
+    print("═" * 78)
+    if not value:
+        print("  None today — the model doesn't beat the market on any priced hitter.")
+    for i, p in enumerate(value[:8], 1):
+        pbrl_s = f"allows {p['pbrl']:.1f}% barrels" if p.get("pbrl") is not None else f"HR/9 {p['hr9']:.2f}"
+        xiso_s = f"xISO {p['xiso']:.3f}" if p.get("xiso") is not None else "xISO —"
+        slot_s = f"bats {p['slot']}" if p["slot"] else "slot TBD"
+        print(f"\n  #{i}  {p['player']} ({p['team']}) — {p['game']}  [{slot_s}]")
+        print(f"      Market {p['market']*100:.0f}% ({odds_fmt(p['odds'])})  |  Model {p['model']*100:.0f}%  |  "
+              f"Edge {p['edge']*100:+.0f}%  |  Blended {p['blended']*100:.0f}%")
+        print(f"      Barrel {p['barrel']:.1f}% · {xiso_s} · FB {p['fb']:.0f}%/Pull {p['pull']:.0f}%  |  vs {p['pitcher']} ({pbrl_s}, FB {p['pit_fb'] or 0:.0f}%)")
+        print(f"      factors: air/pull ×{p['air_pull']:.2f} · pit-air ×{p['pit_air']:.2f} · "
+              f"platoon ×{p['platoon']:.2f} · PA ×{p['pa_f']:.2f}  |  {p['venue']} (PF {p['pf']}) · {wx(p)}")
+
+    # ── Board 3: unpriced hitters the model likes ──────────────────────────────
+    if board["model_only"]:
+        print("\n" + "═" * 78)
+        print("  NO FANDUEL PRICE YET — model's top rostered hitters")
+        print("═" * 78)
+        print(f"  {'Player':<21} {'Tm':<4} {'Model':>6} {'Brl':>4} {'Slot':>4}  Matchup")
+        print(f"  {'-'*76}")
+        for p in board["model_only"][:8]:
+            slot = str(p["slot"]) if p["slot"] else "—"
+            print(f"  {p['player']:<21} {p['team']:<4} {p['model']*100:>5.0f}% {p['barrel']:>4.1f} "
+                  f"{slot:>4}  {p['game']} · PF{p['pf']}")
+
+    calibration_report(log_entries)
+    print(f"\n{'─'*78}")
+    print(f"Market price is the primary signal; the model (k={K:.2f}, auto-fit to market) is a secondary edge read.")
+    print("Outcomes backfill automatically on the next run so each factor can be validated over time.")
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding="utf-8")
+    main()
@@ -0,0 +1,375 @@
+"""
+http_client.py — one pooled HTTP session shared by every module.
+
+Every fetcher used to call bare requests.get, which opens a fresh TCP+TLS
+connection per call and left retry behaviour to whatever loop each call site
+hand-rolled. A slate build makes hundreds of Stats API calls, so the handshake
+alone was a real share of the wall time. Everything now goes through get():
+
+  - one requests.Session with a keep-alive pool per host (urllib3 keys pools by
+    scheme+host+port, so statsapi, FanDuel, PrizePicks… each get their own)
+  - a shared urllib3 Retry policy: connect/read errors and 429/5xx are retried
+    with exponential backoff, honouring Retry-After
+  - a default timeout, so no call can hang a Streamlit rerun indefinitely
+  - a per-host concurrency cap, so the thread pools that fan out over players
+    can't open more sockets to one host than its pool keeps alive (and can't
+    hammer the books' bot protection)
+  - a per-host token bucket for hosts with a request-rate budget, shared by
+    every thread, in place of the fixed sleeps call sites used to pace with
+
+Every call is also entered in a per-host ledger (see http_ledger) — count,
+bytes, latency and errors — so a slow run can be pinned on a host.
+
+get_if_changed() adds conditional requests for the big projection boards
+(PrizePicks, Underdog): ETag / Last-Modified revalidation where the server
+offers it, and a payload hash either way, so an unchanged board costs one
+cheap request and no parsing.
+
+Only idempotent GETs go through here. nba_api and statsapi (MLB-StatsAPI) own
+their own sessions internally and are left alone — except under fixtures, where
+parlay_model hands nba_api fixture_session().
+
+Fixtures: HTTP_FIXTURES=record saves every response to HTTP_FIXTURE_DIR as it
+comes in; HTTP_FIXTURES=replay serves them from there with no network at all,
+so the generator, the resolvers and hr_picks_today can be run and timed offline
+against the same traffic every time (see the Fixtures section).
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 15          # seconds; call sites pass their own where tighter
+POOL_MAXSIZE = 16             # kept-alive sockets per host
+
+# Concurrent in-flight requests allowed per host. The Stats API takes a lot;
+# the sportsbooks sit behind bot protection that reacts to bursts.
+HOST_LIMITS = {
+    "statsapi.mlb.com":                8,
+    "baseballsavant.mlb.com":          2,
+    "api.prizepicks.com":              2,
+    "api.underdogfantasy.com":         2,
+    "sbapi.va.sportsbook.fanduel.com": 16,
+    "sportsbook.draftkings.com":       2,
+    "api.the-odds-api.com":            2,
+}
+DEFAULT_HOST_LIMIT = 6
+
+# Sustained request rate per host as (requests/second, burst). The caps above
+# bound open sockets, not pace: eight threads on a fast host can still fire
+# hundreds of calls a second. A host listed here meters every thread's calls
+# through one token bucket, so a caller waits only when that host's budget is
+# spent — never on an idle host, and never on another host's traffic, which is
+# what lets the sport resolvers run side by side. Unlisted hosts are unmetered.
+HOST_RATES = {
+    "statsapi.mlb.com":  (20.0, 10),
+    "site.api.espn.com": (10.0, 5),
+    "api.sharpapi.io":   (0.2, 2),     # free tier: 12 requests/minute
+}
+
+RETRY = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    status=3,
+    backoff_factor=0.5,                          # 0.5s, 1s, 2s
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,                       # hand back the last response
+)
+
+_session = None
+_session_lock = threading.Lock()
+_host_sems: dict = {}
+_host_buckets: dict = {}
+
+
+def session() -> requests.Session:
+    """The process-wide pooled session (created on first use)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(max_retries=RETRY, pool_connections=32,
+                                      pool_maxsize=POOL_MAXSIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def _host_sem(host: str) -> threading.BoundedSemaphore:
+    sem = _host_sems.get(host)
+    if sem is None:
+        with _session_lock:
+            sem = _host_sems.setdefault(
+                host, threading.BoundedSemaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT)))
+    return sem
+
+
+class _TokenBucket:
+    """Paces callers to `rate` per second with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+            self._stamp = now
+            # Take the token now, even on credit: a negative balance is this
+            # caller's place in the queue, so waiters are served in arrival order
+            # without any of them holding the lock while they sleep.
+            self._tokens -= 1.0
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+def _host_bucket(host: str) -> _TokenBucket | None:
+    if host not in HOST_RATES:
+        return None
+    bucket = _host_buckets.get(host)
+    if bucket is None:
+        with _session_lock:
+            bucket = _host_buckets.setdefault(host, _TokenBucket(*HOST_RATES[host]))
+    return bucket
+
+
+def get(url: str, params=None, *, timeout=None, **kwargs) -> requests.Response:
+    """Drop-in for requests.get over the shared pool, retry policy, rate and host cap."""
+    host = urlsplit(url).hostname or ""
+    bucket = _host_bucket(host)
+    if bucket is not None:
+        bucket.acquire()     # before taking a socket slot, so waiting holds none
+    with _host_sem(host):
+        start = time.perf_counter()
+        try:
+            resp = _send(url, params,
+                         timeout=DEFAULT_TIMEOUT if timeout is None else timeout, **kwargs)
+        except Exception:
+            record(host, time.perf_counter() - start, error=True)
+            raise
+    record(host, time.perf_counter() - start, len(resp.content or b""),
+           error=resp.status_code >= 400)
+    return resp
+
+
+# ── Ledger ───────────────────────────────────────────────────────────────────
+# Per host since the last reset: requests, payload bytes, errors (an exception
+# or a 4xx/5xx answer) and every request's latency — a run is a few thousand
+# calls, so the p95 is taken from the raw list rather than a sketch. Latency is
+# time on the socket, from after the rate limiter and host cap let the call
+# through until the body is in, retries included. Clients that own their own
+# session (nba_api) report through record() themselves.
+_ledger: dict = {}
+_ledger_lock = threading.Lock()
+
+
+def record(host: str, seconds: float, nbytes: int = 0, error: bool = False) -> None:
+    """Enter one request in the ledger."""
+    with _ledger_lock:
+        entry = _ledger.get(host)
+        if entry is None:
+            entry = _ledger[host] = {"requests": 0, "bytes": 0, "errors": 0, "latencies": []}
+        entry["requests"] += 1
+        entry["bytes"] += nbytes
+        entry["errors"] += bool(error)
+        entry["latencies"].append(seconds)
+
+
+def http_ledger(reset: bool = False) -> dict:
+    """
+    {host: {requests, bytes, errors, total_s, p95_s}} since the last reset, busiest
+    host first. reset=True empties the ledger after reading it.
+    """
+    with _ledger_lock:
+        entries = dict(_ledger)
+        if reset:
+            _ledger.clear()
+    out = {}
+    for host, e in sorted(entries.items(), key=lambda kv: -sum(kv[1]["latencies"])):
+        lat = sorted(e["latencies"])
+        p95 = lat[min(len(lat) - 1, math.ceil(0.95 * len(lat)) - 1)] if lat else 0.0
+        out[host] = {
+            "requests": e["requests"],
+            "bytes":    e["bytes"],
+            "errors":   e["errors"],
+            "total_s":  round(sum(lat), 3),
+            "p95_s":    round(p95, 3),
+        }
+    return out
+
+
+# ── Fixtures ─────────────────────────────────────────────────────────────────
+# Every performance question used to need live books, Stats API, stats.nba.com,
+# Savant and Open-Meteo traffic, so no two measurements saw the same inputs.
+# With HTTP_FIXTURES=record each response is saved (gzipped JSON, one file per
+# request) under HTTP_FIXTURE_DIR/<host>/; with HTTP_FIXTURES=replay the same
+# requests are answered from there and nothing touches the network. The key is
+# the normalized URL — scheme, host, path and the query from both the URL and
+# `params`, sorted — so parameter order and dict-vs-list params don't matter;
+# headers don't count, so a conditional revalidation replays the full body and
+# get_if_changed() falls back on its digest. A request with no fixture raises
+# requests.ConnectionError, exactly as if the host were down.
+#
+# Replay waits HTTP_REPLAY_LATENCY seconds per request inside the host cap and
+# after the rate limiter, like a real call would ("recorded" uses each
+# fixture's own recorded latency), so concurrency still shows in a benchmark.
+# Fixtures hold one response per URL: a replay has to run against the date it
+# was recorded on, since the schedule and board URLs carry it.
+#
+# Recording keeps answers below 500 except 304s — a 304 has no body, and a
+# server error is a flake, not a fixture — so a later recording never replaces
+# a good fixture with either.
+FIXTURE_MODE = os.environ.get("HTTP_FIXTURES", "").strip().lower() or None
+FIXTURE_DIR = Path(os.environ.get("HTTP_FIXTURE_DIR")
+                   or Path(__file__).parent / "fixtures" / "http")
+REPLAY_LATENCY = os.environ.get("HTTP_REPLAY_LATENCY", "").strip().lower() or "0"
+if FIXTURE_MODE not in (None, "record", "replay"):
+    raise ValueError(f"HTTP_FIXTURES must be 'record' or 'replay', not {FIXTURE_MODE!r}")
+if REPLAY_LATENCY != "recorded":
+    try:
+        REPLAY_LATENCY = float(REPLAY_LATENCY)
+    except ValueError:
+        REPLAY_LATENCY = -1.0
+    if not 0 <= REPLAY_LATENCY < float("inf"):
+        raise ValueError("HTTP_REPLAY_LATENCY must be a number of seconds or 'recorded', "
+                         f"not {os.environ['HTTP_REPLAY_LATENCY']!r}")
+_KEPT_HEADERS = ("Content-Type", "Content-Encoding", "ETag", "Last-Modified")
+
+
+def _fixture_key(url: str, params=None) -> tuple:
+    """(normalized URL, fixture path) for a request."""
+    full = requests.Request("GET", url, params=params).prepare().url
+    parts = urlsplit(full)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    host = (parts.hostname or "").lower()
+    norm = f"{parts.scheme}://{parts.netloc.lower()}{parts.path}" + (f"?{query}" if query else "")
+    digest = hashlib.sha1(norm.encode()).hexdigest()[:20]
+    return norm, FIXTURE_DIR / (host or "_") / f"{digest}.json.gz"
+
+
+def _save_fixture(url: str, params, resp: requests.Response) -> None:
+    if resp.status_code == 304 or resp.status_code >= 500:
+        return
+    norm, path = _fixture_key(url, params)
+    entry = {
+        "url":     norm,
+        "status":  resp.status_code,
+        "headers": {k: resp.headers[k] for k in _KEPT_HEADERS if k in resp.headers},
+        "elapsed": resp.elapsed.total_seconds(),
+        "body":    base64.b64encode(resp.content or b"").decode("ascii"),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+def _replay(url: str, params=None) -> requests.Response:
+    norm, path = _fixture_key(url, params)
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        raise requests.ConnectionError(f"no fixture for {norm}") from None
+    time.sleep(entry["elapsed"] if REPLAY_LATENCY == "recorded" else REPLAY_LATENCY)
+    resp = requests.Response()
+    resp.status_code = entry["status"]
+    resp.headers = CaseInsensitiveDict(entry["headers"])
+    resp._content = base64.b64decode(entry["body"])
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp.url = norm
+    return resp
+
+
+def _send(url: str, params=None, **kwargs) -> requests.Response:
+    """One GET through the fixture layer: live, live and saved, or served from disk."""
+    if FIXTURE_MODE == "replay":
+        return _replay(url, params)
+    resp = session().get(url, params=params, **kwargs)
+    if FIXTURE_MODE == "record":
+        _save_fixture(url, params, resp)
+    return resp
+
+
+class _FixtureSession:
+    """The slice of requests.Session that nba_api calls, routed through fixtures."""
+
+    def get(self, url, params=None, **kwargs):
+        return _send(url, params, **kwargs)
+
+
+def fixture_session():
+    """A session for clients that bring their own, or None when fixtures are off."""
+    return _FixtureSession() if FIXTURE_MODE else None
+
+
+# ── Conditional board fetches ────────────────────────────────────────────────
+# Per URL+params: the validators the server last sent, the body's digest, and
+# the body itself. The body is kept because one URL can feed several consumers
+# — the Underdog board covers every sport in one payload — and a 304 answered
+# on behalf of the NBA parse still has to hand the MLB parse its first copy.
+_boards: dict = {}
+_boards_lock = threading.Lock()
+
+
+def get_if_changed(url: str, known_digest=None, params=None, *, headers=None,
+                   timeout=None) -> tuple:
+    """
+    GET a board, revalidating against the previous response for the same URL.
+
+    Returns (digest, body): digest is a sha1 of the payload bytes; body is the raw
+    bytes, or None when the payload hashes to `known_digest` — i.e. the caller has
+    already parsed exactly this board and can reuse its result. Raises
+    requests.HTTPError on a non-200/304 answer so callers keep their stale copy.
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    with _boards_lock:
+        prev = _boards.get(key)
+    hdrs = dict(headers or {})
+    if prev:
+        if prev["etag"]:
+            hdrs["If-None-Match"] = prev["etag"]
+        if prev["last_modified"]:
+            hdrs["If-Modified-Since"] = prev["last_modified"]
+
+    resp = get(url, params=params, headers=hdrs, timeout=timeout)
+    if resp.status_code == 304 and prev:
+        entry = prev
+    else:
+        if resp.status_code != 200:
+            raise requests.HTTPError(f"HTTP {resp.status_code}", response=resp)
+        body = resp.content
+        entry = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "digest": hashlib.sha1(body).hexdigest(),
+            "body": body,
+        }
+        with _boards_lock:
+            _boards[key] = entry
+    if entry["digest"] == known_digest:
+        return entry["digest"], None
+    return entry["digest"], entry["body"]
@@ -5,19 +5,20 @@ Konjure Analytics — Multi-Sport Prop & Predictive Dashboard
 
 import os
 import re
+import json
 import time
 import streamlit as st
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit.components.v1 as components
 import pandas as pd
 import plotly.express as px
-import requests
 from bs4 import BeautifulSoup
 from nba_api.stats.static import teams, players
 from nba_api.stats.endpoints import playergamelog, commonteamroster, leaguegamefinder, playbyplayv3, commonallplayers
 from datetime import datetime, timedelta
 import parlay_tracker
 import parlay_model as _pm
+import http_client
 
 # Shared prop-prediction model (hit-rate calculators, BvP, game-log fetchers,
 # parlay builder) — see parlay_model.py. Kept under this file's original
@@ -610,7 +611,7 @@ def get_next_opponent(team_code):
     try:
         slug = ESPN_SLUG_MAP.get(team_code.upper(), team_code.lower())
         url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams/{slug}/schedule"
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         if response.status_code == 200:
             data = response.json()
             now = datetime.now()
@@ -637,6 +638,7 @@ _PP_DEAD_STATUSES = {"final", "cancelled", "failed", "lost", "won", "scored", "n
 
 _pp_lite_cache: dict = {}
 _pp_lite_cache_ts: dict = {}
+_pp_lite_digest: dict = {}  # payload hash behind _pp_lite_cache
 _PP_LITE_CACHE_TTL = 300  # 5 min; never cache empty results
 
 def get_prizepicks_lines(league_id=7):
@@ -646,10 +648,12 @@ def get_prizepicks_lines(league_id=7):
         return cached
     try:
         url = f"https://api.prizepicks.com/projections?league_id={league_id}&per_page=250&single_stat=true"
-        resp = requests.get(url, headers=_PP_HEADERS, timeout=12)
-        if resp.status_code != 200:
-            return _pp_lite_cache.get(league_id, pd.DataFrame())
-        payload = resp.json()
+        digest, body = http_client.get_if_changed(url, _pp_lite_digest.get(league_id),
+                                                  headers=_PP_HEADERS, timeout=12)
+        if body is None:
+            _pp_lite_cache_ts[league_id] = now
+            return cached
+        payload = json.loads(body)
         player_map = {
             item["id"]: item["attributes"].get("display_name", "")
             for item in payload.get("included", [])
@@ -673,8 +677,10 @@ def get_prizepicks_lines(league_id=7):
         df = pd.DataFrame(rows)
         result = df[df["player_name"] != ""] if not df.empty else df
         if not result.empty:
+            result.attrs["board_digest"] = digest
             _pp_lite_cache[league_id] = result
             _pp_lite_cache_ts[league_id] = now
+            _pp_lite_digest[league_id] = digest
         return result if not result.empty else _pp_lite_cache.get(league_id, pd.DataFrame())
     except Exception:
         return _pp_lite_cache.get(league_id, pd.DataFrame())
@@ -1682,6 +1688,7 @@ _NBA_DRAFT_SCOUTS = {
 
 _pp_cache: dict = {}
 _pp_cache_ts: dict = {}
+_pp_digest: dict = {}  # payload hash behind _pp_cache — unchanged board, no re-parse
 _pp_last_error: dict = {}
 _PP_CACHE_TTL = 300  # 5 minutes; only store non-empty results
 
@@ -1693,15 +1700,22 @@ def get_prizepicks_with_team(league_id: int = 7) -> pd.DataFrame:
     if cached is not None and not cached.empty and now - _pp_cache_ts.get(league_id, 0) < _PP_CACHE_TTL:
         return cached
 
+    # PrizePicks answers a burst with a bare 403 — not one of http_client's
+    # retried statuses — and now and then with an empty board, so both get
+    # another try here before falling back to the stale copy.
     for attempt in range(3):
+        if attempt:
+            time.sleep(1.5)
         try:
-            if attempt:
-                time.sleep(1.5)
             url = f"https://api.prizepicks.com/projections?league_id={league_id}&per_page=500&single_stat=true"
-            resp = requests.get(url, headers=_PP_HEADERS, timeout=15)
-            if resp.status_code != 200:
-                continue
-            payload = resp.json()
+            # Revalidates against the last board: an unchanged payload comes back as
+            # body=None and the parsed frame is reused without touching the JSON.
+            digest, body = http_client.get_if_changed(url, _pp_digest.get(league_id),
+                                                      headers=_PP_HEADERS, timeout=15)
+            if body is None:
+                _pp_cache_ts[league_id] = now
+                return cached
+            payload = json.loads(body)
 
             # Build player map
             player_map = {}
@@ -1753,8 +1767,10 @@ def get_prizepicks_with_team(league_id: int = 7) -> pd.DataFrame:
             df = pd.DataFrame(rows)
             result = df[df["player_name"] != ""] if not df.empty else df
             if not result.empty:
+                result.attrs["board_digest"] = digest
                 _pp_cache[league_id] = result
                 _pp_cache_ts[league_id] = now
+                _pp_digest[league_id] = digest
                 return result
         except Exception as _e:
             _pp_last_error[league_id] = str(_e)
@@ -1873,103 +1889,37 @@ _UD_MLB_PITCHER_LOOKUP = {
 
 _ud_cache: dict = {}
 _ud_cache_ts: dict = {}
+_ud_digest: dict = {}  # payload hash behind each sport's _ud_cache entry
 _UD_CACHE_TTL = 300
 
 def get_underdog_props(sport: str = "nba") -> pd.DataFrame:
-    """Fetch player props from Underdog Fantasy (free, no auth required)."""
+    """Fetch player props from Underdog Fantasy (free, no auth required).
+
+    Every sport is sliced from the one shared board in parlay_model, so the NBA,
+    WNBA and MLB views and the best-plays scan share a single download + join.
+    A sport is only re-mapped when the board's payload digest has moved."""
     now = time.time()
     cached = _ud_cache.get(sport)
     if cached is not None and not cached.empty and now - _ud_cache_ts.get(sport, 0) < _UD_CACHE_TTL:
         return cached
 
-    if sport == "nba":
-        sport_id, stat_map = "NBA", _UD_NBA_STAT_MAP
-    elif sport == "wnba":
-        sport_id, stat_map = "WNBA", _UD_NBA_STAT_MAP  # WNBA uses same stat names
-    else:
-        sport_id, stat_map = "MLB", _UD_MLB_STAT_MAP
+    stat_map = _UD_MLB_STAT_MAP if sport == "mlb" else _UD_NBA_STAT_MAP  # WNBA uses NBA names
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36",
-            "Accept": "application/json",
-        }
-        resp = requests.get(
-            "https://api.underdogfantasy.com/beta/v5/over_under_lines",
-            headers=headers, timeout=15,
-        )
-        if resp.status_code != 200:
-            return _ud_cache.get(sport, pd.DataFrame())
-        d = resp.json()
-
-        player_map     = {p["id"]: p for p in d.get("players", [])}
-        appearance_map = {a["id"]: a for a in d.get("appearances", [])}
-        game_map       = {g["id"]: g for g in d.get("games", [])}
-
-        rows = []
-        for line in d.get("over_under_lines", []):
-            if line.get("status") != "active":
-                continue
-            ou        = line.get("over_under", {})
-            app_stat  = ou.get("appearance_stat", {})
-            app_id    = app_stat.get("appearance_id", "")
-            stat_type = stat_map.get(app_stat.get("display_stat", "").strip())
-            if stat_type is None:
-                continue
-            app = appearance_map.get(app_id, {})
-            if not app:
-                continue
-            player = player_map.get(app.get("player_id", ""), {})
-            if not player or player.get("sport_id") != sport_id:
-                continue
-            try:
-                stat_value = float(line.get("stat_value", 0))
-            except Exception:
-                continue
-            game       = game_map.get(app.get("match_id"), {})
-            name       = f"{player.get('first_name','')} {player.get('last_name','')}".strip()
-            if not name:
-                continue
-            game_title = game.get("abbreviated_title", "")
-            team = ""
-            if " @ " in game_title:
-                away_abbr, home_abbr = game_title.split(" @ ", 1)
-                team = away_abbr if app.get("team_id") == game.get("away_team_id") else home_abbr
-            _opts = line.get("options", [])
-            over_opt  = next((o for o in _opts if o.get("choice") == "higher"), None)
-            under_opt = next((o for o in _opts if o.get("choice") == "lower"), None)
-            if not over_opt:
-                continue
-            try:
-                american = int(str(over_opt.get("american_price", "-110")).replace("+", ""))
-            except Exception:
-                american = -110
-            # De-vig against the under price: the raw over probability carries the book's
-            # margin and runs high, which biases the model toward the over.
-            _imp_over = _american_to_implied(american)
-            _imp_under = None
-            if under_opt is not None:
-                try:
-                    _imp_under = _american_to_implied(
-                        int(str(under_opt.get("american_price", "-110")).replace("+", ""))
-                    )
-                except Exception:
-                    _imp_under = None
-            rows.append({
-                "player_name": name, "team": team,
-                "stat_type": stat_type, "line_score": stat_value,
-                "odds_type": "standard", "american_odds": american,
-                "implied_prob": round(_pm.devig_two_way(_imp_over, _imp_under), 3),
-                "game_id": str(app.get("match_id", "")),
-                "game_label": game_title,
-                "start_time": game.get("scheduled_at", ""),
-                "sportsbook": "Underdog",
-            })
-        df = pd.DataFrame(rows)
+        board = _pm.fetch_underdog_board()
+        digest = board.attrs.get("board_digest")
+        if cached is not None and digest and digest == _ud_digest.get(sport):
+            _ud_cache_ts[sport] = now
+            return cached
+        df = _pm.underdog_lines(sport, stat_map)
         if df.empty:
             return _ud_cache.get(sport, pd.DataFrame())
-        result = df[df["player_name"] != ""].drop_duplicates(["player_name", "stat_type"])
+        df["implied_prob"] = df["implied_prob"].round(3)
+        df["game_id"] = df["game_id"].astype(str)
+        result = df.drop_duplicates(["player_name", "stat_type"])
+        result.attrs["board_digest"] = digest
         _ud_cache[sport] = result
         _ud_cache_ts[sport] = now
+        _ud_digest[sport] = digest
         return result
     except Exception:
         return _ud_cache.get(sport, pd.DataFrame())
@@ -2023,7 +1973,7 @@ def get_draftkings_props(sport: str = "mlb") -> pd.DataFrame:
     for state in ("US-NJ-SB", "US-IL-SB", "US-PA-SB"):
         try:
             url = f"https://sportsbook.draftkings.com/sites/{state}/api/v1/eventgroup/{group_id}/full"
-            r = requests.get(url, params={"format": "json"}, headers=headers, timeout=20)
+            r = http_client.get(url, params={"format": "json"}, headers=headers, timeout=20)
             if r.status_code == 200:
                 resp = r
                 break
@@ -2188,7 +2138,7 @@ def get_sharpapi_props(sport: str = "mlb", sportsbook: str = "DraftKings") -> pd
         offset = 0
         limit = 200
         while True:
-            resp = requests.get(
+            resp = http_client.get(
                 f"{_SHARP_API_BASE}/odds",
                 headers=headers,
                 params={
@@ -2261,8 +2211,7 @@ def get_sharpapi_props(sport: str = "mlb", sportsbook: str = "DraftKings") -> pd
             pagination = data.get("pagination", {})
             if not pagination.get("has_more", False):
                 break
-            offset += limit
-            time.sleep(0.1)  # stay well under 12 req/min
+            offset += limit   # paced by http_client.HOST_RATES
 
         if not rows:
             return _sharp_cache.get(cache_key, pd.DataFrame())
@@ -2350,7 +2299,7 @@ def get_the_odds_api_props(sport: str = "nba", sportsbook: str = "DraftKings") -
 
     try:
         # Step 1: get today's events (free — no credit cost)
-        events_resp = requests.get(
+        events_resp = http_client.get(
             f"https://api.the-odds-api.com/v4/sports/{sport_key}/events",
             params={"apiKey": api_key},
             timeout=15,
@@ -2390,7 +2339,7 @@ def get_the_odds_api_props(sport: str = "nba", sportsbook: str = "DraftKings") -
             start_time = event.get("commence_time", "")
 
             try:
-                props_resp = requests.get(
+                props_resp = http_client.get(
                     f"https://api.the-odds-api.com/v4/sports/{sport_key}/events/{ev_id}/odds",
                     params={
                         "apiKey": api_key,
@@ -2591,12 +2540,22 @@ def _fallback_mlb_legs(stat_types: list = None, cal: dict = None) -> list:
         except Exception:
             continue
 
-    # Pre-warm game logs in parallel so the processing loop below hits cache
+    # Pre-warm game logs so the processing loop below hits cache: one batched
+    # people hydrate per 100 players, then a parallel per-player sweep for
+    # whatever a failed chunk left cold.
+    _seasons = ("2025", "2026")
+    _pm.prefetch_mlb_players(
+        hitters=[h["id"] for h, _ in all_hitters] if hitter_stats else (),
+        pitchers=[p["id"] for p, _ in all_pitchers] if pitcher_stats else (),
+        seasons=_seasons,
+    )
     _fb_warm: list = []
     if hitter_stats:
-        _fb_warm.extend((h["id"], False) for h, _ in all_hitters)
+        _fb_warm.extend((h["id"], False) for h, _ in all_hitters
+                        if not get_mlb_hitting_logs.cached(h["id"], _seasons))
     if pitcher_stats:
-        _fb_warm.extend((p["id"], True) for p, _ in all_pitchers)
+        _fb_warm.extend((p["id"], True) for p, _ in all_pitchers
+                        if not get_mlb_pitching_logs.cached(p["id"], _seasons))
 
     if _fb_warm:
         with ThreadPoolExecutor(max_workers=8) as _fbex:
@@ -2891,7 +2850,7 @@ def get_real_time_line(player_name, market="points"):
     try:
         url = "https://api.sportsgameodds.com/v2/events"
         headers = {"X-API-Key": api_key}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         if response.status_code == 200:
             data = response.json()
             for event in data.get("events", []):
@@ -2913,7 +2872,7 @@ def get_team_first_basket_history(team_abbr, num_games=20):
     _HDR = {"User-Agent": "Mozilla/5.0"}
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams/{team_abbr}/schedule"
-        events = requests.get(url, timeout=8, headers=_HDR).json().get("events", [])
+        events = http_client.get(url, timeout=8, headers=_HDR).json().get("events", [])
         completed = [
             e for e in events
             if e.get("competitions", [{}])[0].get("status", {}).get("type", {}).get("completed", False)
@@ -2946,7 +2905,7 @@ def get_team_first_basket_history(team_abbr, num_games=20):
             ) else "L"
             game_date = event.get("date", "")[:10]
 
-            pbp_data = requests.get(
+            pbp_data = http_client.get(
                 f"https://cdn.espn.com/core/nba/playbyplay?gameId={event_id}&xhr=1",
                 timeout=10, headers=_HDR,
             ).json()
@@ -3054,7 +3013,7 @@ _MLB_DOME_VENUES = {
 @st.cache_data(ttl=3600)
 def get_mlb_teams():
     try:
-        resp = requests.get(f"{MLB_BASE}/teams?sportId=1&season={MLB_SEASON}", timeout=10)
+        resp = http_client.get(f"{MLB_BASE}/teams?sportId=1&season={MLB_SEASON}", timeout=10)
         data = resp.json().get("teams", [])
         return sorted(
             [{"id": t["id"], "name": t["name"], "abbr": t.get("abbreviation", "")}
@@ -3068,7 +3027,7 @@ def get_mlb_teams():
 def get_mlb_roster(team_id):
     try:
         url = f"{MLB_BASE}/teams/{team_id}/roster?season={MLB_SEASON}&rosterType=active"
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         roster = resp.json().get("roster", [])
         hitters, pitchers = [], []
         for p in roster:
@@ -3093,7 +3052,7 @@ def get_mlb_next_opponent(team_id):
         today = datetime.now().strftime("%Y-%m-%d")
         future = (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d")
         url = f"{MLB_BASE}/schedule?sportId=1&teamId={team_id}&startDate={today}&endDate={future}"
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         for date_entry in resp.json().get("dates", []):
             for game in date_entry.get("games", []):
                 away = game["teams"]["away"]["team"]
@@ -3119,7 +3078,7 @@ def get_mlb_today_game_for_team(team_id):
         today = datetime.now().strftime("%Y-%m-%d")
         url = (f"{MLB_BASE}/schedule?sportId=1&teamId={team_id}"
                f"&date={today}&hydrate=probablePitcher,team")
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         for date_entry in resp.json().get("dates", []):
             for game in date_entry.get("games", []):
                 return game
@@ -3132,7 +3091,7 @@ def get_mlb_pitcher_season_stats(pitcher_id):
     try:
         url = (f"{MLB_BASE}/people/{pitcher_id}/stats"
                f"?stats=season&season={MLB_SEASON}&group=pitching")
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         splits = resp.json().get("stats", [{}])[0].get("splits", [])
         return splits[0].get("stat", {}) if splits else {}
     except Exception:
@@ -3153,7 +3112,7 @@ def _get_venue_weather(venue: str) -> dict:
             f"&current=temperature_2m,wind_speed_10m,wind_direction_10m,relative_humidity_2m"
             f"&wind_speed_unit=mph&temperature_unit=fahrenheit&forecast_days=1"
         )
-        cur = requests.get(url, timeout=8).json().get("current", {})
+        cur = http_client.get(url, timeout=8).json().get("current", {})
         return {
             "temp_f":   round(float(cur.get("temperature_2m", 70)), 1),
             "wind_mph": round(float(cur.get("wind_speed_10m", 0)), 1),
@@ -3197,14 +3156,8 @@ def _pitcher_hr_per9(pitcher_id: int) -> float:
 @st.cache_data(ttl=3600, show_spinner=False)
 def _get_player_hand(player_id: int, side: str = "bat") -> str:
     """Returns 'L', 'R', or 'S' for switch hitter. side='bat' or 'pitch'."""
-    try:
-        resp = requests.get(f"{MLB_BASE}/people/{player_id}", timeout=8)
-        person = (resp.json().get("people") or [{}])[0]
-        if side == "bat":
-            return person.get("batSide", {}).get("code", "R")
-        return person.get("pitchHand", {}).get("code", "R")
-    except Exception:
-        return "R"
+    bat, pitch = _pm.mlb_player_hand(int(player_id))
+    return bat if side == "bat" else pitch
 
 
 @st.cache_data(ttl=900, show_spinner=False)
@@ -3319,15 +3272,15 @@ def _build_hr_power_picks(top_n: int = 6, cal_factor: float = 1.0) -> list:
     mlb_teams = get_mlb_teams()
     team_id_map = {t["abbr"]: t["id"] for t in mlb_teams}
 
-    candidates = []
+    # Gather the whole slate first so logs + handedness for every hitter and
+    # starter come down in a few batched people hydrates, not ~450 single calls.
+    slate = []
     for game in games:
         venue = game.get("venue", "")
         weather = _get_venue_weather(venue)
         for side in ("home", "away"):
             opp = "away" if side == "home" else "home"
             team_abbr = game.get(f"{side}_abbr", "")
-            opp_pitcher_id = game.get(f"{opp}_p_id")
-            opp_pitcher_name = game.get(f"{opp}_pitcher", "TBD")
             tid = team_id_map.get(team_abbr)
             if not tid:
                 continue
@@ -3337,20 +3290,30 @@ def _build_hr_power_picks(top_n: int = 6, cal_factor: float = 1.0) -> list:
                 continue
             for h in hitters[:15]:
                 pid = _mlb_player_id_by_name(h["name"])
-                if not pid:
-                    continue
-                result = _score_hitter_for_hr(int(pid), opp_pitcher_id, venue, weather)
-                if not result:
-                    continue
-                calibrated = round(min(0.97, max(0.01, result["score"] * cal_factor)), 3)
-                candidates.append({
-                    "player_name": h["name"], "team": team_abbr, "venue": venue,
-                    "opp_pitcher": opp_pitcher_name, "opp_pitcher_id": opp_pitcher_id,
-                    "game_label": f"{game.get('away_abbr','')} @ {game.get('home_abbr','')}",
-                    "weather": weather,
-                    **result,
-                    "score": calibrated,
-                })
+                if pid:
+                    slate.append((game, venue, weather, team_abbr, opp, h, int(pid)))
+    _pm.prefetch_mlb_players(
+        hitters=[row[-1] for row in slate],
+        pitchers=[row[0].get(f"{row[4]}_p_id") for row in slate],
+        seasons=("2025", "2026"),
+    )
+
+    candidates = []
+    for game, venue, weather, team_abbr, opp, h, pid in slate:
+        opp_pitcher_id = game.get(f"{opp}_p_id")
+        opp_pitcher_name = game.get(f"{opp}_pitcher", "TBD")
+        result = _score_hitter_for_hr(pid, opp_pitcher_id, venue, weather)
+        if not result:
+            continue
+        calibrated = round(min(0.97, max(0.01, result["score"] * cal_factor)), 3)
+        candidates.append({
+            "player_name": h["name"], "team": team_abbr, "venue": venue,
+            "opp_pitcher": opp_pitcher_name, "opp_pitcher_id": opp_pitcher_id,
+            "game_label": f"{game.get('away_abbr','')} @ {game.get('home_abbr','')}",
+            "weather": weather,
+            **result,
+            "score": calibrated,
+        })
 
     candidates.sort(key=lambda x: x["score"], reverse=True)
 
@@ -3372,7 +3335,7 @@ def get_mlb_team_batting_stats(team_id):
     try:
         url = (f"{MLB_BASE}/teams/{team_id}/stats"
                f"?stats=season&season={MLB_SEASON}&group=hitting")
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         splits = resp.json().get("stats", [{}])[0].get("splits", [])
         return splits[0].get("stat", {}) if splits else {}
     except Exception:
@@ -3383,7 +3346,7 @@ def get_today_mlb_games():
     try:
         today = datetime.now().strftime("%Y-%m-%d")
         url = f"{MLB_BASE}/schedule?sportId=1&date={today}&hydrate=team"
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         games = []
         for date_entry in resp.json().get("dates", []):
             for game in date_entry.get("games", []):
@@ -3412,7 +3375,7 @@ def _scoreboard_date():
 def get_nba_scoreboard(game_date: str):
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates={game_date}"
-        resp = requests.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
         games = []
         for ev in resp.json().get("events", []):
             comp = ev["competitions"][0]
@@ -3437,7 +3400,7 @@ def get_nba_scoreboard(game_date: str):
 def get_mlb_scoreboard(game_date: str):
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/baseball/mlb/scoreboard?dates={game_date}"
-        resp = requests.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
         games = []
         for ev in resp.json().get("events", []):
             comp = ev["competitions"][0]
@@ -3462,7 +3425,7 @@ def get_mlb_scoreboard(game_date: str):
 def get_nba_scoreboard_full(game_date: str):
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard?dates={game_date}"
-        resp = requests.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
         out = []
         for ev in resp.json().get("events", []):
             comp = ev["competitions"][0]
@@ -3489,7 +3452,7 @@ def get_mlb_today_with_pitchers():
     try:
         today = datetime.now().strftime("%Y-%m-%d")
         url = f"{MLB_BASE}/schedule?sportId=1&date={today}&hydrate=probablePitcher,team,record,linescore"
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         out = []
         for date_entry in resp.json().get("dates", []):
             for game in date_entry.get("games", []):
@@ -3527,7 +3490,7 @@ def get_sport_news(sport="nba"):
     sport_path = _ESPN_SPORT.get(sport, f"basketball/{sport}")
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/{sport_path}/news?limit=10"
-        resp = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
         resp.raise_for_status()
         data = resp.json()
         articles = data.get("articles", [])
@@ -3547,7 +3510,7 @@ def get_sport_news(sport="nba"):
     # Fallback: ESPN RSS (works locally but may be blocked on cloud)
     try:
         url = f"https://www.espn.com/espn/rss/{sport}/news"
-        resp = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
         soup = BeautifulSoup(resp.content, "html.parser")
         items = soup.find_all("item")[:8]
         news = []
@@ -4810,6 +4773,28 @@ def _render_accuracy_tab(sport_filter: str) -> None:
                 st.line_chart(_chart_data[["Flat P&L ($)"]], height=200)
             with _tabs_roi[1]:
                 st.line_chart(_chart_data[["Kelly Bankroll ($)"]], height=200)
+
+        _boot = parlay_tracker.get_roi_bootstrap(sport=sport_filter)
+        if _boot["flat"]:
+            st.caption(
+                f"How much of this is luck: {_boot['n_sims']:,} replays of the "
+                f"{_boot['n_days']} slates, drawn with replacement. Ranges are the "
+                f"5th–95th percentile; ruin is the bankroll touching "
+                f"{parlay_tracker.BOOTSTRAP_RUIN_LEVEL:.0%} of its $1,000 start."
+            )
+            _pcts = _boot["percentiles"]
+            _lo, _mid, _hi = _pcts.index(5), _pcts.index(50), _pcts.index(95)
+            st.dataframe(pd.DataFrame([
+                {
+                    "Staking":         _name,
+                    "ROI (median)":    f"{_b['roi_pct'][_mid]:+.1f}%",
+                    "ROI range":       f"{_b['roi_pct'][_lo]:+.1f}% … {_b['roi_pct'][_hi]:+.1f}%",
+                    "Final bankroll":  f"${_b['final_bankroll'][_lo]:,.0f} … ${_b['final_bankroll'][_hi]:,.0f}",
+                    "P(profit)":       f"{_b['prob_profit_pct']:.1f}%",
+                    "Risk of ruin":    f"{_b['risk_of_ruin_pct']:.1f}%",
+                }
+                for _name, _b in (("Flat $10", _boot["flat"]), ("Kelly (slate-capped)", _boot["kelly"]))
+            ]), hide_index=True, width="stretch")
     else:
         st.caption("No resolved parlays yet — resolve outcomes to populate simulation.")
     st.divider()
@@ -4951,9 +4936,9 @@ def _render_accuracy_tab(sport_filter: str) -> None:
 
     # ── Full parlay log ───────────────────────────────────────────────────────
     st.markdown(f"#### Parlay Log — {_sel_week}")
-    _log_data   = parlay_tracker._load()
-    _wk_parlays = [p for p in _log_data["parlays"]
-                   if p.get("iso_week") == _sel_week and p.get("sport") == sport_filter]
+    # An archived week lives in its partition, not the hot log.
+    _wk_parlays = [p for p in parlay_tracker._week_parlays(_sel_week)
+                   if p.get("sport") == sport_filter]
     if _wk_parlays:
         for _wp in _wk_parlays:
             _hit_icon = ("✅ Hit" if _wp["parlay_hit"] is True
@@ -5071,7 +5056,7 @@ def _get_wnba_team_roster_map(team_abbr: str) -> dict:
     slug = _wnba_espn_slug(team_abbr)
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/wnba/teams/{slug}/roster"
-        resp = requests.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
         if resp.status_code == 200:
             result = {}
             for a in resp.json().get("athletes", []):
@@ -5092,7 +5077,7 @@ def get_wnba_team_players(team_abbr: str):
 def get_wnba_scoreboard(game_date: str):
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/wnba/scoreboard?dates={game_date}"
-        resp = requests.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
         games = []
         for ev in resp.json().get("events", []):
             comp = ev["competitions"][0]
@@ -5117,7 +5102,7 @@ def get_wnba_scoreboard(game_date: str):
 def get_wnba_scoreboard_full(game_date: str):
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/wnba/scoreboard?dates={game_date}"
-        resp = requests.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+        resp = http_client.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
         out = []
         for ev in resp.json().get("events", []):
             comp = ev["competitions"][0]
@@ -8509,6 +8494,16 @@ elif sport == "⚾ MLB":
                     if _pid:
                         _mlb_warm.append((_pid, _is_p))
                 _mwarm_prog = st.progress(0, text=f"Loading {len(_mlb_warm)} player histories…")
+                # Batched hydrate first (one request per 100 players per season);
+                # the pool below then only fetches what a failed chunk left cold.
+                _pm.prefetch_mlb_players(
+                    hitters=[_pid for _pid, _isp in _mlb_warm if not _isp],
+                    pitchers=[_pid for _pid, _isp in _mlb_warm if _isp],
+                    seasons=("2025", "2026"),
+                )
+                _mlb_warm = [(_pid, _isp) for _pid, _isp in _mlb_warm
+                             if not (get_mlb_pitching_logs if _isp else get_mlb_hitting_logs)
+                             .cached(_pid, ("2025", "2026"))]
                 with ThreadPoolExecutor(max_workers=8) as _mwex:
                     # Prewarm the Statcast leaderboards in the same pool so the
                     # expected-stat model doesn't block the scoring loop serially on
@@ -20,10 +20,13 @@ causing a real bug. This module exists so that can't happen again.
 import re
 import io
 import math
+import json
 import time
-import requests
+import asyncio
+import threading
 import pandas as pd
-from functools import wraps
+from contextlib import contextmanager
+from functools import wraps, partial
 from itertools import combinations
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
@@ -31,6 +34,14 @@ from datetime import datetime
 
 from nba_api.stats.static import players
 from nba_api.stats.endpoints import playergamelog, commonallplayers
+from nba_api.stats.library.http import NBAStatsHTTP
+
+import http_client
+
+# nba_api keeps its own requests session; under HTTP_FIXTURES it records and
+# replays through http_client like every other host.
+if http_client.fixture_session() is not None:
+    NBAStatsHTTP.set_session(http_client.fixture_session())
 
 MLB_BASE = "https://statsapi.mlb.com/api/v1"
 MLB_SEASON = "2026"
@@ -42,19 +53,51 @@ def _ttl_cache(ttl_seconds):
     and the headless generator."""
     def decorator(fn):
         cache = {}
+        inflight = {}
+        lock = threading.Lock()
 
         @wraps(fn)
         def wrapper(*args, **kwargs):
             key = (args, tuple(sorted(kwargs.items())))
-            now = time.time()
             hit = cache.get(key)
-            if hit is not None and now - hit[1] < ttl_seconds:
+            if hit is not None and time.time() - hit[1] < ttl_seconds:
                 return hit[0]
-            value = fn(*args, **kwargs)
-            cache[key] = (value, now)
-            return value
+            # Single-flight: the generator scores every book of every sport at once,
+            # and the same player turns up on all of them. The first caller for a
+            # key fetches; the rest wait for its result instead of repeating it.
+            with lock:
+                hit = cache.get(key)
+                if hit is not None and time.time() - hit[1] < ttl_seconds:
+                    return hit[0]
+                done = inflight.get(key)
+                if done is None:
+                    inflight[key] = threading.Event()
+            if done is not None:
+                done.wait()
+                hit = cache.get(key)
+                if hit is not None:
+                    return hit[0]
+                return fn(*args, **kwargs)      # the fetch it waited on raised
+            try:
+                value = fn(*args, **kwargs)
+                cache[key] = (value, time.time())
+                return value
+            finally:
+                with lock:
+                    inflight.pop(key).set()
+
+        def prime(value, *args, **kwargs):
+            """Seed the entry a call with these arguments would create — how a
+            batched fetch fans its results back out to the per-player caches."""
+            cache[(args, tuple(sorted(kwargs.items())))] = (value, time.time())
+
+        def cached(*args, **kwargs):
+            hit = cache.get((args, tuple(sorted(kwargs.items()))))
+            return hit is not None and time.time() - hit[1] < ttl_seconds
 
         wrapper.clear = cache.clear
+        wrapper.prime = prime
+        wrapper.cached = cached
         return wrapper
     return decorator
 
@@ -64,7 +107,7 @@ def _mlb_team_abbr_map():
     """{team_id: abbreviation} for all MLB clubs. The gameLog `opponent` object
     carries an id and name but no abbreviation, so we resolve it ourselves."""
     try:
-        resp = requests.get(f"{MLB_BASE}/teams?sportId=1&season={MLB_SEASON}", timeout=10)
+        resp = http_client.get(f"{MLB_BASE}/teams?sportId=1&season={MLB_SEASON}", timeout=10)
         return {t["id"]: t.get("abbreviation", "")
                 for t in resp.json().get("teams", []) if t.get("id")}
     except Exception:
@@ -90,7 +133,7 @@ def _savant_fetch(kind, sels, season):
            f"&selections={','.join(sels)}&chart=false&x={sels[1]}&y={sels[1]}&r=no"
            f"&chartType=beeswarm&sort={sels[1]}&sortDir=desc&csv=true")
     try:
-        r = requests.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
+        r = http_client.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
         df = pd.read_csv(io.StringIO(r.content.decode("utf-8-sig")))
     except Exception:
         return out
@@ -494,7 +537,7 @@ def fetch_fanduel(sport: str) -> pd.DataFrame:
         return pd.DataFrame()
 
     try:
-        r = requests.get(f"{FD_BASE}/content-managed-page",
+        r = http_client.get(f"{FD_BASE}/content-managed-page",
                          params={"page": "CUSTOM", "customPageId": page_id,
                                  "_ak": FD_AK, "timezone": "America/New_York"},
                          headers=FD_HEADERS, timeout=20)
@@ -508,139 +551,326 @@ def fetch_fanduel(sport: str) -> pd.DataFrame:
 
     # Futures and specials share the page; only real matchups have an "A @ B" name.
     games = {i: e for i, e in events.items() if " @ " in (e.get("name") or "")}
+    try:
+        rows = _fd_run(_fd_fetch_events(sport, core_map, games))
+    except Exception as e:
+        print(f"    FanDuel fetch failed: {e}")
+        return pd.DataFrame()
+    return pd.DataFrame(rows) if rows else pd.DataFrame()
 
-    # Each event is independent (own id, own tabs), so fetch them concurrently — the
-    # serial walk with per-request sleeps was the whole reason a build took ~30-40s.
-    rows = []
-    with ThreadPoolExecutor(max_workers=8) as ex:
-        futures = [ex.submit(_fd_parse_event, sport, core_map, ev_id, ev)
-                   for ev_id, ev in games.items()]
-        for fut in futures:
+
+# Every event's layout page, then every (event, prop tab) pair, all in flight at
+# once under one global cap. The old per-event thread pool still walked each
+# event's 5-8 tabs one after another, so a slate took as long as its slowest
+# event's serial chain; now it takes about as long as the slowest few requests.
+# requests is blocking and aiohttp isn't a dependency, so the coroutines drive
+# the shared pooled session through a dedicated executor.
+FD_CONCURRENCY = 16
+FD_TIMEOUT = 25
+
+
+def _fd_run(coro):
+    """asyncio.run, or on a worker thread when the caller already has a loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
+
+
+async def _fd_fetch_events(sport, core_map, games):
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(FD_CONCURRENCY)
+    pool = ThreadPoolExecutor(max_workers=FD_CONCURRENCY)
+
+    async def event_page(params):
+        async with sem:
+            call = partial(http_client.get, f"{FD_BASE}/event-page", params=params,
+                           headers=FD_HEADERS, timeout=FD_TIMEOUT)
             try:
-                rows.extend(fut.result())
+                r = await asyncio.wait_for(loop.run_in_executor(pool, call), FD_TIMEOUT + 5)
+                return r.json() if r.status_code == 200 else None
             except Exception:
-                continue
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+                return None
 
+    meta = {}
+    for ev_id, ev in games.items():
+        try:
+            away_full, home_full = [s.strip() for s in ev["name"].split(" @ ", 1)]
+        except (KeyError, ValueError):
+            continue
+        meta[ev_id] = (f"{_fd_team_abbr(sport, away_full)} @ {_fd_team_abbr(sport, home_full)}",
+                       ev.get("openDate", ""))
+    ids = list(meta)
 
-def _fd_parse_event(sport, core_map, ev_id, ev):
-    """Fetch and parse one FanDuel event's player-prop tabs. Returns a list of leg
-    rows (over/under + MLB milestone). Runs in a worker thread, so it owns all its
-    state and shares nothing but the read-only maps."""
     try:
-        away_full, home_full = [s.strip() for s in ev["name"].split(" @ ", 1)]
-    except (KeyError, ValueError):
-        return []
-    label = f"{_fd_team_abbr(sport, away_full)} @ {_fd_team_abbr(sport, home_full)}"
-    start = ev.get("openDate", "")
+        layouts = await asyncio.gather(*(event_page({"eventId": ev_id, "_ak": FD_AK})
+                                         for ev_id in ids))
+        pairs = [(ev_id, title) for ev_id, layout in zip(ids, layouts) if layout
+                 for title in _fd_prop_tabs(layout)]
+        pages = await asyncio.gather(*(event_page({"eventId": ev_id, "_ak": FD_AK,
+                                                   "tab": title.lower().replace(" ", "-")})
+                                       for ev_id, title in pairs))
+    finally:
+        # A timed-out request keeps its thread until the HTTP timeout fires; don't
+        # make the caller wait on it.
+        pool.shutdown(wait=False)
+
+    tab_markets = defaultdict(list)
+    for (ev_id, _), page in zip(pairs, pages):
+        try:
+            markets = page.get("attachments", {}).get("markets", {}) if page else None
+        except AttributeError:
+            continue
+        if markets:
+            tab_markets[ev_id].append(markets)
+
+    # One malformed event (or tab, see _fd_parse_event) costs its own rows, never
+    # the rest of the board.
+    rows = []
+    for ev_id in ids:
+        label, start = meta[ev_id]
+        try:
+            rows.extend(_fd_parse_event(sport, core_map, ev_id, label, start,
+                                        tab_markets[ev_id]))
+        except Exception:
+            continue
+    return rows
+
 
+def _fd_prop_tabs(layout: dict) -> list:
     try:
-        base = requests.get(f"{FD_BASE}/event-page",
-                            params={"eventId": ev_id, "_ak": FD_AK},
-                            headers=FD_HEADERS, timeout=25)
-        tabs = base.json().get("layout", {}).get("tabs", {}) if base.status_code == 200 else {}
+        tabs = layout.get("layout", {}).get("tabs", {})
+        return [t["title"] for t in tabs.values()
+                if any(w in (t.get("title") or "").lower()
+                       for w in ("player", "batter", "pitcher", "hitter"))]
     except Exception:
-        return []
+        return []     # a layout we can't read just has no prop tabs
 
-    prop_tabs = [t["title"] for t in tabs.values()
-                 if any(w in (t.get("title") or "").lower()
-                        for w in ("player", "batter", "pitcher", "hitter"))]
 
+def _fd_parse_event(sport, core_map, ev_id, label, start, tab_markets):
+    """Parse one FanDuel event's player-prop tabs (a list of per-tab market dicts, in
+    tab order) into leg rows — over/under plus MLB milestone. Pure: no I/O."""
     rows = []
     # MLB milestone markets offer the same player at several thresholds (2+/3+/4+
     # Total Bases). They are correlated, so keep just one line per player+stat —
     # the one closest to a coin flip, which is the most informative and avoids the
     # heavy chalk ("To Record A Hit" at -425) crowding out balanced lines.
     milestone_best: dict = {}
-    for title in prop_tabs:
+    for markets in tab_markets:
         try:
-            rt = requests.get(f"{FD_BASE}/event-page",
-                              params={"eventId": ev_id, "_ak": FD_AK,
-                                      "tab": title.lower().replace(" ", "-")},
-                              headers=FD_HEADERS, timeout=25)
-            if rt.status_code != 200:
-                continue
-            markets = rt.json().get("attachments", {}).get("markets", {})
+            tab_rows = _fd_parse_tab(sport, core_map, ev_id, label, start, markets,
+                                     milestone_best)
         except Exception:
-            continue
+            continue          # a malformed tab costs only its own rows
+        rows.extend(tab_rows)
+    rows.extend(milestone_best.values())
+    return rows
 
-        for m in markets.values():
-            mtype = m.get("marketType", "")
-            match = _FD_MARKET_RE.match(mtype)
-            if not match:
-                # MLB batter props are milestone yes/no markets, not over/unders.
-                if sport == "mlb":
-                    key = mtype[7:] if mtype.startswith("PLAYER_") else mtype
-                    milestone = _FD_MLB_MILESTONE.get(key)
-                    if milestone:
-                        mstat, mline = milestone
-                        for run in m.get("runners", []):
-                            american = _fd_american(run)
-                            if american is None:
-                                continue
-                            player = (run.get("runnerName") or "").strip()
-                            if not player:
-                                continue
-                            # One-sided market — no under to de-vig, raw implied stands.
-                            implied = round(american_to_implied(american), 4)
-                            bk = (player, mstat)
-                            prev = milestone_best.get(bk)
-                            if prev is None or abs(implied - 0.5) < abs(prev["implied_prob"] - 0.5):
-                                milestone_best[bk] = {
-                                    "player_name": player, "team": "", "stat_type": mstat,
-                                    "line_score": mline, "odds_type": "standard",
-                                    "american_odds": american, "implied_prob": implied,
-                                    "game_id": str(ev_id), "game_label": label,
-                                    "start_time": start, "sportsbook": "FanDuel",
-                                }
-                continue                      # alt lines ("To Score 20+") aren't over/unders
-            core = match.group("core")
-            stat = core_map.get(core)
-            if not stat:
-                _FD_UNMAPPED.add(core)
-                continue
 
-            over = under = None
-            for run in m.get("runners", []):
-                name = (run.get("runnerName") or "")
-                if name.endswith(" Over"):
-                    over = run
-                elif name.endswith(" Under"):
-                    under = run
-            if over is None:
-                continue
-            american = _fd_american(over)
-            if american is None:
-                continue
+def _fd_parse_tab(sport, core_map, ev_id, label, start, markets, milestone_best):
+    """Over/under rows from one tab's markets; milestone candidates go to milestone_best."""
+    rows = []
+    for m in markets.values():
+        mtype = m.get("marketType", "")
+        match = _FD_MARKET_RE.match(mtype)
+        if not match:
+            # MLB batter props are milestone yes/no markets, not over/unders.
+            if sport == "mlb":
+                key = mtype[7:] if mtype.startswith("PLAYER_") else mtype
+                milestone = _FD_MLB_MILESTONE.get(key)
+                if milestone:
+                    mstat, mline = milestone
+                    for run in m.get("runners", []):
+                        american = _fd_american(run)
+                        if american is None:
+                            continue
+                        player = (run.get("runnerName") or "").strip()
+                        if not player:
+                            continue
+                        # One-sided market — no under to de-vig, raw implied stands.
+                        implied = round(american_to_implied(american), 4)
+                        bk = (player, mstat)
+                        prev = milestone_best.get(bk)
+                        if prev is None or abs(implied - 0.5) < abs(prev["implied_prob"] - 0.5):
+                            milestone_best[bk] = {
+                                "player_name": player, "team": "", "stat_type": mstat,
+                                "line_score": mline, "odds_type": "standard",
+                                "american_odds": american, "implied_prob": implied,
+                                "game_id": str(ev_id), "game_label": label,
+                                "start_time": start, "sportsbook": "FanDuel",
+                            }
+            continue                      # alt lines ("To Score 20+") aren't over/unders
+        core = match.group("core")
+        stat = core_map.get(core)
+        if not stat:
+            _FD_UNMAPPED.add(core)
+            continue
 
-            player = (over.get("runnerName") or "")[: -len(" Over")].strip()
-            try:
-                line = float(over.get("handicap"))
-            except (TypeError, ValueError):
-                continue
+        over = under = None
+        for run in m.get("runners", []):
+            name = (run.get("runnerName") or "")
+            if name.endswith(" Over"):
+                over = run
+            elif name.endswith(" Under"):
+                under = run
+        if over is None:
+            continue
+        american = _fd_american(over)
+        if american is None:
+            continue
 
-            # Both sides are quoted, so the vig can actually be stripped — the whole
-            # reason FanDuel is a better price source for the model than Underdog.
-            imp_over = american_to_implied(american)
-            imp_under = None
-            if under is not None:
-                au = _fd_american(under)
-                if au is not None:
-                    imp_under = american_to_implied(au)
-
-            rows.append({
-                "player_name": player, "team": "", "stat_type": stat,
-                "line_score": line, "odds_type": "standard",
-                "american_odds": american,
-                "implied_prob": round(devig_two_way(imp_over, imp_under), 4),
-                "game_id": str(ev_id), "game_label": label,
-                "start_time": start, "sportsbook": "FanDuel",
-            })
+        player = (over.get("runnerName") or "")[: -len(" Over")].strip()
+        try:
+            line = float(over.get("handicap"))
+        except (TypeError, ValueError):
+            continue
 
-    rows.extend(milestone_best.values())
+        # Both sides are quoted, so the vig can actually be stripped — the whole
+        # reason FanDuel is a better price source for the model than Underdog.
+        imp_over = american_to_implied(american)
+        imp_under = None
+        if under is not None:
+            au = _fd_american(under)
+            if au is not None:
+                imp_under = american_to_implied(au)
+
+        rows.append({
+            "player_name": player, "team": "", "stat_type": stat,
+            "line_score": line, "odds_type": "standard",
+            "american_odds": american,
+            "implied_prob": round(devig_two_way(imp_over, imp_under), 4),
+            "game_id": str(ev_id), "game_label": label,
+            "start_time": start, "sportsbook": "FanDuel",
+        })
     return rows
 
 
+# ── Underdog board ───────────────────────────────────────────────────────────
+# over_under_lines carries every sport Underdog lists in one multi-megabyte
+# payload, and the generator and dashboard used to download and join it once
+# per sport per refresh. Now it is fetched and joined here once into a
+# sport-tagged table, and each consumer just filters it and maps display
+# stats onto its own stat names. The board revalidates after UD_BOARD_TTL; an
+# unchanged payload keeps the same frame (and attrs['board_digest']).
+UD_LINES_URL = "https://api.underdogfantasy.com/beta/v5/over_under_lines"
+UD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36",
+    "Accept": "application/json",
+}
+UD_BOARD_TTL = 300
+_ud_board = {"df": None, "digest": None, "ts": 0.0}
+_ud_board_lock = threading.Lock()
+
+
+def _ud_american(opt: dict):
+    try:
+        return int(str(opt.get("american_price", "-110")).replace("+", ""))
+    except Exception:
+        return None
+
+
+def _ud_parse_board(d: dict) -> pd.DataFrame:
+    player_map     = {p["id"]: p for p in d.get("players", [])}
+    appearance_map = {a["id"]: a for a in d.get("appearances", [])}
+    game_map       = {g["id"]: g for g in d.get("games", [])}
+    rows = []
+    for line in d.get("over_under_lines", []):
+        if line.get("status") != "active":
+            continue
+        app_stat = line.get("over_under", {}).get("appearance_stat", {})
+        app = appearance_map.get(app_stat.get("appearance_id", ""), {})
+        if not app:
+            continue
+        player = player_map.get(app.get("player_id", ""), {})
+        if not player:
+            continue
+        try:
+            val = float(line.get("stat_value", 0))
+        except Exception:
+            continue
+        name = f"{player.get('first_name','')} {player.get('last_name','')}".strip()
+        if not name:
+            continue
+        game  = game_map.get(app.get("match_id"), {})
+        title = game.get("abbreviated_title", "")
+        team  = ""
+        if " @ " in title:
+            away, home = title.split(" @ ", 1)
+            team = away if app.get("team_id") == game.get("away_team_id") else home
+        opts = line.get("options", [])
+        over_opt  = next((o for o in opts if o.get("choice") == "higher"), None)
+        under_opt = next((o for o in opts if o.get("choice") == "lower"), None)
+        if not over_opt:
+            continue
+        american = _ud_american(over_opt)
+        if american is None:
+            american = -110
+
+        # The price is the sharpest signal on the board and the generator used to
+        # throw it away, pinning implied_prob at 0.50 for every Underdog leg. That
+        # left the model's "30% market" term a constant, so predictions barely moved
+        # with the line: where the book priced a WNBA leg at 14% it still predicted
+        # 26% (those legs hit 0%), and where the book said 81% it predicted 76%
+        # (they hit 84%). De-vigged book probability restores the signal.
+        implied_under = None
+        if under_opt is not None:
+            au = _ud_american(under_opt)
+            implied_under = american_to_implied(au) if au is not None else None
+        rows.append({
+            "sport_id": player.get("sport_id", ""),
+            "display_stat": app_stat.get("display_stat", "").strip(),
+            "player_name": name, "team": team,
+            "line_score": val, "odds_type": "standard",
+            "american_odds": american,
+            "implied_prob": devig_two_way(american_to_implied(american), implied_under),
+            "game_id": app.get("match_id", ""), "game_label": title,
+            "start_time": game.get("scheduled_at", ""),
+            "sportsbook": "Underdog",
+        })
+    return pd.DataFrame(rows)
+
+
+def fetch_underdog_board(max_age: float = UD_BOARD_TTL) -> pd.DataFrame:
+    """Every active Underdog over/under line, all sports, one row per line with
+    the player/appearance/game join already done. Never raises; on failure the
+    last good board (or an empty frame) comes back."""
+    # Held across the fetch on purpose: concurrent sport views wait for the one
+    # download instead of each starting their own.
+    with _ud_board_lock:
+        cached = _ud_board["df"]
+        if cached is not None and time.time() - _ud_board["ts"] < max_age:
+            return cached
+        try:
+            digest, body = http_client.get_if_changed(UD_LINES_URL, _ud_board["digest"],
+                                                      headers=UD_HEADERS, timeout=15)
+            if body is not None:
+                cached = _ud_parse_board(json.loads(body))
+                cached.attrs["board_digest"] = digest
+                _ud_board.update(df=cached, digest=digest)
+            _ud_board["ts"] = time.time()
+        except Exception as e:
+            print(f"    Underdog fetch failed: {e}")
+        return cached if cached is not None else pd.DataFrame()
+
+
+def underdog_lines(sport: str, stat_map: dict) -> pd.DataFrame:
+    """One sport's slice of the Underdog board with display stats mapped through
+    `stat_map` (unmapped stats dropped). Carries the board's digest in attrs."""
+    board = fetch_underdog_board()
+    if board.empty:
+        return pd.DataFrame()
+    df = board[board["sport_id"] == sport.upper()]
+    stat_type = df["display_stat"].map(stat_map)
+    df = df.assign(stat_type=stat_type)[stat_type.notna()]
+    df = df[["player_name", "team", "stat_type", "line_score", "odds_type",
+             "american_odds", "implied_prob", "game_id", "game_label",
+             "start_time", "sportsbook"]].reset_index(drop=True)
+    df.attrs["board_digest"] = board.attrs.get("board_digest")
+    return df
+
+
 # ── MLB player ID + game logs ────────────────────────────────────────────────
 
 @_ttl_cache(86400)
@@ -649,7 +879,7 @@ def get_mlb_player_map():
     combined = {}
     for season in ("2025", "2026"):
         try:
-            resp = requests.get(f"{MLB_BASE}/sports/1/players?season={season}", timeout=15)
+            resp = http_client.get(f"{MLB_BASE}/sports/1/players?season={season}", timeout=15)
             for p in resp.json().get("people", []):
                 combined[p["fullName"].lower().strip()] = p["id"]
         except Exception:
@@ -680,47 +910,77 @@ def mlb_player_id(name: str):
     return None
 
 
-@_ttl_cache(3600)
-def get_mlb_hitting_logs(player_id, seasons=(MLB_SEASON,)):
-    frames = []
-    abbr_map = _mlb_team_abbr_map()
-    for season in seasons:
-        for attempt in range(2):
-            try:
-                url = f"{MLB_BASE}/people/{player_id}/stats?stats=gameLog&season={season}&group=hitting"
-                resp = requests.get(url, timeout=15)
-                _stats = resp.json().get("stats", [])
-                splits = _stats[0].get("splits", []) if _stats else []
-                rows = []
-                for s in splits:
-                    st_data = s.get("stat", {})
-                    _h = int(st_data.get("hits") or 0)
-                    _hr = int(st_data.get("homeRuns") or 0)
-                    _2b = int(st_data.get("doubles") or 0)
-                    _3b = int(st_data.get("triples") or 0)
-                    _opp = s.get("opponent", {}) or {}
-                    rows.append({
-                        "date": s.get("date", ""),
-                        "season": season,
-                        "opponent": _opp.get("abbreviation") or abbr_map.get(_opp.get("id"), ""),
-                        "AB": int(st_data.get("atBats") or 0),
-                        "H": _h, "HR": _hr, "2B": _2b, "3B": _3b,
-                        "RBI": int(st_data.get("rbi") or 0),
-                        "BB": int(st_data.get("baseOnBalls") or 0),
-                        "K": int(st_data.get("strikeOuts") or 0),
-                        "SB": int(st_data.get("stolenBases") or 0),
-                        "R": int(st_data.get("runs") or 0),
-                        "TB": int(st_data.get("totalBases") or (_h + _2b + 2 * _3b + 3 * _hr)),
-                        "AVG": float(st_data.get("avg") or 0),
-                        "OBP": float(st_data.get("obp") or 0),
-                        "SLG": float(st_data.get("slg") or 0),
-                    })
-                if rows:
-                    frames.append(pd.DataFrame(rows))
-                break
-            except Exception:
-                if attempt == 0:
-                    time.sleep(1)
+def _mlb_hitting_rows(splits, season, abbr_map):
+    """gameLog splits -> per-game hitting rows. Shared by the single-player fetch
+    and the batched people hydrate so both build identical frames."""
+    rows = []
+    for s in splits:
+        st_data = s.get("stat", {})
+        _h = int(st_data.get("hits") or 0)
+        _hr = int(st_data.get("homeRuns") or 0)
+        _2b = int(st_data.get("doubles") or 0)
+        _3b = int(st_data.get("triples") or 0)
+        _opp = s.get("opponent", {}) or {}
+        rows.append({
+            "date": s.get("date", ""),
+            "season": season,
+            "opponent": _opp.get("abbreviation") or abbr_map.get(_opp.get("id"), ""),
+            "AB": int(st_data.get("atBats") or 0),
+            "H": _h, "HR": _hr, "2B": _2b, "3B": _3b,
+            "RBI": int(st_data.get("rbi") or 0),
+            "BB": int(st_data.get("baseOnBalls") or 0),
+            "K": int(st_data.get("strikeOuts") or 0),
+            "SB": int(st_data.get("stolenBases") or 0),
+            "R": int(st_data.get("runs") or 0),
+            "TB": int(st_data.get("totalBases") or (_h + _2b + 2 * _3b + 3 * _hr)),
+            "AVG": float(st_data.get("avg") or 0),
+            "OBP": float(st_data.get("obp") or 0),
+            "SLG": float(st_data.get("slg") or 0),
+        })
+    return rows
+
+
+def _mlb_pitching_rows(splits, season, abbr_map):
+    """gameLog splits -> per-game pitching rows (see _mlb_hitting_rows)."""
+    rows = []
+    for s in splits:
+        st_data = s.get("stat", {})
+        ip_str = str(st_data.get("inningsPitched") or "0")
+        try:
+            parts = ip_str.split(".")
+            ip = int(parts[0]) + (int(parts[1]) / 3 if len(parts) > 1 and parts[1] else 0)
+        except Exception:
+            ip = 0.0
+        _k  = int(st_data.get("strikeOuts") or 0)
+        _er = int(st_data.get("earnedRuns") or 0)
+        _h  = int(st_data.get("hits") or 0)
+        _bb = int(st_data.get("baseOnBalls") or 0)
+        # The API's era/whip are season-to-date cumulative values, not
+        # this game's. Compute per-game rates so each row matches its box.
+        k9   = round((_k  / ip * 9), 2) if ip > 0 else 0
+        era  = round((_er / ip * 9), 2) if ip > 0 else 0.0
+        whip = round(((_h + _bb) / ip), 2) if ip > 0 else 0.0
+        _opp = s.get("opponent", {}) or {}
+        _opp_abbr = _opp.get("abbreviation") or abbr_map.get(_opp.get("id"), "")
+        rows.append({
+            "date": s.get("date", ""),
+            "season": season,
+            "opponent": _opp_abbr,
+            "IP": round(ip, 1),
+            "H": _h,
+            "ER": _er,
+            "BB": _bb,
+            "K": _k,
+            "HR": int(st_data.get("homeRuns") or 0),
+            "NP": int(st_data.get("numberOfPitches") or 0),
+            "ERA": era,
+            "WHIP": whip,
+            "K9": k9,
+        })
+    return rows
+
+
+def _mlb_log_frame(frames):
     if not frames:
         return pd.DataFrame()
     df = pd.concat(frames, ignore_index=True)
@@ -728,63 +988,189 @@ def get_mlb_hitting_logs(player_id, seasons=(MLB_SEASON,)):
     return df.sort_values("date").reset_index(drop=True)
 
 
-@_ttl_cache(3600)
-def get_mlb_pitching_logs(player_id, seasons=(MLB_SEASON,)):
+def _mlb_fetch_logs(player_id, seasons, group, to_rows):
     frames = []
     abbr_map = _mlb_team_abbr_map()
     for season in seasons:
-        for attempt in range(2):
+        try:
+            url = f"{MLB_BASE}/people/{player_id}/stats?stats=gameLog&season={season}&group={group}"
+            resp = http_client.get(url, timeout=15)
+            _stats = resp.json().get("stats", [])
+            splits = _stats[0].get("splits", []) if _stats else []
+            rows = to_rows(splits, season, abbr_map)
+            if rows:
+                frames.append(pd.DataFrame(rows))
+        except Exception:
+            continue
+    return _mlb_log_frame(frames)
+
+
+@_ttl_cache(3600)
+def get_mlb_hitting_logs(player_id, seasons=(MLB_SEASON,)):
+    return _mlb_fetch_logs(player_id, seasons, "hitting", _mlb_hitting_rows)
+
+
+@_ttl_cache(3600)
+def get_mlb_pitching_logs(player_id, seasons=(MLB_SEASON,)):
+    return _mlb_fetch_logs(player_id, seasons, "pitching", _mlb_pitching_rows)
+
+
+@_ttl_cache(86400)
+def mlb_player_hand(player_id) -> tuple:
+    """(bat_side, pitch_hand) codes for a player — 'L', 'R', or 'S' (switch)."""
+    res = ("R", "R")
+    try:
+        resp = http_client.get(f"{MLB_BASE}/people/{player_id}", timeout=8)
+        person = (resp.json().get("people") or [{}])[0]
+        res = _mlb_person_hand(person)
+    except Exception:
+        pass
+    return res
+
+
+def _mlb_person_hand(person: dict) -> tuple:
+    return (person.get("batSide", {}).get("code", "R"),
+            person.get("pitchHand", {}).get("code", "R"))
+
+
+def _mlb_iso_splits(stats: list) -> dict:
+    """statSplits (sitCodes vl/vr) -> {'L': iso_vs_lhp, 'R': iso_vs_rhp}, each only
+    once the split has 20+ AB behind it."""
+    out = {}
+    for st in stats:
+        for sp in st.get("splits", []):
+            d = sp.get("stat", {})
             try:
-                url = f"{MLB_BASE}/people/{player_id}/stats?stats=gameLog&season={season}&group=pitching"
-                resp = requests.get(url, timeout=15)
-                _stats = resp.json().get("stats", [])
-                splits = _stats[0].get("splits", []) if _stats else []
-                rows = []
-                for s in splits:
-                    st_data = s.get("stat", {})
-                    ip_str = str(st_data.get("inningsPitched") or "0")
-                    try:
-                        parts = ip_str.split(".")
-                        ip = int(parts[0]) + (int(parts[1]) / 3 if len(parts) > 1 and parts[1] else 0)
-                    except Exception:
-                        ip = 0.0
-                    _k  = int(st_data.get("strikeOuts") or 0)
-                    _er = int(st_data.get("earnedRuns") or 0)
-                    _h  = int(st_data.get("hits") or 0)
-                    _bb = int(st_data.get("baseOnBalls") or 0)
-                    # The API's era/whip are season-to-date cumulative values, not
-                    # this game's. Compute per-game rates so each row matches its box.
-                    k9   = round((_k  / ip * 9), 2) if ip > 0 else 0
-                    era  = round((_er / ip * 9), 2) if ip > 0 else 0.0
-                    whip = round(((_h + _bb) / ip), 2) if ip > 0 else 0.0
-                    _opp = s.get("opponent", {}) or {}
-                    _opp_abbr = _opp.get("abbreviation") or abbr_map.get(_opp.get("id"), "")
-                    rows.append({
-                        "date": s.get("date", ""),
-                        "season": season,
-                        "opponent": _opp_abbr,
-                        "IP": round(ip, 1),
-                        "H": _h,
-                        "ER": _er,
-                        "BB": _bb,
-                        "K": _k,
-                        "HR": int(st_data.get("homeRuns") or 0),
-                        "NP": int(st_data.get("numberOfPitches") or 0),
-                        "ERA": era,
-                        "WHIP": whip,
-                        "K9": k9,
-                    })
-                if rows:
-                    frames.append(pd.DataFrame(rows))
-                break
+                iso = float(d.get("slg", 0)) - float(d.get("avg", 0))
+                ab = int(d.get("atBats", 0) or 0)
+            except (TypeError, ValueError):
+                continue
+            code = sp.get("split", {}).get("code")
+            if code == "vl" and ab >= 20:
+                out["L"] = iso
+            elif code == "vr" and ab >= 20:
+                out["R"] = iso
+    return out
+
+
+@_ttl_cache(21600)
+def mlb_platoon_iso(player_id, season=MLB_SEASON) -> dict:
+    """Batter ISO vs LHP / RHP this season: {'L': iso, 'R': iso}, or {} when thin."""
+    try:
+        url = (f"{MLB_BASE}/people/{player_id}/stats?stats=statSplits&group=hitting"
+               f"&season={season}&sitCodes=vr,vl")
+        return _mlb_iso_splits(http_client.get(url, timeout=8).json().get("stats", []))
+    except Exception:
+        return {}
+
+
+# ── Batched people hydrate ───────────────────────────────────────────────────
+# /people/{id}/stats, /people/{id} and the statSplits call are one request per
+# player, so a full slate cost ~900 round trips. /people?personIds=... takes a
+# list and hydrates stats inline, so one request now carries a whole chunk of
+# players — and every /people response includes batSide/pitchHand, so
+# handedness rides along for free. Results are primed into the same per-player
+# caches the single-player fetchers use; callers keep calling get_*_logs /
+# mlb_player_hand / mlb_platoon_iso and simply find them warm.
+MLB_BATCH_SIZE = 100
+
+
+def _mlb_people_batch(ids, hydrate: str | None = None) -> list:
+    params = {"personIds": ",".join(str(i) for i in ids)}
+    if hydrate:
+        params["hydrate"] = hydrate
+    resp = http_client.get(f"{MLB_BASE}/people", params=params, timeout=30)
+    resp.raise_for_status()
+    return resp.json().get("people", [])
+
+
+def _mlb_stats_of(person: dict, stat_type: str) -> list:
+    return [s for s in person.get("stats", []) or []
+            if (s.get("type") or {}).get("displayName") == stat_type]
+
+
+def prefetch_mlb_players(hitters=(), pitchers=(), seasons=("2025", "2026"),
+                         splits: bool = False) -> int:
+    """
+    Warm game logs, handedness and (optionally) platoon splits for a whole slate in
+    a handful of multi-person requests. Only players not already cached are fetched.
+
+    hitters/pitchers are MLBAM ids; `seasons` must match the tuple the scoring code
+    later passes to get_mlb_hitting_logs / get_mlb_pitching_logs, since that tuple is
+    part of the cache key (pass () to skip logs). Splits are keyed on
+    mlb_platoon_iso(pid) with the default season. A chunk that fails is simply left cold — the per-player
+    fetchers still work, just one request at a time. Returns the request count.
+    """
+    seasons = tuple(seasons)
+    abbr_map = _mlb_team_abbr_map()
+    requests_made = 0
+    for ids, group, to_rows, log_fn in (
+            (hitters, "hitting", _mlb_hitting_rows, get_mlb_hitting_logs),
+            (pitchers, "pitching", _mlb_pitching_rows, get_mlb_pitching_logs)):
+        if not seasons:
+            break
+        pending = sorted({int(i) for i in ids if i and not log_fn.cached(int(i), seasons)})
+        for c in range(0, len(pending), MLB_BATCH_SIZE):
+            chunk = pending[c:c + MLB_BATCH_SIZE]
+            frames: dict = defaultdict(list)
+            ok = True
+            for season in seasons:
+                try:
+                    people = _mlb_people_batch(
+                        chunk, f"stats(group=[{group}],type=[gameLog],season={season})")
+                    requests_made += 1
+                except Exception:
+                    ok = False
+                    break
+                for person in people:
+                    pid = person.get("id")
+                    if not pid:
+                        continue
+                    mlb_player_hand.prime(_mlb_person_hand(person), pid)
+                    for st in _mlb_stats_of(person, "gameLog"):
+                        rows = to_rows(st.get("splits", []), season, abbr_map)
+                        if rows:
+                            frames[pid].append(pd.DataFrame(rows))
+            if not ok:
+                continue
+            for pid in chunk:
+                log_fn.prime(_mlb_log_frame(frames.get(pid, [])), pid, seasons)
+
+    if splits:
+        pending = sorted({int(i) for i in hitters if i and not mlb_platoon_iso.cached(int(i))})
+        for c in range(0, len(pending), MLB_BATCH_SIZE):
+            chunk = pending[c:c + MLB_BATCH_SIZE]
+            try:
+                people = _mlb_people_batch(
+                    chunk, f"stats(group=[hitting],type=[statSplits],sitCodes=[vl,vr],"
+                           f"season={MLB_SEASON})")
+                requests_made += 1
             except Exception:
-                if attempt == 0:
-                    time.sleep(1)
-    if not frames:
-        return pd.DataFrame()
-    df = pd.concat(frames, ignore_index=True)
-    df["date"] = pd.to_datetime(df["date"])
-    return df.sort_values("date").reset_index(drop=True)
+                continue
+            got = set()
+            for person in people:
+                pid = person.get("id")
+                if not pid:
+                    continue
+                got.add(pid)
+                mlb_player_hand.prime(_mlb_person_hand(person), pid)
+                mlb_platoon_iso.prime(_mlb_iso_splits(_mlb_stats_of(person, "statSplits")), pid)
+            for pid in chunk:
+                if pid not in got:
+                    mlb_platoon_iso.prime({}, pid)
+
+    # Anyone still missing a handedness entry (pitchers-only slates, failed chunks
+    # that were otherwise warm) gets it from a bare people lookup — no hydrate.
+    pending = sorted({int(i) for i in (*hitters, *pitchers) if i and not mlb_player_hand.cached(int(i))})
+    for c in range(0, len(pending), MLB_BATCH_SIZE):
+        try:
+            for person in _mlb_people_batch(pending[c:c + MLB_BATCH_SIZE]):
+                if person.get("id"):
+                    mlb_player_hand.prime(_mlb_person_hand(person), person["id"])
+            requests_made += 1
+        except Exception:
+            continue
+    return requests_made
 
 
 # ── Batter vs. pitcher matchup ───────────────────────────────────────────────
@@ -795,7 +1181,7 @@ def mlb_bvp_stats(batter_id: int, pitcher_id: int) -> dict:
     try:
         url = (f"{MLB_BASE}/people/{batter_id}/stats"
                f"?stats=vsPlayer&group=hitting&opposingPlayerId={pitcher_id}&sportId=1")
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         splits = (resp.json().get("stats") or [{}])[0].get("splits", [])
         if splits:
             st_data = splits[0].get("stat", {})
@@ -820,7 +1206,7 @@ def mlb_today_pitcher_lookup() -> dict:
     try:
         today = datetime.now().strftime("%Y-%m-%d")
         url = f"{MLB_BASE}/schedule?sportId=1&date={today}&hydrate=probablePitcher,team"
-        resp = requests.get(url, timeout=10)
+        resp = http_client.get(url, timeout=10)
         for date_entry in resp.json().get("dates", []):
             for game in date_entry.get("games", []):
                 at, ht = game["teams"]["away"], game["teams"]["home"]
@@ -838,14 +1224,37 @@ def mlb_today_pitcher_lookup() -> dict:
 
 
 # ── NBA player ID + game logs ────────────────────────────────────────────────
+# nba_api keeps its own session, so http_client's host caps never see these
+# calls, and stats.nba.com answers bursts by hanging. NBA and WNBA share that
+# host, and the generator scores both at once; every nba_api request takes a
+# slot here first (3 is what the dashboard's gamelog prewarm settled on), and
+# is entered in http_client's ledger under that host.
+NBA_API_LIMIT = 3
+NBA_API_HOST = "stats.nba.com"
+_nba_api_slots = threading.BoundedSemaphore(NBA_API_LIMIT)
+
+
+@contextmanager
+def _nba_api_call():
+    """Hold an nba_api slot for one request and enter it in the ledger."""
+    with _nba_api_slots:
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            http_client.record(NBA_API_HOST, time.perf_counter() - start, error=True)
+            raise
+        http_client.record(NBA_API_HOST, time.perf_counter() - start)
+
 
 @_ttl_cache(86400)
 def _current_season_nba_player_ids() -> dict:
     """Live fallback: name->id map from CommonAllPlayers for players missing from the static db."""
     try:
-        df = commonallplayers.CommonAllPlayers(
-            is_only_current_season=1, league_id="00", season="2025-26"
-        ).get_data_frames()[0]
+        with _nba_api_call():
+            df = commonallplayers.CommonAllPlayers(
+                is_only_current_season=1, league_id="00", season="2025-26"
+            ).get_data_frames()[0]
         return {row["DISPLAY_FIRST_LAST"].lower(): int(row["PERSON_ID"]) for _, row in df.iterrows()}
     except Exception:
         return {}
@@ -885,10 +1294,11 @@ def get_gamelogs(player_id, seasons):
     for season in seasons:
         for s_type in ("Regular Season", "Playoffs"):
             try:
-                logs = playergamelog.PlayerGameLog(
-                    player_id=player_id, season=season,
-                    season_type_all_star=s_type, timeout=10,
-                ).get_data_frames()[0]
+                with _nba_api_call():
+                    logs = playergamelog.PlayerGameLog(
+                        player_id=player_id, season=season,
+                        season_type_all_star=s_type, timeout=10,
+                    ).get_data_frames()[0]
                 if logs.empty:
                     continue
                 logs["SEASON"] = season
@@ -908,7 +1318,9 @@ def get_gamelogs(player_id, seasons):
 def _wnba_nba_api_player_ids() -> dict:
     """name.lower() -> nba_api person_id for all WNBA players ever (1200+ players)."""
     try:
-        df = commonallplayers.CommonAllPlayers(is_only_current_season=0, league_id="10").get_data_frames()[0]
+        with _nba_api_call():
+            df = commonallplayers.CommonAllPlayers(is_only_current_season=0,
+                                                   league_id="10").get_data_frames()[0]
         if not df.empty:
             return {row["DISPLAY_FIRST_LAST"].lower(): int(row["PERSON_ID"]) for _, row in df.iterrows()}
     except Exception:
@@ -929,11 +1341,12 @@ def get_wnba_gamelogs(player_id, seasons):
     frames = []
     for season in seasons:
         try:
-            logs = playergamelog.PlayerGameLog(
-                player_id=player_id, season=season,
-                season_type_all_star="Regular Season",
-                league_id_nullable="10", timeout=15,
-            ).get_data_frames()[0]
+            with _nba_api_call():
+                logs = playergamelog.PlayerGameLog(
+                    player_id=player_id, season=season,
+                    season_type_all_star="Regular Season",
+                    league_id_nullable="10", timeout=15,
+                ).get_data_frames()[0]
             if not logs.empty:
                 frames.append(logs)
         except Exception:
@@ -957,21 +1370,44 @@ def get_wnba_gamelogs(player_id, seasons):
 # with a +/-10%-of-trend nudge from last-10-vs-prior-10 momentum) blended with
 # 30% sportsbook implied odds, then multiplied by a per-stat calibration factor
 # (see parlay_tracker.get_calibration). MLB batters additionally get a BvP nudge.
+#
+# Each is split in two. The *_rate_parts half does the expensive work — game
+# logs, window math, BvP, Statcast — and returns (hist, statcast, n), none of
+# which depends on the price. _blend_hit_rate folds in the book's implied odds
+# and the calibration factor. The same prop on three books differs only in that
+# last step, so the generator scores the parts once and re-blends per book.
+
+def _blend_hit_rate(parts, odds_type: str = "standard", implied_override: float = -1.0,
+                    cal_factor: float = 1.0):
+    """(rate, n) from a *_rate_parts result; (0.5, 0) when there were no parts."""
+    if parts is None:
+        return 0.5, 0
+    hist, sc, n = parts
+    implied = implied_override if implied_override >= 0 else PP_ODDS_IMPLIED.get(odds_type, 0.50)
+    # Statcast expected-stat model, when the prop has one (xBA→hits, xSLG→total
+    # bases, K%→strikeouts, barrel→HR, …). It predicts these far better than the
+    # game-log recency rate, so give it real weight when available.
+    if sc is not None:
+        rate = 0.40 * hist + 0.35 * sc + 0.25 * implied
+    else:
+        rate = 0.7 * hist + 0.3 * implied
+    rate = rate * cal_factor
+    return round(min(0.97, max(0.03, rate)), 3), n
 
-def _nba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str = "standard",
-                   implied_override: float = -1.0, cal_factor: float = 1.0):
-    """Weighted hit rate: 70% historical (60/40 last-10/30 + trend) + 30% sportsbook implied odds."""
+
+def _nba_rate_parts(player_name: str, stat_type: str, line: float):
+    """(hist, None, n) for an NBA prop — 60/40 last-10/30 + trend — or None without a log."""
     col = NBA_STAT_COL.get(stat_type)
     if col is None:
-        return 0.5, 0
+        return None
     pid = get_player_id(player_name)
     if not pid:
-        return 0.5, 0
+        return None
     df = get_gamelogs(pid, ("2025-26",))
     if df.empty:
         df = get_gamelogs(pid, ("2024-25",))
     if df.empty:
-        return 0.5, 0
+        return None
     if col in ("PRA", "PA", "PR", "RA", "FS"):
         df = df.copy()
         if col == "PRA":
@@ -990,14 +1426,14 @@ def _nba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str
                         + 3.0 * df.get("BLK", 0)
                         - df.get("TOV", 0))
     if col not in df.columns:
-        return 0.5, 0
+        return None
     vals = df[col].values
     last30 = vals[-30:] if len(vals) >= 5 else vals
     last10 = vals[-10:] if len(vals) >= 10 else vals
     prev10 = vals[-20:-10] if len(vals) >= 20 else vals[:max(1, len(vals) // 2)]
     n = len(last30)
     if n == 0:
-        return 0.5, 0
+        return None
     r30 = float((last30 > line).sum()) / len(last30)
     if len(last10) >= 5:
         r10 = float((last10 > line).sum()) / len(last10)
@@ -1008,21 +1444,24 @@ def _nba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str
     if len(last10) >= 5 and len(prev10) >= 5:
         r_prev = float((prev10 > line).sum()) / len(prev10)
         hist = min(0.97, max(0.03, hist + (r10 - r_prev) * 0.1))
-    implied = implied_override if implied_override >= 0 else PP_ODDS_IMPLIED.get(odds_type, 0.50)
-    rate = 0.7 * hist + 0.3 * implied
-    rate = rate * cal_factor
-    return round(min(0.97, max(0.03, rate)), 3), n
+    return hist, None, n
 
 
-def _wnba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str = "standard",
-                    implied_override: float = -1.0, cal_factor: float = 1.0):
-    """Weighted WNBA hit rate: 70% game log history + 30% sportsbook implied."""
+def _nba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str = "standard",
+                   implied_override: float = -1.0, cal_factor: float = 1.0):
+    """Weighted hit rate: 70% historical (60/40 last-10/30 + trend) + 30% sportsbook implied odds."""
+    return _blend_hit_rate(_nba_rate_parts(player_name, stat_type, line),
+                           odds_type, implied_override, cal_factor)
+
+
+def _wnba_rate_parts(player_name: str, stat_type: str, line: float):
+    """(hist, None, n) for a WNBA prop, or None without a log."""
     col = WNBA_STAT_COL.get(stat_type)
     if not col:
-        return 0.5, 0
+        return None
     pid = get_wnba_player_id(player_name)
     if not pid:
-        return 0.5, 0
+        return None
     # 2026 is the current season — try it first, fall back to prior seasons
     # if a player hasn't logged games yet this year (rookies, recent injury returns).
     df = get_wnba_gamelogs(pid, ("2026",))
@@ -1031,7 +1470,7 @@ def _wnba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str
     if df.empty:
         df = get_wnba_gamelogs(pid, ("2024",))
     if df.empty:
-        return 0.5, 0
+        return None
     if col in ("PRA", "PR", "PA", "RA"):
         df = df.copy()
         if col == "PRA":
@@ -1043,14 +1482,14 @@ def _wnba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str
         elif col == "RA":
             df["RA"] = df["REB"] + df["AST"]
     if col not in df.columns:
-        return 0.5, 0
+        return None
     vals = df[col].values
     last30 = vals[-30:] if len(vals) >= 5 else vals
     last10 = vals[-10:] if len(vals) >= 10 else vals
     prev10 = vals[-20:-10] if len(vals) >= 20 else vals[:max(1, len(vals) // 2)]
     n = len(last30)
     if n == 0:
-        return 0.5, 0
+        return None
     r30 = float((last30 > line).sum()) / len(last30)
     if len(last10) >= 5:
         r10 = float((last10 > line).sum()) / len(last10)
@@ -1061,53 +1500,43 @@ def _wnba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str
     if len(last10) >= 5 and len(prev10) >= 5:
         r_prev = float((prev10 > line).sum()) / len(prev10)
         hist = min(0.97, max(0.03, hist + (r10 - r_prev) * 0.1))
-    implied = implied_override if implied_override >= 0 else PP_ODDS_IMPLIED.get(odds_type, 0.50)
-    rate = 0.7 * hist + 0.3 * implied
-    rate = rate * cal_factor
-    return round(min(0.97, max(0.03, rate)), 3), n
+    return hist, None, n
 
 
-def _mlb_hit_rate(player_name: str, stat_type: str, line: float,
-                   odds_type: str = "standard", implied_override: float = -1.0,
-                   cal_factor: float = 1.0, opp_pitcher_id: int | None = None,
-                   team: str | None = None):
-    """
-    Weighted hit rate for MLB props.
-
-    Batters:  60/40 last-10/last-20 + optional BvP adjustment + trend nudge,
-              then 70% historical + 30% implied, x calibration.
-              When batter has >= 15 career AB vs today's pitcher, their career
-              rate against that pitcher nudges hist up or down by up to +/-40%.
+def _wnba_hit_rate(player_name: str, stat_type: str, line: float, odds_type: str = "standard",
+                    implied_override: float = -1.0, cal_factor: float = 1.0):
+    """Weighted WNBA hit rate: 70% game log history + 30% sportsbook implied."""
+    return _blend_hit_rate(_wnba_rate_parts(player_name, stat_type, line),
+                           odds_type, implied_override, cal_factor)
 
-    Pitchers: 50/30/20 last-3/last-10/last-20 (recency-heavy) + trend nudge,
-              then 70% historical + 30% implied, x calibration. Recent form
-              dominates because pitchers can run hot/cold start-by-start.
 
-    opp_pitcher_id can be passed directly (dashboard call sites that pre-fetch
-    it in a loop), or resolved automatically from `team` via
-    mlb_today_pitcher_lookup() if opp_pitcher_id is omitted.
+def _mlb_rate_parts(player_name: str, stat_type: str, line: float,
+                    opp_pitcher_id: int | None = None, team: str | None = None):
+    """
+    (hist, statcast, n) for an MLB prop, or None without a log; statcast is None
+    when the prop has no expected-stat model. See _mlb_hit_rate.
     """
     is_pitcher = stat_type in MLB_PITCHER_TYPES
     col = (MLB_PIT_COL if is_pitcher else MLB_HIT_COL).get(stat_type)
     if col is None:
-        return 0.5, 0
+        return None
     pid = mlb_player_id(player_name)
     if not pid:
-        return 0.5, 0
+        return None
     seasons = ("2025", "2026")
     try:
         df = get_mlb_pitching_logs(pid, seasons) if is_pitcher else get_mlb_hitting_logs(pid, seasons)
     except Exception:
-        return 0.5, 0
+        return None
     if df.empty or col not in df.columns:
-        return 0.5, 0
+        return None
     vals = df[col].values
     last20 = vals[-20:] if len(vals) >= 5 else vals
     last10 = vals[-10:] if len(vals) >= 10 else vals
     prev10 = vals[-20:-10] if len(vals) >= 20 else vals[:max(1, len(vals) // 2)]
     n = len(last20)
     if n == 0:
-        return 0.5, 0
+        return None
 
     r20 = float((last20 > line).sum()) / len(last20)
 
@@ -1146,21 +1575,36 @@ def _mlb_hit_rate(player_name: str, stat_type: str, line: float,
         r10_cur = float((last10 > line).sum()) / len(last10)
         hist = min(0.97, max(0.03, hist + (r10_cur - r_prev) * 0.1))
 
-    implied = implied_override if implied_override >= 0 else PP_ODDS_IMPLIED.get(odds_type, 0.50)
-    # Statcast expected-stat model, when the prop has one (xBA→hits, xSLG→total
-    # bases, K%→strikeouts, barrel→HR, …). It predicts these far better than the
-    # game-log recency rate, so give it real weight when available.
     sc = None
     try:
         sc = statcast_over_prob(pid, stat_type, line, is_pitcher, opp_pitcher_id)
     except Exception:
         sc = None
-    if sc is not None:
-        rate = 0.40 * hist + 0.35 * sc + 0.25 * implied
-    else:
-        rate = 0.7 * hist + 0.3 * implied
-    rate = rate * cal_factor
-    return round(min(0.97, max(0.03, rate)), 3), n
+    return hist, sc, n
+
+
+def _mlb_hit_rate(player_name: str, stat_type: str, line: float,
+                   odds_type: str = "standard", implied_override: float = -1.0,
+                   cal_factor: float = 1.0, opp_pitcher_id: int | None = None,
+                   team: str | None = None):
+    """
+    Weighted hit rate for MLB props.
+
+    Batters:  60/40 last-10/last-20 + optional BvP adjustment + trend nudge,
+              then 70% historical + 30% implied, x calibration.
+              When batter has >= 15 career AB vs today's pitcher, their career
+              rate against that pitcher nudges hist up or down by up to +/-40%.
+
+    Pitchers: 50/30/20 last-3/last-10/last-20 (recency-heavy) + trend nudge,
+              then 70% historical + 30% implied, x calibration. Recent form
+              dominates because pitchers can run hot/cold start-by-start.
+
+    opp_pitcher_id can be passed directly (dashboard call sites that pre-fetch
+    it in a loop), or resolved automatically from `team` via
+    mlb_today_pitcher_lookup() if opp_pitcher_id is omitted.
+    """
+    return _blend_hit_rate(_mlb_rate_parts(player_name, stat_type, line, opp_pitcher_id, team),
+                           odds_type, implied_override, cal_factor)
 
 
 # ── Parlay builder ───────────────────────────────────────────────────────────
@@ -1,21 +1,41 @@
 """
 parlay_tracker.py — Persistent parlay logging, outcome resolution, and model calibration.
 
-Log lives at parlay_log.json next to this file.
-Outcomes are resolved automatically via the NBA API (playergamelog) and MLB Stats API.
+Log lives at parlay_log.json (+ its parlay_log.jsonl journal) next to this file;
+settled weeks are archived under parlay_archive/.
+Outcomes are resolved automatically from ESPN box scores (NBA/WNBA) and the MLB Stats API.
 Calibration factors are derived from resolved legs once CAL_MIN_SAMPLES is reached per stat.
 """
 
+import io
+import os
+import copy
+import csv
+import gzip
 import json
 import hashlib
-import time as _time
+import inspect
+import threading
+import time
 import unicodedata
-from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta, timezone
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+try:
+    import fcntl
+except ImportError:           # Windows (the scheduled job's host)
+    fcntl = None
+    import msvcrt
+
+import http_client
+
 LOG_PATH = Path(__file__).parent / "parlay_log.json"
 
 # Which model produced a parlay's predicted_prob. Bump this whenever a change alters
@@ -40,7 +60,7 @@ CAL_MAX_FACTOR = 1.35         # clamp calibration multiplier upper bound
 CAL_MIN_FACTOR = 0.05         # allow deep deflation for stats like RBI/HR that rarely hit
 CAL_HALF_LIFE_WEEKS = 3       # recency weighting: a week's legs count half as much every 3 weeks of age
 
-# ── NBA stat resolution: how to compute a value from a PlayerGameLog row ─────
+# ── NBA stat resolution: how to compute a value from a box score row ─────────
 # Format: "stat_type": ("single", col) or ("sum", [cols])
 _NBA_RESOLVE = {
     "Points":         ("single", "PTS"),
@@ -56,7 +76,7 @@ _NBA_RESOLVE = {
     "Rebs+Asts":      ("sum",    ["REB", "AST"]),
 }
 
-# ── MLB stat resolution: statsapi stat key names ──────────────────────────────
+# ── MLB stat resolution: Stats API boxscore stat key names ───────────────────
 _MLB_BATTING_RESOLVE = {
     "Hits":              "hits",
     "Home Runs":         "homeRuns",
@@ -86,7 +106,7 @@ def _mlb_derived_batting(stat_type: str, b: dict) -> float | None:
     """
     Compute batting props that the per-game boxscore has no single key for.
 
-    boxscore_data carries raw counting stats only, so composites have to be derived.
+    The boxscore carries raw counting stats only, so composites have to be derived.
     A composite the resolver cannot name never resolves at all: the leg is skipped,
     stays pending forever, and is retried against the API on every run. Returns None
     when stat_type is not a derived stat.
@@ -108,40 +128,467 @@ def _mlb_derived_batting(stat_type: str, b: dict) -> float | None:
 # Persistence helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Storage is a snapshot (parlay_log.json, the historical format) plus an
+# append-only journal (parlay_log.jsonl) of whole-parlay "put" records. Rewriting
+# the full history with indent=2 on every log_parlays call and every resolver pass
+# made each write O(history); now a save appends one line per parlay that actually
+# changed, and a reader that already holds the log only parses the journal bytes
+# it hasn't seen. Once the journal outgrows the snapshot it is folded back in with
+# an atomic rewrite, so the snapshot alone stays a complete, readable log.
+#
+# Writers mark what they changed with _touch(parlay); _save(data) then persists
+# exactly those parlays. Handing _save a dict that is not the loaded log (a whole
+# replacement) rewrites the snapshot instead.
+JOURNAL_PATH = LOG_PATH.with_suffix(".jsonl")
+JOURNAL_COMPACT_MIN = 2000    # journal records before compaction is considered
+
 _CACHE: dict | None = None
-_CACHE_MTIME: float = 0.0
+_CACHE_MTIME: float = 0.0     # snapshot mtime the cache was built from
+_JOURNAL_POS: int = 0         # journal bytes already applied to the cache
+_JOURNAL_RECORDS: int = 0
+_INDEX: dict = {}             # parlay id -> position in _CACHE["parlays"]
+_LOG_VERSION: int = 0         # bumped whenever the loaded log changes (see _frames)
+_DIRTY: dict = {}             # ids changed since the last _save (insertion-ordered,
+                              # so new parlays journal in the order they were logged)
+
+# The sport resolvers run side by side (resolve_all_legs). Loading the log,
+# touching parlays and saving happen under _LOG_LOCK; the network work in between
+# does not, and a resolver only ever writes outcomes onto its own sport's legs —
+# back under the lock, onto the log as it then stands (_settle_legs).
+_LOG_LOCK = threading.RLock()
+
+# Unresolved work, indexed so the resolvers never walk settled history. _PENDING
+# maps sport -> (game date, player) -> {(parlay id, leg index)} for every leg that
+# still has no outcome (historical fallback legs excluded — they never resolve);
+# _PENDING_REFS is the reverse map, so a leg leaves the index without re-parsing
+# its date. _OPEN holds, per sport, the parlays whose parlay_hit is still None —
+# the only ones _mark_parlay_outcomes can change. Both are rebuilt with _INDEX and
+# kept current by _index_pending() wherever a parlay is loaded or saved.
+_PENDING: dict = {}
+_PENDING_REFS: dict = {}
+_OPEN: dict = {}
+
+
+def _touch(parlay: dict) -> None:
+    """Mark a parlay as changed so the next _save journals it."""
+    _DIRTY[parlay["id"]] = None
+
+
+def _index_pending(parlay: dict) -> None:
+    """Bring _PENDING/_OPEN in line with `parlay` as it now stands."""
+    pid, sport = parlay["id"], parlay.get("sport")
+    if parlay.get("parlay_hit") is None:
+        _OPEN.setdefault(sport, {})[pid] = None
+    else:
+        _OPEN.get(sport, {}).pop(pid, None)
+    for i, leg in enumerate(parlay.get("legs", [])):
+        ref = (pid, i)
+        if leg.get("outcome") is None and not _is_historical_leg(leg):
+            if ref not in _PENDING_REFS:
+                key = (_parse_game_date(leg, parlay.get("generated_at", "")),
+                       leg.get("player_name"))
+                _PENDING.setdefault(sport, {}).setdefault(key, set()).add(ref)
+                _PENDING_REFS[ref] = (sport, key)
+        elif ref in _PENDING_REFS:
+            old_sport, key = _PENDING_REFS.pop(ref)
+            refs = _PENDING[old_sport][key]
+            refs.discard(ref)
+            if not refs:
+                del _PENDING[old_sport][key]
+
+
+def _index_parlay(parlay: dict) -> None:
+    """Refresh every derived index for a parlay that was just (re)seated in the log."""
+    _index_pending(parlay)
+    _index_calibration(parlay)
+
+
+def _reindex(data: dict) -> None:
+    """Rebuild _INDEX and the derived indexes from scratch for `data`."""
+    _INDEX.clear()
+    _INDEX.update((p["id"], i) for i, p in enumerate(data["parlays"]))
+    _PENDING.clear()
+    _PENDING_REFS.clear()
+    _OPEN.clear()
+    for d in (_LEG_CAL, _PARLAY_CAL, _CAL_PROPS, _CAL_STATE):
+        d.clear()
+    _fold_archive()
+    for p in data["parlays"]:
+        _index_parlay(p)
+
+
+def _apply_journal(data: dict, raw: bytes, skip=()) -> int:
+    """Replay journal lines onto `data` (last put per id wins). Returns records applied."""
+    parlays = data["parlays"]
+    n = 0
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue          # torn final line from an interrupted append
+        p = rec.get("parlay")
+        if (rec.get("op") != "put" or not p or p.get("id") in skip
+                or p.get("id") in _ARCHIVE["ids"]):
+            continue
+        i = _INDEX.get(p["id"])
+        if i is None:
+            _INDEX[p["id"]] = len(parlays)
+            parlays.append(p)
+        else:
+            parlays[i] = p
+        _index_parlay(p)
+        n += 1
+    return n
+
+
+def _journal_tail(start: int) -> tuple:
+    """(bytes from `start` to the last complete line, new position)."""
+    try:
+        with open(JOURNAL_PATH, "rb") as f:
+            f.seek(start)
+            raw = f.read()
+    except FileNotFoundError:
+        return b"", start
+    cut = raw.rfind(b"\n") + 1       # leave a half-written line for next time
+    return raw[:cut], start + cut
 
 
 def _load() -> dict:
-    global _CACHE, _CACHE_MTIME
+    global _CACHE, _CACHE_MTIME, _JOURNAL_POS, _JOURNAL_RECORDS, _LOG_VERSION
     try:
         mtime = LOG_PATH.stat().st_mtime
     except Exception:
         mtime = 0.0
-    if _CACHE is not None and mtime == _CACHE_MTIME:
+    try:
+        jsize = JOURNAL_PATH.stat().st_size
+    except Exception:
+        jsize = 0
+    if _CACHE is not None and mtime == _CACHE_MTIME and jsize >= _JOURNAL_POS:
+        if jsize > _JOURNAL_POS:
+            # Another process appended: apply just the new records.
+            raw, _JOURNAL_POS = _journal_tail(_JOURNAL_POS)
+            applied = _apply_journal(_CACHE, raw, skip=_DIRTY)
+            _JOURNAL_RECORDS += applied
+            _LOG_VERSION += bool(applied)
         return _CACHE
+
+    data = {"version": 1, "parlays": []}
     if LOG_PATH.exists():
         try:
-            _CACHE = json.loads(LOG_PATH.read_text(encoding="utf-8"))
-            _CACHE_MTIME = mtime
-            return _CACHE
+            data = json.loads(LOG_PATH.read_text(encoding="utf-8"))
         except Exception:
-            pass
-    _CACHE = {"version": 1, "parlays": []}
-    _CACHE_MTIME = 0.0
+            mtime = 0.0
+    else:
+        mtime = 0.0
+    _archive_manifest()
+    if _ARCHIVE["ids"]:
+        # Mid-archive, another process may have written the partitions but not yet
+        # the snapshot without them.
+        data["parlays"] = [p for p in data["parlays"] if p.get("id") not in _ARCHIVE["ids"]]
+    _CACHE, _CACHE_MTIME = data, mtime
+    _reindex(data)
+    _DIRTY.clear()
+    raw, _JOURNAL_POS = _journal_tail(0)
+    _JOURNAL_RECORDS = _apply_journal(data, raw)
+    _LOG_VERSION += 1
     return _CACHE
 
 
-def _save(data: dict) -> None:
-    global _CACHE, _CACHE_MTIME
-    LOG_PATH.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+# _LOG_LOCK only orders threads. The dashboard, the daily job and the resolver
+# cron are separate processes sharing one journal, so appends and compaction also
+# take an OS lock on a sidecar file: otherwise a put appended between the snapshot
+# replace and the journal truncate was folded into neither and silently lost.
+@contextmanager
+def _journal_lock():
+    """Exclusive cross-process lock held while the journal is appended or compacted."""
+    with open(JOURNAL_PATH.with_suffix(".lock"), "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue      # LK_LOCK gives up after ~10s; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_snapshot(data: dict, compacting: bool = False) -> None:
+    """Atomically replace the snapshot with `data`, keeping only unfolded journal lines.
+
+    `data` holds the journal up to _JOURNAL_POS; records past it (another process's
+    appends since our last read) survive the rewrite and are replayed on the next
+    _load. A compaction that finds the snapshot already replaced by another process
+    is dropped — that process just folded the journal itself.
+    """
+    global _CACHE, _CACHE_MTIME, _JOURNAL_POS, _JOURNAL_RECORDS, _LOG_VERSION
+    with _journal_lock():
+        try:
+            mtime = LOG_PATH.stat().st_mtime
+        except Exception:
+            mtime = 0.0
+        try:
+            jsize = JOURNAL_PATH.stat().st_size
+        except Exception:
+            jsize = 0
+        folded = _JOURNAL_POS
+        if mtime != _CACHE_MTIME or jsize < folded:
+            if compacting:
+                return
+            folded = 0        # our offset is into a journal that no longer exists
+        tail = b""
+        if jsize > folded:
+            with open(JOURNAL_PATH, "rb") as f:
+                f.seek(folded)
+                tail = f.read()
+        tmp = LOG_PATH.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp, LOG_PATH)
+        JOURNAL_PATH.write_bytes(tail)
     _CACHE = data
+    _reindex(data)
+    _DIRTY.clear()
+    _JOURNAL_POS = _JOURNAL_RECORDS = 0
+    _LOG_VERSION += 1
     try:
         _CACHE_MTIME = LOG_PATH.stat().st_mtime
     except Exception:
         _CACHE_MTIME = 0.0
 
 
+def _save(data: dict) -> None:
+    global _JOURNAL_POS, _JOURNAL_RECORDS, _LOG_VERSION
+    if data is not _CACHE:
+        _write_snapshot(data)
+        return
+    pending = [data["parlays"][_INDEX[pid]] for pid in _DIRTY if pid in _INDEX]
+    _DIRTY.clear()
+    if not pending:
+        return
+    # Catch up on anything another process wrote since our last read (a journal
+    # tail, or a compaction), then seat our changes on top: last writer wins.
+    fresh = _load()
+    for p in pending:
+        i = _INDEX.get(p["id"])
+        if i is None:
+            _INDEX[p["id"]] = len(fresh["parlays"])
+            fresh["parlays"].append(p)
+        else:
+            fresh["parlays"][i] = p
+        _index_parlay(p)
+    payload = "".join(json.dumps({"op": "put", "parlay": p}, default=str) + "\n"
+                      for p in pending).encode("utf-8")
+    with _journal_lock(), open(JOURNAL_PATH, "ab") as f:
+        f.write(payload)
+        end = f.tell()
+    if end - len(payload) == _JOURNAL_POS:
+        _JOURNAL_POS = end    # nothing interleaved; otherwise the next _load re-reads
+    _JOURNAL_RECORDS += len(pending)
+    _LOG_VERSION += 1
+    if _JOURNAL_RECORDS > max(JOURNAL_COMPACT_MIN, len(fresh["parlays"])):
+        _write_snapshot(fresh, compacting=True)
+
+
+# ── Settled-week archive ─────────────────────────────────────────────────────
+# The daily job logs hundreds of parlays a day, and every full _load parsed all of
+# them even though a week whose parlays have all settled never changes again.
+# archive_settled_weeks() moves each such week (before the current one) out of
+# the snapshot into ARCHIVE_DIR/<iso week>.jsonl.gz, an immutable gzip JSONL
+# partition in log order, and records a small summary for it in the manifest:
+# its parlay ids (so log_parlays still dedupes against them), per-sport counts,
+# the calibration sums it contributes and its abandoned legs. The hot log is then
+# just the current and still-pending weeks.
+#
+# Nothing reads a partition until a query needs its rows. Calibration folds the
+# manifest's sums straight into the running sums; the week lists and
+# last_parlay_time come from the summaries; a one-week report reads that week's
+# partition; and only whole-history reports load them all (once — they are
+# immutable). Archived weeks come first in log order, so the first-seen prop
+# dedupe is unchanged within a week and the hot log. A prop's legs all share its
+# game, so the rare prop that straddles a week boundary can count once per side.
+ARCHIVE_DIR = LOG_PATH.with_name("parlay_archive")
+ARCHIVE_MANIFEST = ARCHIVE_DIR / "manifest.json"
+
+# The manifest as last read ("stamp" is its (mtime_ns, size)), plus the partitions
+# and frames loaded from it so far. "version" moves whenever the manifest does.
+_ARCHIVE: dict = {"stamp": None, "version": 0, "weeks": {}, "ids": set(),
+                  "parlays": {}, "frames": {}, "all": None}
+
+
+def _archive_manifest() -> dict:
+    """{iso week: summary} for every archived week, re-read only when the file changes."""
+    try:
+        st = ARCHIVE_MANIFEST.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    if stamp != _ARCHIVE["stamp"]:
+        weeks = {}
+        if stamp is not None:
+            try:
+                weeks = json.loads(ARCHIVE_MANIFEST.read_text(encoding="utf-8")).get("weeks", {})
+            except (OSError, ValueError):
+                weeks = {}
+        _ARCHIVE.update(stamp=stamp, version=_ARCHIVE["version"] + 1, weeks=weeks,
+                        ids={pid for s in weeks.values() for pid in s["ids"]},
+                        parlays={}, frames={}, all=None)
+    return _ARCHIVE["weeks"]
+
+
+def _archive_parlays(week: str) -> list:
+    """The parlays of an archived week, in log order (read once, then kept)."""
+    cache = _ARCHIVE["parlays"]
+    if week not in cache:
+        path = ARCHIVE_DIR / _ARCHIVE["weeks"][week]["file"]
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            cache[week] = [json.loads(line) for line in f if line.strip()]
+    return cache[week]
+
+
+def _write_manifest(weeks: dict) -> None:
+    tmp = ARCHIVE_MANIFEST.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"version": 1, "weeks": weeks}), encoding="utf-8")
+    os.replace(tmp, ARCHIVE_MANIFEST)
+    _archive_manifest()
+
+
+def _is_settled(parlay: dict) -> bool:
+    """True once the resolvers have nothing left to do for a parlay."""
+    if parlay.get("parlay_hit") is not None:
+        return True
+    return all(leg.get("outcome") is not None or _is_historical_leg(leg)
+               or _leg_is_abandoned(leg) for leg in parlay.get("legs", []))
+
+
+def _week_summary(week: str, parlays: list) -> dict:
+    """The manifest record for one archived week (see the section comment)."""
+    def _sum_into(sums: dict, key: str, predicted: float, actual: float) -> None:
+        row = sums.setdefault(key, [0.0, 0.0, 0])
+        row[0] += predicted
+        row[1] += actual
+        row[2] += 1
+
+    sports: dict = {}
+    seen = set()
+    for p in parlays:
+        sport = p.get("sport") or ""
+        s = sports.setdefault(sport, {"parlays": 0, "last_generated_at": "",
+                                      "legs": {}, "graded": {}, "abandoned": {}})
+        s["parlays"] += 1
+        s["last_generated_at"] = max(s["last_generated_at"], p.get("generated_at", ""))
+        hit = p.get("parlay_hit")
+        if hit is not None:
+            # Every epoch is kept; the fold grades only the current one (_cal_state).
+            _sum_into(s["graded"].setdefault(str(p.get("model_epoch")), {}),
+                      str(len(p.get("legs", []))), float(p["predicted_prob"]),
+                      1.0 if hit else 0.0)
+        for _, key, stat, predicted, actual in _cal_state(p)[3]:
+            if (sport, key) not in seen:
+                seen.add((sport, key))
+                _sum_into(s["legs"], stat, predicted, actual)
+        for leg in p.get("legs", []):
+            if (leg.get("outcome") is None and not _is_historical_leg(leg)
+                    and _leg_is_abandoned(leg)):
+                players = s["abandoned"].setdefault(leg["stat_type"], {})
+                players[leg["player_name"]] = players.get(leg["player_name"], 0) + 1
+    return {"file": f"{week}.jsonl.gz", "parlays": len(parlays),
+            "ids": [p["id"] for p in parlays], "sports": sports}
+
+
+def _fold_archive() -> None:
+    """Add every archived week's calibration sums to the running sums (from _reindex)."""
+    for week, summary in _ARCHIVE["weeks"].items():
+        wk = _week_ordinal(week)
+        for sport, s in summary["sports"].items():
+            graded = s["graded"].get(_MODEL_EPOCH, {})
+            for scope in ((None,) if not sport else (None, sport)):
+                if scope not in _LEG_CAL:
+                    _LEG_CAL[scope] = _DecayedSums()
+                    _PARLAY_CAL[scope] = _DecayedSums()
+                acc = _LEG_CAL[scope]
+                acc.week(wk, 1)
+                for stat, (predicted, actual, n) in s["legs"].items():
+                    acc.add(stat, wk, predicted, actual, 1, n)
+                if graded:
+                    pacc = _PARLAY_CAL[scope]
+                    pacc.week(wk, 1)
+                    for n_legs, (predicted, actual, n) in graded.items():
+                        pacc.add(int(n_legs), wk, predicted, actual, 1, n)
+
+
+def archive_settled_weeks() -> int:
+    """
+    Move every fully settled ISO week before the current one from the hot log into
+    its archive partition. Returns the number of parlays archived.
+    """
+    with _LOG_LOCK:
+        data = _load()
+        current = datetime.now().strftime("%G-W%V")
+        by_week: dict = defaultdict(list)
+        for p in data["parlays"]:
+            by_week[p.get("iso_week") or ""].append(p)
+        weeks = sorted(w for w, ps in by_week.items()
+                       if w and w < current and all(_is_settled(p) for p in ps))
+        if not weeks:
+            return 0
+
+        manifest = dict(_archive_manifest())
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        for week in weeks:
+            # Partition and manifest go first: a reader that sees them before the
+            # new snapshot drops the archived ids from the old one (see _load).
+            parlays = (_archive_parlays(week) if week in manifest else []) + by_week[week]
+            path = ARCHIVE_DIR / f"{week}.jsonl.gz"
+            tmp = path.with_name(path.name + ".tmp")
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                for p in parlays:
+                    f.write(json.dumps(p, default=str) + "\n")
+            os.replace(tmp, path)
+            manifest[week] = _week_summary(week, parlays)
+        _write_manifest(manifest)
+
+        moved = set(weeks)
+        _write_snapshot({**data, "parlays": [p for p in data["parlays"]
+                                             if (p.get("iso_week") or "") not in moved]})
+        return sum(len(by_week[w]) for w in weeks)
+
+
+def _unarchive(weeks) -> None:
+    """Return archived weeks to the hot log, ahead of it (they are older)."""
+    with _LOG_LOCK:
+        data = _load()
+        manifest = dict(_archive_manifest())
+        restored = []
+        for week in sorted(weeks):
+            restored += _archive_parlays(week)
+            manifest.pop(week)
+        # The ids leave the manifest before the snapshot carries them, or _load would
+        # drop them again as archived.
+        _write_manifest(manifest)
+        _write_snapshot({**data, "parlays": restored + data["parlays"]})
+        for week in weeks:
+            (ARCHIVE_DIR / f"{week}.jsonl.gz").unlink(missing_ok=True)
+
+
+def _week_parlays(week: str) -> list:
+    """Every parlay logged in `week`, from its partition if it has been archived."""
+    data = _load()
+    if week in _archive_manifest():
+        return _archive_parlays(week)
+    return [p for p in data["parlays"] if p.get("iso_week") == week]
+
+
 def _parlay_id(parlay: dict, sport: str, sportsbook: str) -> str:
     """Stable hash: same legs + sport + sportsbook = same ID (prevents duplicate logging)."""
     leg_keys = sorted(
@@ -165,16 +612,12 @@ def log_parlays(
     """Append newly generated parlays to the log. Returns count of new entries added."""
     if not parlays:
         return 0
-    data = _load()
-    existing_ids = {p["id"] for p in data["parlays"]}
     now = datetime.now()
     week = now.strftime("%G-W%V")
-    added = 0
+    entries = []
 
     for parlay in parlays:
         pid = _parlay_id(parlay, sport, sportsbook)
-        if pid in existing_ids:
-            continue
         entry = {
             "id":               pid,
             "sport":            sport,
@@ -210,12 +653,22 @@ def log_parlays(
                 "start_time":        str(leg.get("start_time", "")),
                 "outcome":           None,
             })
-        data["parlays"].append(entry)
-        existing_ids.add(pid)
-        added += 1
+        entries.append(entry)
 
-    if added:
-        _save(data)
+    # The resolvers may be saving from another thread; seat and save under the lock.
+    added = 0
+    with _LOG_LOCK:
+        data = _load()
+        for entry in entries:
+            pid = entry["id"]
+            if pid in _INDEX or pid in _ARCHIVE["ids"]:
+                continue
+            _INDEX[pid] = len(data["parlays"])
+            data["parlays"].append(entry)
+            _touch(entry)
+            added += 1
+        if added:
+            _save(data)
     return added
 
 
@@ -283,7 +736,7 @@ def _leg_is_resolvable(leg: dict, generated_at: str) -> bool:
             return datetime.now(timezone.utc).astimezone() >= game_start + timedelta(hours=4)
         except Exception:
             pass
-    # No start_time: always attempt — NBA API returns empty if game not yet posted
+    # No start_time: always attempt — an unplayed game simply has no final box score yet
     return True
 
 
@@ -292,96 +745,107 @@ def _is_historical_leg(leg: dict) -> bool:
     return leg.get("game_label", "").strip().lower() == "historical"
 
 
-def _normalize_name(name: str) -> str:
-    """Strip Unicode accents so 'Vásquez' matches 'Vasquez'."""
-    return unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
-
-
-def _team_label_to_abbrev(token: str) -> str:
+def _pending_legs(sport: str) -> list:
     """
-    Convert a team label token to a 3-letter abbreviation for MATCHUP matching.
-    Handles both already-abbreviated tokens ('SAS') and full team names.
-    Uses nba_api teams list as lookup; falls back to first 3 chars.
+    (parlay, leg) for every unresolved leg of `sport` that is ready to resolve, in game
+    date then player order. Read from the pending index, so the cost tracks open work:
+    a date bucket still in the future is skipped without looking at its legs.
     """
-    token = token.strip()
-    if len(token) <= 4:
-        return token.upper()[:3]  # already an abbreviation
-    # Build a keyword → abbrev map from nba_api teams (cached in module)
-    try:
-        from nba_api.stats.static import teams as _nba_teams  # type: ignore
-        all_teams = _nba_teams.get_teams()
-        token_up = token.upper()
-        for t in all_teams:
-            abbrev = t["abbreviation"].upper()
-            if (t["full_name"].upper() in token_up or
-                    t["nickname"].upper() in token_up or
-                    t["city"].upper() in token_up):
-                return abbrev
-    except Exception:
-        pass
-    return token.upper()[:3]
+    data = _load()
+    today = datetime.now().date()    # _parse_game_date's dates are local too
+    out = []
+    buckets = _PENDING.get(sport, {})
+    for key in sorted(buckets, key=lambda k: (k[0] or date.min, str(k[1]))):
+        game_date = key[0]
+        if game_date is not None and game_date > today:
+            continue
+        for pid, i in sorted(buckets[key], key=lambda r: (_INDEX.get(r[0], -1), r[1])):
+            parlay = data["parlays"][_INDEX[pid]]
+            leg = parlay["legs"][i]
+            if leg["outcome"] is not None or not _leg_is_resolvable(leg, parlay["generated_at"]):
+                continue
+            out.append((parlay, leg))
+    return out
 
 
-def _parse_log_date(raw: str) -> date | None:
-    """Parse a PlayerGameLog GAME_DATE ('MMM DD, YYYY', or ISO) into a date."""
-    try:
-        return datetime.strptime(raw.title(), "%b %d, %Y").date()
-    except ValueError:
-        try:
-            return date.fromisoformat(raw[:10])
-        except Exception:
-            return None
+def _claim_pending(sport: str) -> list:
+    """
+    _pending_legs(sport), with each leg's attempt counter advanced. Call it holding
+    _LOG_LOCK.
+    """
+    entries = _pending_legs(sport)
+    for parlay, leg in entries:
+        # Count the try up front. A leg the API never returns is only ever seen
+        # here, so this is the one place the give-up counter can advance.
+        leg["resolve_attempts"] = int(leg.get("resolve_attempts", 0)) + 1
+        _touch(parlay)
+    return entries
 
 
-def _find_game_by_label(df: pd.DataFrame, game_label: str, generated_at: str) -> pd.Series | None:
+def _settle_legs(sport: str, entries: list, outcomes: list, save: bool) -> None:
     """
-    Match a game log row using team names extracted from game_label (e.g. 'SAS @ OKC'
-    or 'San Antonio Spurs @ Oklahoma City Thunder').
-    Returns the game closest to generated_at that has both teams in the MATCHUP.
+    Write a resolver's results (one outcome or None per claimed entry) onto the log
+    as it stands now, then mark parlays and, with `save`, save.
+
+    The claimed parlays are only a snapshot: between the claim and here a _load
+    may have swapped in a fresh log, and another _save in this process may have
+    cleared their dirty marks. So everything is written under _LOG_LOCK onto the
+    parlays re-seated by id in the current log, attempt counters included, and
+    touched there — writing onto the claimed objects could journal nothing, or
+    save a stale whole snapshot.
     """
-    if df.empty or "MATCHUP" not in df.columns or not game_label:
-        return None
-    parts = [p.strip() for p in game_label.replace("@", " @ ").split("@")]
-    if len(parts) < 2:
-        return None
-    abbrev_a = _team_label_to_abbrev(parts[0])
-    abbrev_b = _team_label_to_abbrev(parts[1])
+    with _LOG_LOCK:
+        data = _load()
+        for (claimed, leg), outcome in zip(entries, outcomes):
+            pos = _INDEX.get(claimed["id"])
+            if pos is None:
+                continue                      # archived meanwhile
+            parlay = data["parlays"][pos]
+            i = next(j for j, l in enumerate(claimed["legs"]) if l is leg)
+            current = parlay["legs"][i]
+            current["resolve_attempts"] = max(int(current.get("resolve_attempts", 0)),
+                                              int(leg.get("resolve_attempts", 0)))
+            if outcome is not None and current["outcome"] is None:
+                current["outcome"] = outcome
+            _touch(parlay)
+        _mark_parlay_outcomes(data, sport)
+        if save:
+            _save(data)   # attempt counters must persist, or a dead leg is retried forever
+
+
+def _leg_game_days(parlay: dict, leg: dict) -> tuple:
+    """
+    Dates a leg's game could fall on. Without a start_time the only date is the
+    generation date, and the generator runs the night before, so look a day on too.
+    """
+    d = _parse_game_date(leg, parlay["generated_at"])
+    if d is None:
+        return ()
+    if leg.get("start_time"):
+        return (d,)
+    return (d, d + timedelta(days=1))
 
-    gen_date = None
-    try:
-        gen_date = datetime.fromisoformat(generated_at).date()
-    except Exception:
-        pass
 
-    best_row = None
-    best_delta = timedelta(days=9999)
-    for _, row in df.iterrows():
-        matchup = str(row.get("MATCHUP", "")).upper()
-        if abbrev_a not in matchup or abbrev_b not in matchup:
-            continue
-        gd = _parse_log_date(str(row.get("GAME_DATE", "")))
-        if gd is None:
-            continue
-        if gen_date is not None:
-            delta = abs((gd - gen_date).days)
-            if delta < best_delta.days:
-                best_delta = timedelta(days=delta)
-                best_row = row
-        else:
-            best_row = row
-            break
-    return best_row
+def _normalize_name(name: str) -> str:
+    """Strip Unicode accents so 'Vásquez' matches 'Vasquez'."""
+    return unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
 
 
-def _mark_parlay_outcomes(data: dict) -> int:
+def _mark_parlay_outcomes(data: dict, sport: str | None = None) -> int:
     """
     Set parlay_hit for any parlay whose real (non-historical) legs are all resolved.
     Historical and voided legs are excluded from both resolution check and hit/miss verdict.
     Voided legs (postponed/suspended games) are treated as no-action — parlay resolves on remaining legs.
+    With `sport`, only that sport's open parlays (from the pending index) are checked.
     Returns the number of parlays newly marked.
     """
+    if sport is None:
+        candidates = data["parlays"]
+    else:
+        candidates = [data["parlays"][_INDEX[pid]]
+                      for pid in list(_OPEN.get(sport, ())) if pid in _INDEX]
     marked = 0
-    for parlay in data["parlays"]:
+    for parlay in candidates:
         if parlay["parlay_hit"] is not None:
             continue
         real_legs = [l for l in parlay["legs"] if not _is_historical_leg(l)]
@@ -393,21 +857,48 @@ def _mark_parlay_outcomes(data: dict) -> int:
             outcomes = [l["outcome"] for l in active_legs]
             if all(o is not None for o in outcomes):
                 parlay["parlay_hit"] = bool(all(outcomes))
+                _touch(parlay)
                 marked += 1
         else:
             # All-historical parlay: resolve on legs that have outcome data; ignore None legs
             scored_legs = [l for l in parlay["legs"] if l["outcome"] is not None and l["outcome"] != "void"]
             if scored_legs:
                 parlay["parlay_hit"] = bool(all(l["outcome"] is True for l in scored_legs))
+                _touch(parlay)
                 marked += 1
     return marked
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# NBA resolution
+# NBA / WNBA resolution
 # ─────────────────────────────────────────────────────────────────────────────
 
-# Known nicknames / display-name aliases → official full names used in the NBA API
+# Basketball legs are settled per game, like MLB. The resolver used to pull each
+# player's full-season PlayerGameLog (both season types, 0.6s apart) and hunt for
+# the game in it, so every pass re-downloaded seasons of long-settled games, one
+# or two requests per player. Now each pending leg's date maps to ESPN's
+# scoreboard, every final game on it is fetched once, and its box score is kept
+# under BOX_CACHE_DIR: a final box score never changes, so a game is downloaded at
+# most once however many legs or passes need it. A 10-game night costs one
+# scoreboard plus ten box scores.
+ESPN_BASKETBALL = "https://site.api.espn.com/apis/site/v2/sports/basketball"
+_ESPN_LEAGUES = {"NBA": "nba", "WNBA": "wnba"}
+BOX_CACHE_DIR = Path(__file__).parent / "boxscore_cache"
+BASKETBALL_RESOLVE_WORKERS = 6   # matches http_client.DEFAULT_HOST_LIMIT
+
+# ESPN box score column label -> the _NBA_RESOLVE column it fills
+_ESPN_BOX_COLS = {
+    "PTS": "PTS", "REB": "REB", "AST": "AST", "STL": "STL",
+    "BLK": "BLK", "TO":  "TOV", "3PT": "FG3M",
+}
+
+# ESPN abbreviates some teams differently from nba_api and the books
+_ESPN_ABBR_ALIASES = {
+    "NY": "NYK", "SA": "SAS", "GS": "GSW", "NO": "NOP",
+    "WSH": "WAS", "PHO": "PHX", "UTAH": "UTA",
+}
+
+# Known nicknames / display-name aliases → official full names
 _NBA_PLAYER_ALIASES: dict[str, str] = {
     "deuce mcbride": "miles mcbride",
     "og anunoby":    "o.g. anunoby",
@@ -415,376 +906,349 @@ _NBA_PLAYER_ALIASES: dict[str, str] = {
 }
 
 
-def _get_nba_player_id(name: str):
-    """Resolve a display name (including known nicknames) to an NBA API player ID."""
+def _box_name(name: str) -> str:
+    """Name key for box score lookups: no accents, case, periods or apostrophes."""
+    return " ".join(_normalize_name(name).replace(".", "").replace("'", "").split())
+
+
+def _box_count(raw) -> float:
+    """A box score cell as a number: '23' -> 23, '2-5' (made-attempted) -> 2, '--' -> 0."""
+    try:
+        return float(str(raw).split("-")[0] or 0)
+    except ValueError:
+        return 0.0
+
+
+def _espn_game_state(status: dict) -> str | None:
+    """'void' for a called-off game, 'final' once it is over, None while it is not."""
+    name = str(status.get("name", "")).upper()
+    if "POSTPONED" in name or "SUSPENDED" in name or "CANCEL" in name:
+        return "void"
+    return "final" if status.get("completed") else None
+
+
+def _espn_scoreboard(league: str, day: date) -> list:
+    """[(event id, state, [team dicts])] for one date; [] if the fetch fails."""
     try:
-        from nba_api.stats.static import players as _nba_players
-        # Alias substitution
-        lookup = _NBA_PLAYER_ALIASES.get(name.strip().lower(), name)
-        results = _nba_players.find_players_by_full_name(lookup)
-        if results:
-            return results[0]["id"]
-        # Normalized partial match: ignore accents, check all name parts present
-        norm_lookup = _normalize_name(lookup)
-        for p in _nba_players.get_active_players():
-            if all(part in _normalize_name(p["full_name"]) for part in norm_lookup.split()):
-                return p["id"]
+        resp = http_client.get(f"{ESPN_BASKETBALL}/{league}/scoreboard",
+                               params={"dates": day.strftime("%Y%m%d")}, timeout=10)
+        resp.raise_for_status()
+        events = resp.json().get("events", [])
     except Exception:
+        return []
+    games = []
+    for ev in events:
+        comps = (ev.get("competitions") or [{}])[0].get("competitors", [])
+        games.append((
+            str(ev.get("id", "")),
+            _espn_game_state(ev.get("status", {}).get("type", {})),
+            [c.get("team", {}) for c in comps],
+        ))
+    return games
+
+
+def _espn_box_players(league: str, event_id: str) -> dict | None:
+    """
+    {display name: {stat column: value}} for a final game, read from the disk cache
+    when it has been fetched before. None if the box score isn't posted yet.
+    """
+    path = BOX_CACHE_DIR / league / f"{event_id}.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
         pass
+    try:
+        resp = http_client.get(f"{ESPN_BASKETBALL}/{league}/summary",
+                               params={"event": event_id}, timeout=10)
+        resp.raise_for_status()
+        teams = resp.json().get("boxscore", {}).get("players", [])
+    except Exception:
+        return None
+    players = {}
+    for team in teams:
+        for block in team.get("statistics", []):
+            # Columns are read by label: ESPN has reordered them before.
+            labels = [str(l).upper() for l in block.get("labels") or block.get("names") or []]
+            for a in block.get("athletes", []):
+                name = a.get("athlete", {}).get("displayName", "")
+                stats = a.get("stats") or []
+                if not name or len(stats) != len(labels):
+                    continue   # DNP rows carry no stats
+                players[name] = {_ESPN_BOX_COLS[l]: _box_count(v)
+                                 for l, v in zip(labels, stats) if l in _ESPN_BOX_COLS}
+    if not players:
+        return None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{event_id}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(players), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass   # the cache only saves requests; resolve from the fresh copy regardless
+    return players
+
+
+def _label_matches_teams(game_label: str, teams: list) -> bool:
+    """True if both sides of 'A @ B' name one of the game's teams (abbreviation or name)."""
+    parts = [p.strip().upper() for p in (game_label or "").split("@")]
+    if len(parts) != 2 or not all(parts):
+        return False
+    keys = []
+    for t in teams:
+        abbr = str(t.get("abbreviation", "")).upper()
+        names = [str(t.get(k, "")).upper() for k in ("displayName", "shortDisplayName")]
+        keys.append(({abbr, _ESPN_ABBR_ALIASES.get(abbr, abbr)}, [n for n in names if n]))
+    return all(any(p in abbrs or any(n in p for n in names) for abbrs, names in keys)
+               for p in parts)
+
+
+def _box_row(players: dict, player_name: str) -> dict | None:
+    """A player's row from a {_box_name: row} box score, allowing for known aliases."""
+    keys = [_box_name(player_name)]
+    alias = _NBA_PLAYER_ALIASES.get(player_name.strip().lower())
+    if alias:
+        keys.append(_box_name(alias))
+    for k in keys:
+        if k in players:
+            return players[k]
+    # Every token of the name present (middle names, suffixes such as 'Jr'). Whole
+    # tokens, and only an unambiguous match: a substring test settled a leg for
+    # "Ant Davis" on Anthony Davis's line, and two Jr/Sr box rows match one name.
+    for k in keys:
+        tokens = set(k.split())
+        matches = [row for name, row in players.items() if tokens <= set(name.split())]
+        if len(matches) == 1:
+            return matches[0]
     return None
 
 
 def _stat_from_row(row, spec: tuple):
-    """Extract stat value from a PlayerGameLog row using a spec tuple."""
+    """Extract stat value from a box score row using a spec tuple."""
     kind, cols = spec
     if kind == "single":
         return float(row.get(cols, 0) or 0)
     return sum(float(row.get(c, 0) or 0) for c in cols)
 
 
-def _find_game_in_log(df: pd.DataFrame, target_date: date,
-                      game_label: str = "") -> pd.Series | None:
-    """
-    Find the game log row for target_date, within +/-1 day.
-
-    Picks the *closest* game and prefers an exact date match. Returning the first
-    row inside the tolerance window — the previous behaviour — silently resolved a
-    leg against the following day's game whenever a player played on back-to-back
-    days, because nba_api returns game logs newest-first. When game_label names
-    both teams, only rows whose MATCHUP contains them are eligible, which settles
-    adjacent-day games outright; if that finds nothing (unmappable abbreviation),
-    fall back to date-only matching rather than dropping the leg.
-    """
-    if df.empty or "GAME_DATE" not in df.columns:
-        return None
+def _resolve_basketball_legs(sport: str, save: bool = True) -> int:
+    """Auto-resolve pending NBA or WNBA legs from ESPN box scores. Returns resolved count."""
+    league = _ESPN_LEAGUES[sport]
+    with _LOG_LOCK:
+        data = _load()
+        entries = _claim_pending(sport)
+        if not entries:
+            _mark_parlay_outcomes(data, sport)
+            if save:
+                _save(data)
+            return 0
+
+    leg_days = [_leg_game_days(parlay, leg) for parlay, leg in entries]
+    days = sorted({d for ds in leg_days for d in ds})
+
+    with ThreadPoolExecutor(max_workers=BASKETBALL_RESOLVE_WORKERS) as pool:
+        boards = dict(zip(days, pool.map(lambda d: _espn_scoreboard(league, d), days)))
+        # Only the leg's own game when game_label names it. On a back-to-back the
+        # player is in a box score on both candidate days, and taking the first
+        # one found used to score legs against the following day's game. A label
+        # that can't be mapped falls back to the player's game on those dates.
+        candidates = []
+        for (_, leg), ds in zip(entries, leg_days):
+            games = [g for d in ds for g in boards.get(d, [])]
+            own = [g for g in games if _label_matches_teams(leg.get("game_label", ""), g[2])]
+            candidates.append((own, own or games))
+        final_ids = sorted({eid for _, games in candidates
+                            for eid, state, _ in games if eid and state == "final"})
+        fetched = pool.map(lambda e: _espn_box_players(league, e), final_ids)
+        boxes = {eid: {_box_name(n): row for n, row in players.items()}
+                 for eid, players in zip(final_ids, fetched) if players}
 
-    abbrevs: list[str] = []
-    if game_label:
-        parts = [p.strip() for p in game_label.replace("@", " @ ").split("@")]
-        if len(parts) >= 2:
-            abbrevs = [_team_label_to_abbrev(parts[0]), _team_label_to_abbrev(parts[1])]
-
-    def _scan(require_teams: bool) -> pd.Series | None:
-        best_row, best_delta = None, None
-        for _, row in df.iterrows():
-            if require_teams:
-                matchup = str(row.get("MATCHUP", "")).upper()
-                if any(a not in matchup for a in abbrevs):
-                    continue
-            gd = _parse_log_date(str(row.get("GAME_DATE", "")))
-            if gd is None:
-                continue
-            delta = abs((gd - target_date).days)
-            if delta > 1:
-                continue
-            if best_delta is None or delta < best_delta:
-                best_row, best_delta = row, delta
-                if delta == 0:
+    resolved_count = 0
+    outcomes = [None] * len(entries)
+    for k, ((_, leg), (own, games)) in enumerate(zip(entries, candidates)):
+        spec = _NBA_RESOLVE.get(leg["stat_type"])
+        if spec is None:
+            continue
+        row = None
+        for eid, state, _ in games:
+            if state == "final" and eid in boxes:
+                row = _box_row(boxes[eid], leg["player_name"])
+                if row is not None:
                     break
-        return best_row
-
-    if abbrevs:
-        row = _scan(True)
-        if row is not None:
-            return row
-    return _scan(False)
 
+        if row is None:
+            # Void legs for postponed/suspended/cancelled games — parlay resolves on
+            # remaining legs.
+            if any(state == "void" for _, state, _ in own):
+                outcomes[k] = "void"
+                resolved_count += 1
+            continue
 
-def _fetch_player_gamelog(player_id: int) -> pd.DataFrame:
-    """Fetch game log for current NBA season, trying Playoffs then Regular Season."""
-    from nba_api.stats.endpoints import playergamelog
-    for season_type in ("Playoffs", "Regular Season"):
         try:
-            _time.sleep(0.6)
-            gl = playergamelog.PlayerGameLog(
-                player_id=player_id,
-                season="2025-26",
-                season_type_all_star=season_type,
-            )
-            df = gl.get_data_frames()[0]
-            if not df.empty:
-                return df
+            actual = _stat_from_row(row, spec)
+            outcomes[k] = bool(actual > leg["line_score"])
+            resolved_count += 1
         except Exception:
             continue
-    return pd.DataFrame()
 
+    _settle_legs(sport, entries, outcomes, save)
+    return resolved_count
 
-def resolve_nba_legs() -> int:
-    """Auto-resolve pending NBA legs against NBA API box scores. Returns resolved count."""
-    data = _load()
-    player_legs: dict[str, list] = defaultdict(list)
-    attempted = 0
-    for parlay in data["parlays"]:
-        if parlay["sport"] != "NBA":
-            continue
-        for leg in parlay["legs"]:
-            if leg["outcome"] is not None:
-                continue
-            if _is_historical_leg(leg):
-                continue  # fallback legs have no real game — skip permanently
-            if not _leg_is_resolvable(leg, parlay["generated_at"]):
-                continue
-            # Count the try up front. A leg the API never returns is only ever seen
-            # here, so this is the one place the give-up counter can advance.
-            leg["resolve_attempts"] = int(leg.get("resolve_attempts", 0)) + 1
-            attempted += 1
-            player_legs[leg["player_name"]].append((parlay, leg))
-
-    if not player_legs:
-        _mark_parlay_outcomes(data)
-        _save(data)
-        return 0
-
-    resolved_count = 0
-    for player_name, entries in player_legs.items():
-        pid = _get_nba_player_id(player_name)
-        if not pid:
-            continue
-        df = _fetch_player_gamelog(pid)
-        if df.empty:
-            continue
-        for parlay, leg in entries:
-            spec = _NBA_RESOLVE.get(leg["stat_type"])
-            if spec is None:
-                continue
-            # When start_time is missing, use game_label team matching (wider tolerance)
-            # rather than relying on the generation date which predates the game.
-            if not leg.get("start_time", "") and leg.get("game_label", ""):
-                row = _find_game_by_label(df, leg["game_label"], parlay["generated_at"])
-            else:
-                target = _parse_game_date(leg, parlay["generated_at"])
-                if target is None:
-                    continue
-                row = _find_game_in_log(df, target, leg.get("game_label", ""))
-            if row is None:
-                continue
-            try:
-                actual = _stat_from_row(row, spec)
-                leg["outcome"] = bool(actual > leg["line_score"])
-                resolved_count += 1
-            except Exception:
-                continue
 
-    marked = _mark_parlay_outcomes(data)
-    if resolved_count or marked or attempted:
-        _save(data)   # attempt counters must persist, or a dead leg is retried forever
-    return resolved_count
+def resolve_nba_legs(save: bool = True) -> int:
+    """Auto-resolve pending NBA legs against ESPN box scores. Returns resolved count."""
+    return _resolve_basketball_legs("NBA", save)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # MLB resolution
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _resolve_mlb_legs() -> int:
-    """Auto-resolve pending MLB legs via MLB Stats API. Returns resolved count."""
-    try:
-        import statsapi  # type: ignore
-    except ImportError:
-        return 0
-
-    data = _load()
-    player_legs: dict[str, list] = defaultdict(list)
-    attempted = 0
-    for parlay in data["parlays"]:
-        if parlay["sport"] != "MLB":
-            continue
-        for leg in parlay["legs"]:
-            if leg["outcome"] is not None:
-                continue
-            if _is_historical_leg(leg):
-                continue
-            if not _leg_is_resolvable(leg, parlay["generated_at"]):
-                continue
-            # Count the try up front. A leg the API never returns is only ever seen
-            # here, so this is the one place the give-up counter can advance.
-            leg["resolve_attempts"] = int(leg.get("resolve_attempts", 0)) + 1
-            attempted += 1
-            player_legs[leg["player_name"]].append((parlay, leg))
-
-    if not player_legs:
-        _mark_parlay_outcomes(data)
-        _save(data)
-        return 0
-
-    resolved_count = 0
-    for player_name, entries in player_legs.items():
-        norm_name = _normalize_name(player_name)
-        dates_needed: set[str] = set()
-        for parlay, leg in entries:
-            d = _parse_game_date(leg, parlay["generated_at"])
-            if d:
-                dates_needed.add(d.strftime("%m/%d/%Y"))
-
-        for date_str in dates_needed:
-            try:
-                _time.sleep(0.4)
-                schedule = statsapi.schedule(date=date_str, sportId=1)
-            except Exception:
-                continue
-
-            for game_info in schedule:
-                game_pk = game_info.get("game_id")
-                if not game_pk:
-                    continue
-                game_status = (game_info.get("status") or "").lower()
-                # Void legs for postponed/suspended/cancelled games — parlay resolves on remaining legs
-                if "postponed" in game_status or "suspended" in game_status or "cancelled" in game_status:
-                    away_name = (game_info.get("away_name") or "").lower()
-                    home_name = (game_info.get("home_name") or "").lower()
-                    for parlay, leg in entries:
-                        if leg["outcome"] is not None:
-                            continue
-                        gl = (leg.get("game_label") or "").lower()
-                        if any(t in gl for t in [away_name[:3], home_name[:3]]):
-                            leg["outcome"] = "void"
-                            resolved_count += 1
-                    continue
-                # Only resolve Final games — skip in-progress/scheduled
-                if game_status and "final" not in game_status and "completed" not in game_status and "over" not in game_status:
-                    continue
-                try:
-                    _time.sleep(0.4)
-                    box = statsapi.boxscore_data(game_pk)
-                except Exception:
-                    continue
-
-                for side in ("home", "away"):
-                    team_data = box.get(side, {})
-                    for player_data in team_data.get("players", {}).values():
-                        full_name = player_data.get("person", {}).get("fullName", "")
-                        # Normalize both sides to handle accented characters (e.g. Vásquez)
-                        if norm_name not in _normalize_name(full_name):
-                            continue
-                        stats = player_data.get("stats", {})
-                        bstats = stats.get("batting", {})
-                        pstats = stats.get("pitching", {})
-                        for parlay, leg in entries:
-                            if leg["outcome"] is not None:
-                                continue
-                            stat_type = leg["stat_type"]
-                            is_pitching = stat_type in _MLB_PITCHER_TYPES
-                            if is_pitching:
-                                col = _MLB_PITCHING_RESOLVE.get(stat_type)
-                                source = pstats
-                                derived = None
-                            else:
-                                col = _MLB_BATTING_RESOLVE.get(stat_type)
-                                source = bstats
-                                # Composites (Total Bases, Singles, Hits+Runs+RBIs) have no
-                                # single boxscore key and must be computed from the raw stats.
-                                derived = _mlb_derived_batting(stat_type, bstats)
-                            if derived is None and (col is None or source is None):
-                                continue
-                            try:
-                                # Empty dict means player didn't appear; treat stat as 0
-                                actual = (derived if derived is not None
-                                          else float(source.get(col, 0) or 0))
-                                leg["outcome"] = bool(actual > leg["line_score"])
-                                resolved_count += 1
-                            except Exception:
-                                continue
-
-    marked = _mark_parlay_outcomes(data)
-    if resolved_count or marked or attempted:
-        _save(data)   # attempt counters must persist, or a dead leg is retried forever
-    return resolved_count
-
-
-def _resolve_wnba_legs() -> int:
-    """Auto-resolve pending WNBA legs via nba_api PlayerGameLog (league 10). Returns resolved count."""
-    data = _load()
-    player_legs: dict[str, list] = defaultdict(list)
-    attempted = 0
-    for parlay in data["parlays"]:
-        if parlay["sport"] != "WNBA":
-            continue
-        for leg in parlay["legs"]:
-            if leg["outcome"] is not None:
-                continue
-            if _is_historical_leg(leg):
-                continue
-            if not _leg_is_resolvable(leg, parlay["generated_at"]):
-                continue
-            # Count the try up front. A leg the API never returns is only ever seen
-            # here, so this is the one place the give-up counter can advance.
-            leg["resolve_attempts"] = int(leg.get("resolve_attempts", 0)) + 1
-            attempted += 1
-            player_legs[leg["player_name"]].append((parlay, leg))
-
-    if not player_legs:
-        _mark_parlay_outcomes(data)
-        _save(data)
-        return 0
+# The resolver works a whole slate at a time. It used to walk players, and for
+# each player and date it pulled that date's schedule and every final boxscore on
+# it — a 40-leg slate downloaded the same dozen boxscores forty times, 0.4s apart.
+# Now every (date, game) the pending legs could need is collected up front, each
+# schedule and each final boxscore is fetched exactly once (concurrently, under
+# http_client's statsapi host cap and 429 backoff), each boxscore becomes a
+# name -> stats index, and every leg is settled against those indexes.
+MLB_STATS_BASE = "https://statsapi.mlb.com/api/v1"
+MLB_RESOLVE_WORKERS = 8       # matches http_client.HOST_LIMITS["statsapi.mlb.com"]
+
+
+def _mlb_game_state(status: str) -> str | None:
+    """'void' for a called-off game, 'final' once it is over, None while it is not."""
+    status = (status or "").lower()
+    if "postponed" in status or "suspended" in status or "cancelled" in status:
+        return "void"
+    if not status or "final" in status or "completed" in status or "over" in status:
+        return "final"
+    return None
 
-    from nba_api.stats.endpoints import commonallplayers, playergamelog as _pgl  # type: ignore
 
-    # Build WNBA name→id map
+def _mlb_schedule(day: date) -> list:
+    """[(gamePk, state, away name, home name)] for one date; [] if the fetch fails."""
+    try:
+        resp = http_client.get(f"{MLB_STATS_BASE}/schedule",
+                               params={"sportId": 1, "date": day.isoformat()}, timeout=10)
+        resp.raise_for_status()
+        dates = resp.json().get("dates", [])
+    except Exception:
+        return []
+    games = []
+    for d in dates:
+        for g in d.get("games", []):
+            teams = g.get("teams", {})
+            games.append((
+                g.get("gamePk"),
+                _mlb_game_state(g.get("status", {}).get("detailedState", "")),
+                teams.get("away", {}).get("team", {}).get("name", ""),
+                teams.get("home", {}).get("team", {}).get("name", ""),
+            ))
+    return games
+
+
+def _mlb_box_players(game_pk: int) -> dict | None:
+    """{normalized full name: (batting, pitching)} for everyone in a boxscore."""
     try:
-        _time.sleep(0.5)
-        wnba_df = commonallplayers.CommonAllPlayers(
-            is_only_current_season=0, league_id="10"
-        ).get_data_frames()[0]
-        wnba_id_map = {row["DISPLAY_FIRST_LAST"].lower(): int(row["PERSON_ID"])
-                       for _, row in wnba_df.iterrows()}
+        resp = http_client.get(f"{MLB_STATS_BASE}/game/{game_pk}/boxscore", timeout=10)
+        resp.raise_for_status()
+        teams = resp.json().get("teams", {})
     except Exception:
-        wnba_id_map = {}
+        return None
+    players = {}
+    for side in ("home", "away"):
+        for pdata in teams.get(side, {}).get("players", {}).values():
+            # Normalize to handle accented characters (e.g. Vásquez)
+            name = _normalize_name(pdata.get("person", {}).get("fullName", ""))
+            if name:
+                stats = pdata.get("stats", {})
+                players[name] = (stats.get("batting", {}), stats.get("pitching", {}))
+    return players
+
+
+def _mlb_leg_actual(stat_type: str, bstats: dict, pstats: dict) -> float | None:
+    """A leg's stat from one player's boxscore lines; None if the stat can't be named."""
+    if stat_type in _MLB_PITCHER_TYPES:
+        col, source, derived = _MLB_PITCHING_RESOLVE.get(stat_type), pstats, None
+    else:
+        col, source = _MLB_BATTING_RESOLVE.get(stat_type), bstats
+        # Composites (Total Bases, Singles, Hits+Runs+RBIs) have no single boxscore
+        # key and must be computed from the raw stats.
+        derived = _mlb_derived_batting(stat_type, bstats)
+    if derived is not None:
+        return derived
+    if col is None or source is None:
+        return None
+    # Empty dict means player didn't appear; treat stat as 0
+    return float(source.get(col, 0) or 0)
+
+
+def _resolve_mlb_legs(save: bool = True) -> int:
+    """Auto-resolve pending MLB legs via MLB Stats API. Returns resolved count."""
+    with _LOG_LOCK:
+        data = _load()
+        entries = _claim_pending("MLB")
+        if not entries:
+            _mark_parlay_outcomes(data, "MLB")
+            if save:
+                _save(data)
+            return 0
+
+    leg_days = [_leg_game_days(parlay, leg) for parlay, leg in entries]
+    days = sorted({d for ds in leg_days for d in ds})
+
+    with ThreadPoolExecutor(max_workers=MLB_RESOLVE_WORKERS) as pool:
+        schedules = dict(zip(days, pool.map(_mlb_schedule, days)))
+        final_pks = sorted({pk for games in schedules.values()
+                            for pk, state, _, _ in games if pk and state == "final"})
+        boxes = dict(zip(final_pks, pool.map(_mlb_box_players, final_pks)))
 
     resolved_count = 0
-    for player_name, entries in player_legs.items():
-        pid = wnba_id_map.get(player_name.strip().lower())
-        if not pid:
-            # Try normalized name match
-            norm = _normalize_name(player_name)
-            for k, v in wnba_id_map.items():
-                if _normalize_name(k) == norm:
-                    pid = v
+    outcomes = [None] * len(entries)
+    for k, ((parlay, leg), ds) in enumerate(zip(entries, leg_days)):
+        norm_name = _normalize_name(leg["player_name"])
+        games = [g for d in ds for g in schedules.get(d, [])]
+        stats = None
+        for pk, state, _, _ in games:
+            players = boxes.get(pk) if state == "final" else None
+            if not players:
+                continue
+            stats = players.get(norm_name) or next(
+                (v for k, v in players.items() if norm_name in k), None)
+            if stats is not None:
+                break
+
+        if stats is None:
+            # Void legs for postponed/suspended/cancelled games — parlay resolves on
+            # remaining legs.
+            gl = (leg.get("game_label") or "").lower()
+            for _, state, away_name, home_name in games:
+                if state != "void":
+                    continue
+                tags = [t.lower()[:3] for t in (away_name, home_name) if t]
+                if any(t in gl for t in tags):
+                    outcomes[k] = "void"
+                    resolved_count += 1
                     break
-        if not pid:
             continue
 
-        # Fetch current WNBA season game log (try newest season first)
-        df = pd.DataFrame()
-        for season in ("2026", "2025"):
-            try:
-                _time.sleep(0.6)
-                logs = _pgl.PlayerGameLog(
-                    player_id=pid, season=season,
-                    season_type_all_star="Regular Season",
-                    league_id_nullable="10", timeout=15,
-                ).get_data_frames()[0]
-                if not logs.empty:
-                    df = logs if df.empty else pd.concat([df, logs], ignore_index=True)
-            except Exception:
-                continue
-        if df.empty:
+        actual = _mlb_leg_actual(leg["stat_type"], *stats)
+        if actual is None:
+            continue
+        try:
+            outcomes[k] = bool(actual > leg["line_score"])
+            resolved_count += 1
+        except Exception:
             continue
 
-        for parlay, leg in entries:
-            spec = _NBA_RESOLVE.get(leg["stat_type"])
-            if spec is None:
-                continue
-            if not leg.get("start_time", "") and leg.get("game_label", ""):
-                row = _find_game_by_label(df, leg["game_label"], parlay["generated_at"])
-            else:
-                target = _parse_game_date(leg, parlay["generated_at"])
-                if target is None:
-                    continue
-                row = _find_game_in_log(df, target, leg.get("game_label", ""))
-            if row is None:
-                continue
-            try:
-                actual = _stat_from_row(row, spec)
-                leg["outcome"] = bool(actual > leg["line_score"])
-                resolved_count += 1
-            except Exception:
-                continue
-
-    marked = _mark_parlay_outcomes(data)
-    if resolved_count or marked or attempted:
-        _save(data)   # attempt counters must persist, or a dead leg is retried forever
+    _settle_legs("MLB", entries, outcomes, save)
     return resolved_count
 
 
+def _resolve_wnba_legs(save: bool = True) -> int:
+    """Auto-resolve pending WNBA legs against ESPN box scores. Returns resolved count."""
+    return _resolve_basketball_legs("WNBA", save)
+
+
 def get_abandoned_legs(sport: str | None = None) -> list:
     """
     Legs the resolver has given up on, grouped by stat type. Silently dropping them is
@@ -793,15 +1257,22 @@ def get_abandoned_legs(sport: str | None = None) -> list:
     """
     data = _load()
     counts: dict = defaultdict(lambda: {"n": 0, "players": set()})
-    for parlay in data["parlays"]:
-        if sport and parlay.get("sport") != sport:
-            continue
-        for leg in parlay["legs"]:
-            if leg["outcome"] is not None or not _leg_is_abandoned(leg):
+    for sp in ([sport] if sport else list(_PENDING)):
+        for refs in _PENDING.get(sp, {}).values():
+            for pid, i in refs:
+                leg = data["parlays"][_INDEX[pid]]["legs"][i]
+                if leg["outcome"] is not None or not _leg_is_abandoned(leg):
+                    continue
+                key = (sp, leg["stat_type"])
+                counts[key]["n"] += 1
+                counts[key]["players"].add(leg["player_name"])
+    for summary in _archive_manifest().values():
+        for sp, s in summary["sports"].items():
+            if sport and sp != sport:
                 continue
-            key = (parlay.get("sport"), leg["stat_type"])
-            counts[key]["n"] += 1
-            counts[key]["players"].add(leg["player_name"])
+            for stat, players in s["abandoned"].items():
+                counts[(sp, stat)]["n"] += sum(players.values())
+                counts[(sp, stat)]["players"].update(players)
     return sorted(
         ({"sport": s, "stat_type": st, "legs": d["n"], "players": len(d["players"])}
          for (s, st), d in counts.items()),
@@ -815,8 +1286,12 @@ def reset_outcomes(sport: str) -> int:
 
     Needed after a resolver fix: outcomes are persisted, so a bug that scored legs
     against the wrong game stays baked into parlay_log.json (and into calibration)
-    until the affected legs are re-run. Returns the number of legs cleared.
+    until the affected legs are re-run. Returns the number of legs cleared. Archived
+    weeks with parlays of the sport come back into the hot log to be re-resolved.
     """
+    archived = [w for w, s in _archive_manifest().items() if sport in s["sports"]]
+    if archived:
+        _unarchive(archived)
     data = _load()
     cleared = 0
     for parlay in data["parlays"]:
@@ -831,17 +1306,49 @@ def reset_outcomes(sport: str) -> int:
             # of re-running after fixing the resolver.
             leg.pop("resolve_attempts", None)
         parlay["parlay_hit"] = None
+        _touch(parlay)
     if cleared:
         _save(data)
     return cleared
 
 
-def resolve_all_legs() -> dict:
-    """Resolve NBA, MLB, and WNBA pending legs. Returns {nba: count, mlb: count, wnba: count}."""
-    nba  = resolve_nba_legs()
-    mlb  = _resolve_mlb_legs()
-    wnba = _resolve_wnba_legs()
-    return {"nba": nba, "mlb": mlb, "wnba": wnba}
+def resolve_all_legs(timings: dict | None = None) -> dict:
+    """
+    Resolve NBA, MLB, and WNBA pending legs. Returns {nba: count, mlb: count, wnba: count}.
+
+    The three sports hit different hosts (ESPN, the MLB Stats API) whose pacing
+    http_client enforces per host, so they run concurrently and the pass takes
+    about as long as the slowest sport. Each resolver saves its own results as it
+    finishes (one journal append, under _LOG_LOCK): held unsaved in the cache, a
+    finished sport's outcomes were dropped by the full reload that follows another
+    process compacting the journal or archiving a week while the others still ran.
+
+    Pass a dict as `timings` to have it filled with each step's wall seconds: one
+    entry per resolver (same keys as the counts, save included), then snapshot and
+    archive.
+    """
+    timings = {} if timings is None else timings
+
+    def timed(key, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[key] = round(time.perf_counter() - start, 3)
+
+    resolvers = {"nba": resolve_nba_legs, "mlb": _resolve_mlb_legs, "wnba": _resolve_wnba_legs}
+    with ThreadPoolExecutor(max_workers=len(resolvers)) as pool:
+        futures = {key: pool.submit(timed, key, fn) for key, fn in resolvers.items()}
+    counts = {key: f.result() for key, f in futures.items()}   # re-raises a failure
+    try:
+        timed("snapshot", snapshot_calibration)
+    except OSError:
+        pass   # history is a convenience; never fail a resolve over it
+    try:
+        timed("archive", archive_settled_weeks)
+    except OSError:
+        pass   # the weeks just stay in the hot log until the next pass
+    return counts
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -868,6 +1375,7 @@ def _prop_key(leg: dict) -> tuple:
     )
 
 
+@lru_cache(maxsize=None)
 def _week_ordinal(iso_week: str) -> int | None:
     """Convert '2026-W27' to a comparable weekly ordinal (Monday's date // 7)."""
     try:
@@ -878,6 +1386,364 @@ def _week_ordinal(iso_week: str) -> int | None:
         return None
 
 
+# ── Running calibration sums ─────────────────────────────────────────────────
+# Calibration is read on every build, and recomputing it meant re-deriving every
+# resolved leg's week and prop key and re-summing them all. Instead, each parlay's
+# contribution is folded into running sums as it is seated in the log (load,
+# journal replay, save) and backed out when it changes, so get_calibration and
+# get_parlay_calibration read O(stats) numbers. The definitions are unchanged:
+# legs are deduped to the first-seen (lowest log position) resolved leg of each
+# prop, weighted 0.5 ** (weeks_ago / CAL_HALF_LIFE_WEEKS) against the newest week
+# in scope. Scopes are None (every sport blended) and each sport.
+_LEG_CAL: dict = {}      # scope -> _DecayedSums of unique resolved props, by stat_type
+_PARLAY_CAL: dict = {}   # scope -> _DecayedSums of graded parlays, by leg count
+_CAL_PROPS: dict = {}    # scope -> prop key -> [counted ref, {(position, leg index): row}]
+_CAL_STATE: dict = {}    # parlay id -> the contribution currently folded in for it
+
+
+class _DecayedSums:
+    """
+    Per-group (predicted, actual, weight) sums, recency-weighted against the newest
+    week counted in. The decayed sums are held relative to that week, so when it moves
+    they are rescaled once by 0.5 ** (shift / CAL_HALF_LIFE_WEEKS) rather than rows
+    being re-weighted. Rows with no week keep weight 1 in separate, undecayed sums.
+    """
+
+    def __init__(self):
+        self.weeks: Counter = Counter()   # rows per week ordinal — what `latest` is the max of
+        self.latest: int | None = None
+        self.decayed: dict = {}
+        self.flat: dict = {}
+        self.rows: Counter = Counter()
+
+    def week(self, wk: int | None, delta: int) -> None:
+        """Count a row into (delta=1) or out of (delta=-1) the weeks that set `latest`."""
+        if wk is None:
+            return
+        self.weeks[wk] += delta
+        if self.weeks[wk] <= 0:
+            del self.weeks[wk]
+        if delta > 0:
+            latest = wk if self.latest is None else max(self.latest, wk)
+        elif wk == self.latest:
+            latest = max(self.weeks) if self.weeks else None
+        else:
+            return
+        if latest != self.latest and self.latest is not None and latest is not None:
+            scale = 0.5 ** ((latest - self.latest) / CAL_HALF_LIFE_WEEKS)
+            for sums in self.decayed.values():
+                sums[0] *= scale
+                sums[1] *= scale
+                sums[2] *= scale
+        self.latest = latest
+
+    def add(self, group, wk: int | None, predicted: float, actual: float, sign: int = 1,
+            n: int = 1) -> None:
+        """Count n rows of one week in or out; predicted/actual are their sums."""
+        if wk is None or self.latest is None:
+            bucket, w = self.flat, 1.0
+        else:
+            bucket = self.decayed
+            w = 0.5 ** (max(0, self.latest - wk) / CAL_HALF_LIFE_WEEKS)
+        sums = bucket.setdefault(group, [0.0, 0.0, 0.0])
+        sums[0] += sign * w * predicted
+        sums[1] += sign * w * actual
+        sums[2] += sign * w * n
+        self.rows[group] += sign * n
+        if self.rows[group] <= 0:
+            # Drop the group outright rather than leave float residue behind.
+            del self.rows[group]
+            self.decayed.pop(group, None)
+            self.flat.pop(group, None)
+
+    def totals(self) -> dict:
+        """{group: (predicted, actual, weight)} with decayed and undated rows combined."""
+        out = {}
+        for group in self.rows:
+            d = self.decayed.get(group, (0.0, 0.0, 0.0))
+            f = self.flat.get(group, (0.0, 0.0, 0.0))
+            out[group] = (d[0] + f[0], d[1] + f[1], d[2] + f[2])
+        return out
+
+
+def _cal_state(parlay: dict) -> tuple:
+    """What a parlay contributes to calibration: (sport, week, graded, resolved legs)."""
+    hit = parlay.get("parlay_hit")
+    graded = None
+    # Only grade parlay predictions this model actually made. Every parlay resolved
+    # before the de-vig fix was predicted by a model that never saw the market; its
+    # overconfidence is not this model's overconfidence, and applying it on top of
+    # corrected legs deflates twice — which is how the board came to report that
+    # every parlay on it loses.
+    if hit is not None and parlay.get("model_epoch") == _MODEL_EPOCH:
+        graded = (len(parlay.get("legs", [])), float(parlay["predicted_prob"]),
+                  1.0 if hit else 0.0)
+    legs = tuple(
+        (i, _prop_key_str(leg), leg["stat_type"], float(leg["predicted_hit_rate"]),
+         1.0 if leg["outcome"] is True else 0.0)
+        for i, leg in enumerate(parlay.get("legs", []))
+        if leg.get("outcome") is not None and leg.get("outcome") != "void"
+    )
+    return parlay.get("sport"), _week_ordinal(parlay.get("iso_week") or ""), graded, legs
+
+
+def _cal_prop(acc: _DecayedSums, props: dict, key: str, ref: tuple, row, sign: int) -> None:
+    """Add/remove one resolved leg of a prop; only its lowest-position leg is counted."""
+    entry = props.get(key)
+    if entry is None:
+        entry = props[key] = [None, {}]
+    before, legs = entry
+    before_row = legs.get(before)
+    if sign > 0:
+        legs[ref] = row
+        after = ref if before is None or ref < before else before
+    else:
+        legs.pop(ref, None)
+        after = before if ref != before else (min(legs) if legs else None)
+    if after != before:
+        if before is not None:
+            stat, wk, predicted, actual = before_row
+            acc.add(stat, wk, predicted, actual, -1)
+        if after is not None:
+            stat, wk, predicted, actual = legs[after]
+            acc.add(stat, wk, predicted, actual, 1)
+        entry[0] = after
+    if not legs:
+        del props[key]
+
+
+def _cal_apply(pos: int, state: tuple, sign: int) -> None:
+    sport, wk, graded, legs = state
+    for scope in ((None,) if sport is None else (None, sport)):
+        if scope not in _LEG_CAL:
+            _LEG_CAL[scope] = _DecayedSums()
+            _PARLAY_CAL[scope] = _DecayedSums()
+        acc = _LEG_CAL[scope]
+        props = _CAL_PROPS.setdefault(scope, {})
+        # Every parlay in scope — resolved or not — moves the newest week, and the
+        # week has to be counted in before its legs and out after them.
+        if sign > 0:
+            acc.week(wk, 1)
+        for i, key, stat, predicted, actual in legs:
+            _cal_prop(acc, props, key, (pos, i), (stat, wk, predicted, actual), sign)
+        if sign < 0:
+            acc.week(wk, -1)
+        if graded:
+            n_legs, predicted, actual = graded
+            pacc = _PARLAY_CAL[scope]
+            if sign > 0:
+                pacc.week(wk, 1)
+            pacc.add(n_legs, wk, predicted, actual, sign)
+            if sign < 0:
+                pacc.week(wk, -1)
+
+
+def _index_calibration(parlay: dict) -> None:
+    """Swap a parlay's old contribution to the running sums for its current one."""
+    pid = parlay["id"]
+    state = _cal_state(parlay)
+    old = _CAL_STATE.get(pid)
+    if state == old:
+        return
+    pos = _INDEX[pid]
+    if old is not None:
+        _cal_apply(pos, old, -1)
+    _cal_apply(pos, state, 1)
+    _CAL_STATE[pid] = state
+
+
+# ── Columnar views of the log ────────────────────────────────────────────────
+# Every report used to walk data["parlays"] in nested loops and rebuild its own
+# _prop_key dedupe set; the Accuracy tab runs about ten of them per rerun. The
+# log is now flattened once per change (keyed on _LOG_VERSION) into a parlay
+# table and a leg table, with the prop key and week ordinal precomputed, and the
+# reports are groupbys over those (calibration reads the running sums above). Row order is log order
+# (pos, then leg_idx), so drop_duplicates(keep="first") is exactly the old
+# first-seen prop dedupe. The hot log's frames are rebuilt per change; archived
+# weeks are framed once and put in front of them (see the archive section).
+_FRAMES: dict = {"version": None, "hot": None, "archive": None, "all": None, "props": {}}
+
+
+def _prop_key_str(leg: dict) -> str:
+    """_prop_key as a flat string, so it can be a hashable column."""
+    name, stat, line, game = _prop_key(leg)
+    if isinstance(line, (int, float)) and not isinstance(line, bool):
+        line = float(line)
+    return f"{name}\x1f{stat}\x1f{line!r}\x1f{game}"
+
+
+def _parlay_frames(log: list) -> tuple:
+    """(parlays, legs) DataFrames for a list of parlays; pos is the list position."""
+    p_cols = defaultdict(list)
+    l_cols = defaultdict(list)
+    for pos, p in enumerate(log):
+        week = p.get("iso_week")
+        hit = p.get("parlay_hit")
+        legs = p.get("legs", [])
+        p_cols["pos"].append(pos)
+        p_cols["sport"].append(p.get("sport"))
+        p_cols["sportsbook"].append(p.get("sportsbook", "Unknown"))
+        p_cols["kind"].append(p.get("kind"))
+        p_cols["model_epoch"].append(p.get("model_epoch"))
+        p_cols["generated_at"].append(p.get("generated_at", ""))
+        p_cols["iso_week"].append(week)
+        p_cols["week_ord"].append(_week_ordinal(week or ""))
+        p_cols["predicted_prob"].append(p.get("predicted_prob"))
+        p_cols["payout"].append(float(p.get("payout") or 2.0))
+        p_cols["resolved"].append(hit is not None)
+        p_cols["hit"].append(bool(hit))
+        p_cols["n_legs"].append(len(legs))
+        for i, leg in enumerate(legs):
+            outcome = leg.get("outcome")
+            l_cols["pos"].append(pos)
+            l_cols["leg_idx"].append(i)
+            l_cols["player_name"].append(leg.get("player_name"))
+            l_cols["stat_type"].append(leg.get("stat_type"))
+            l_cols["line_score"].append(leg.get("line_score"))
+            l_cols["predicted_hit_rate"].append(leg.get("predicted_hit_rate"))
+            l_cols["implied"].append(_leg_implied(leg))
+            # "void" is a truthy string, so it has to be screened out explicitly or a
+            # postponed game scores as a hit; only a literal True counts as a hit.
+            l_cols["resolved"].append(outcome is not None and outcome != "void")
+            l_cols["hit"].append(1.0 if outcome is True else 0.0)
+            l_cols["prop_key"].append(_prop_key_str(leg))
+
+    parlays = pd.DataFrame(p_cols, columns=[
+        "pos", "sport", "sportsbook", "kind", "model_epoch", "generated_at", "iso_week",
+        "week_ord", "predicted_prob", "payout", "resolved", "hit", "n_legs"])
+    parlays["week_ord"] = parlays["week_ord"].astype("float64")
+    parlays["predicted_prob"] = parlays["predicted_prob"].astype("float64")
+
+    legs = pd.DataFrame(l_cols, columns=[
+        "pos", "leg_idx", "player_name", "stat_type", "line_score", "predicted_hit_rate",
+        "implied", "resolved", "hit", "prop_key"])
+    legs["predicted_hit_rate"] = legs["predicted_hit_rate"].astype("float64")
+    legs = legs.join(parlays.set_index("pos")[
+        ["sport", "iso_week", "generated_at", "resolved"]]
+        .rename(columns={"resolved": "parlay_resolved"}), on="pos")
+    return parlays, legs
+
+
+def _hot_frames() -> tuple:
+    """Frames of the hot log alone, rebuilt only when it changed."""
+    data = _load()
+    if _FRAMES["version"] != _LOG_VERSION or _FRAMES["hot"] is None:
+        _FRAMES.update(version=_LOG_VERSION, hot=_parlay_frames(data["parlays"]),
+                       all=None, props={})
+    return _FRAMES["hot"]
+
+
+def _frames(week: str | None = None) -> tuple:
+    """
+    (parlays, legs) DataFrames for the whole log, archive included. With `week`, a
+    view that holds at least that week's rows: its partition alone when archived,
+    the hot log otherwise — callers still filter on iso_week.
+    """
+    hot = _hot_frames()
+    weeks = _archive_manifest()
+    if week is not None:
+        if week not in weeks:
+            return hot
+        cache = _ARCHIVE["frames"]
+        if week not in cache:
+            cache[week] = _parlay_frames(_archive_parlays(week))
+        return cache[week]
+    if not weeks:
+        return hot
+    if _FRAMES["archive"] is None or _FRAMES["archive"][0] != _ARCHIVE["version"]:
+        log = [p for w in sorted(weeks) for p in _archive_parlays(w)]
+        _FRAMES.update(archive=(_ARCHIVE["version"], _parlay_frames(log)), all=None, props={})
+    if _FRAMES["all"] is None:
+        (a_parlays, a_legs), (h_parlays, h_legs) = _FRAMES["archive"][1], hot
+        if h_parlays.empty:
+            _FRAMES["all"] = (a_parlays, a_legs)
+        else:
+            n = len(a_parlays)
+            _FRAMES["all"] = (
+                pd.concat([a_parlays, h_parlays.assign(pos=h_parlays["pos"] + n)],
+                          ignore_index=True),
+                pd.concat([a_legs, h_legs.assign(pos=h_legs["pos"] + n)],
+                          ignore_index=True),
+            )
+    return _FRAMES["all"]
+
+
+def _sport_rows(df: pd.DataFrame, sport: str | None) -> pd.DataFrame:
+    return df[df["sport"] == sport] if sport else df
+
+
+def _unique_props(legs: pd.DataFrame) -> pd.DataFrame:
+    """Resolved legs, one row per prop — the first time the log saw it. The builder
+    reuses a prop across many parlays; counting rows would measure how often it was
+    bet, not how often the model was right about it."""
+    return legs[legs["resolved"]].drop_duplicates("prop_key", keep="first")
+
+
+def _props(sport: str | None = None, settled_parlays: bool = False) -> pd.DataFrame:
+    """_unique_props over the whole log (or one sport), memoised with the frames.
+    settled_parlays restricts it to legs of parlays that have themselves resolved."""
+    _, legs = _frames()
+    cache = _FRAMES["props"]
+    key = (sport, settled_parlays)
+    if key not in cache:
+        legs = _sport_rows(legs, sport)
+        if settled_parlays:
+            legs = legs[legs["parlay_resolved"]]
+        cache[key] = _unique_props(legs)
+    return cache[key]
+
+
+def _tally(keys, sort: bool = True, **cols) -> dict:
+    """
+    {group: {"n": rows, col: sum, ...}} in a single grouped pass. Every report here is
+    a row count plus a few sums (means are sum / n), and one plain .sum() is several
+    times cheaper than a named .agg() over the same groups.
+    """
+    df = pd.DataFrame(cols)
+    df["n"] = 1
+    return df.groupby(keys, sort=sort, dropna=False).sum().to_dict("index")
+
+
+# ── Report memo ──────────────────────────────────────────────────────────────
+# Streamlit reruns the whole Accuracy tab on every widget touch, and flipping the
+# week selector or the sport used to recompute every report even though the log
+# had not moved. Results are memoised on (report, bound args, day) for as long as
+# _LOG_VERSION stays put; any _save, journal catch-up or snapshot reload bumps it
+# and the memo empties on the next call. Module-level, so every session in the
+# Streamlit process shares it. The day is in the key because a few reports read
+# the clock (the current week, the drift window). The memo keeps its own copy and
+# hands each caller a fresh one: callers add columns and sort in place, and a
+# shared object would carry one session's edits into every other session.
+_REPORTS: dict = {"version": None, "results": {}}
+_REPORTS_LOCK = threading.Lock()
+
+
+def _report_cache(fn):
+    sig = inspect.signature(fn)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        _load()                       # catch up on other processes' writes first
+        version = _LOG_VERSION
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (fn.__name__, tuple(bound.arguments.items()), date.today())
+        with _REPORTS_LOCK:
+            if _REPORTS["version"] != version:
+                _REPORTS["version"] = version
+                _REPORTS["results"] = {}
+            if key in _REPORTS["results"]:
+                return copy.deepcopy(_REPORTS["results"][key])
+        value = fn(*args, **kwargs)
+        with _REPORTS_LOCK:
+            if _REPORTS["version"] == version == _LOG_VERSION:
+                _REPORTS["results"][key] = copy.deepcopy(value)
+        return value
+
+    return wrapper
+
+
+@_report_cache
 def get_calibration(sport: str | None = None) -> dict:
     """
     Return per-stat calibration factors from resolved legs, recency-weighted
@@ -890,45 +1756,17 @@ def get_calibration(sport: str | None = None) -> dict:
     factor > 1.0 → model underestimates; < 1.0 → overestimates.
     Only populated once a stat's weighted sample size reaches CAL_MIN_SAMPLES.
     """
-    data = _load()
-    parlays = [p for p in data["parlays"] if not sport or p.get("sport") == sport]
-    if not parlays:
+    _load()
+    acc = _LEG_CAL.get(sport or None)
+    if acc is None:
         return {}
 
-    week_ords = [_week_ordinal(p["iso_week"]) for p in parlays if p.get("iso_week")]
-    week_ords = [w for w in week_ords if w is not None]
-    latest_ord = max(week_ords) if week_ords else None
-
-    predicted: dict[str, float] = defaultdict(float)
-    actual: dict[str, float] = defaultdict(float)
-    weight_sum: dict[str, float] = defaultdict(float)
-    seen_props: set = set()
-
-    for parlay in parlays:
-        w = 1.0
-        if latest_ord is not None:
-            wk_ord = _week_ordinal(parlay.get("iso_week", ""))
-            if wk_ord is not None:
-                weeks_ago = max(0, latest_ord - wk_ord)
-                w = 0.5 ** (weeks_ago / CAL_HALF_LIFE_WEEKS)
-        for leg in parlay["legs"]:
-            if leg["outcome"] is None or leg["outcome"] == "void":
-                continue
-            key = _prop_key(leg)
-            if key in seen_props:
-                continue  # same prop, reused in another parlay — one observation
-            seen_props.add(key)
-            stat = leg["stat_type"]
-            predicted[stat] += w * leg["predicted_hit_rate"]
-            actual[stat] += w * (1.0 if leg["outcome"] is True else 0.0)
-            weight_sum[stat] += w
-
     factors = {}
-    for stat, wsum in weight_sum.items():
+    for stat, (predicted, actual, wsum) in acc.totals().items():
         if wsum < CAL_MIN_SAMPLES:
             continue
-        p_mean = predicted[stat] / wsum
-        a_mean = actual[stat] / wsum
+        p_mean = predicted / wsum
+        a_mean = actual / wsum
         if p_mean > 0:
             raw = a_mean / p_mean
             factors[stat] = round(max(CAL_MIN_FACTOR, min(CAL_MAX_FACTOR, raw)), 4)
@@ -939,71 +1777,64 @@ def get_calibration(sport: str | None = None) -> dict:
 # Reporting
 # ─────────────────────────────────────────────────────────────────────────────
 
+@_report_cache
 def last_parlay_time(sport: str | None = None) -> datetime | None:
     """Timestamp of the most recently logged parlay, for detecting a missed daily run."""
-    data = _load()
+    parlays, _ = _hot_frames()
+    raws = list(_sport_rows(parlays, sport)["generated_at"].unique())
+    raws += [s["last_generated_at"] for summary in _archive_manifest().values()
+             for sp, s in summary["sports"].items() if not sport or sp == sport]
     stamps = []
-    for p in data["parlays"]:
-        if sport and p.get("sport") != sport:
-            continue
+    for raw in raws:
         try:
-            stamps.append(datetime.fromisoformat(p["generated_at"]))
+            stamps.append(datetime.fromisoformat(raw))
         except Exception:
             continue
     return max(stamps) if stamps else None
 
 
+@_report_cache
 def get_all_weeks() -> list:
     """Return ISO weeks that have logged parlays, most-recent first."""
-    data = _load()
-    return sorted({p["iso_week"] for p in data["parlays"]}, reverse=True)
+    parlays, _ = _hot_frames()
+    return sorted(set(parlays["iso_week"].dropna()) | set(_archive_manifest()), reverse=True)
 
 
+@_report_cache
 def get_sport_weeks(sport: str) -> list:
     """Return ISO weeks that have logged parlays for a specific sport, most-recent first."""
-    data = _load()
-    return sorted(
-        {p["iso_week"] for p in data["parlays"] if p.get("sport") == sport},
-        reverse=True,
-    )
+    parlays, _ = _hot_frames()
+    archived = {w for w, s in _archive_manifest().items() if sport in s["sports"]}
+    return sorted(set(parlays.loc[parlays["sport"] == sport, "iso_week"].dropna()) | archived,
+                  reverse=True)
 
 
+@_report_cache
 def get_weekly_summary(week: str | None = None, sport: str | None = None) -> dict:
     """Compute accuracy metrics for a given ISO week (defaults to current week).
     Pass sport='NBA' or sport='MLB' to filter."""
     if week is None:
         week = datetime.now().strftime("%G-W%V")
-    data = _load()
-    week_parlays = [p for p in data["parlays"] if p.get("iso_week") == week]
-    if sport:
-        week_parlays = [p for p in week_parlays if p.get("sport") == sport]
-
-    resolved_parlays  = [p for p in week_parlays if p["parlay_hit"] is not None]
-    hit_parlays       = [p for p in resolved_parlays if p["parlay_hit"]]
+    parlays, legs = _frames(week)
+    week_parlays = _sport_rows(parlays[parlays["iso_week"] == week], sport)
+    week_legs = _sport_rows(legs[legs["iso_week"] == week], sport)
 
-    all_legs      = [l for p in week_parlays for l in p["legs"]]
-    resolved_legs = [l for l in all_legs if l["outcome"] is not None and l["outcome"] != "void"]
-    hit_legs      = [l for l in resolved_legs if l["outcome"] is True]
+    resolved_parlays = week_parlays[week_parlays["resolved"]]
+    resolved_legs = week_legs[week_legs["resolved"]]
+    n_parlays = len(resolved_parlays)
+    n_legs = len(resolved_legs)
 
     # Per-stat accuracy is measured on unique props, not leg rows: the same prop is
     # reused across many parlays, which would otherwise multiply one right-or-wrong
     # call into a dozen and make a thin stat look statistically settled.
-    stat_data: dict = defaultdict(lambda: {"predicted": [], "actual": []})
-    seen_props: set = set()
-    for leg in resolved_legs:
-        key = _prop_key(leg)
-        if key in seen_props:
-            continue
-        seen_props.add(key)
-        s = leg["stat_type"]
-        stat_data[s]["predicted"].append(leg["predicted_hit_rate"])
-        stat_data[s]["actual"].append(1.0 if leg["outcome"] is True else 0.0)
-
+    props = _unique_props(week_legs)
     stat_breakdown = {}
-    for stat, d in stat_data.items():
-        n = len(d["predicted"])
-        p_mean = sum(d["predicted"]) / n
-        a_mean = sum(d["actual"]) / n
+    by_stat = _tally(props["stat_type"], sort=False,
+                     predicted=props["predicted_hit_rate"], actual=props["hit"])
+    for stat, d in by_stat.items():
+        n = d["n"]
+        p_mean = d["predicted"] / n
+        a_mean = d["actual"] / n
         stat_breakdown[stat] = {
             "n":                  n,
             "predicted_hit_rate": round(p_mean, 3),
@@ -1012,64 +1843,42 @@ def get_weekly_summary(week: str | None = None, sport: str | None = None) -> dic
         }
 
     # By sportsbook
-    sb_data: dict = defaultdict(lambda: {"total": 0, "hit": 0})
-    for p in resolved_parlays:
-        sb = p.get("sportsbook", "Unknown")
-        sb_data[sb]["total"] += 1
-        if p["parlay_hit"]:
-            sb_data[sb]["hit"] += 1
+    by_book = _tally(resolved_parlays["sportsbook"], sort=False,
+                     hit=resolved_parlays["hit"].astype(int))
+    sb_data = {sb: {"total": d["n"], "hit": d["hit"]} for sb, d in by_book.items()}
 
     # Predicted vs actual EV
-    avg_predicted_prob = (
-        sum(p["predicted_prob"] for p in resolved_parlays) / len(resolved_parlays)
-        if resolved_parlays else None
-    )
+    avg_predicted_prob = float(resolved_parlays["predicted_prob"].mean()) if n_parlays else None
 
     return {
         "week":              week,
         "total_parlays":     len(week_parlays),
-        "resolved_parlays":  len(resolved_parlays),
-        "parlay_hit_rate":   round(len(hit_parlays) / len(resolved_parlays), 3) if resolved_parlays else None,
+        "resolved_parlays":  n_parlays,
+        "parlay_hit_rate":   round(int(resolved_parlays["hit"].sum()) / n_parlays, 3) if n_parlays else None,
         "avg_predicted_prob": round(avg_predicted_prob, 3) if avg_predicted_prob is not None else None,
-        "total_legs":        len(all_legs),
-        "resolved_legs":     len(resolved_legs),
+        "total_legs":        len(week_legs),
+        "resolved_legs":     n_legs,
         # Distinct props behind resolved_legs — the real accuracy sample size.
-        "unique_resolved_props": len(seen_props),
-        "leg_hit_rate":      round(len(hit_legs) / len(resolved_legs), 3) if resolved_legs else None,
+        "unique_resolved_props": len(props),
+        "leg_hit_rate":      round(int(resolved_legs["hit"].sum()) / n_legs, 3) if n_legs else None,
         "stat_breakdown":    stat_breakdown,
-        "sportsbook_breakdown": {sb: d for sb, d in sb_data.items()},
+        "sportsbook_breakdown": sb_data,
     }
 
 
+@_report_cache
 def get_all_time_calibration_table(sport: str | None = None) -> list:
     """Return a list of dicts for the calibration summary table.
     Pass sport='NBA' or sport='MLB' to filter."""
-    data = _load()
-    predicted: dict[str, list] = defaultdict(list)
-    actual: dict[str, list] = defaultdict(list)
-    seen_props: set = set()
-
-    for parlay in data["parlays"]:
-        if sport and parlay.get("sport") != sport:
-            continue
-        for leg in parlay["legs"]:
-            # "void" is a truthy string, so it has to be screened out explicitly or
-            # a postponed game scores as a hit.
-            if leg["outcome"] is None or leg["outcome"] == "void":
-                continue
-            key = _prop_key(leg)
-            if key in seen_props:
-                continue
-            seen_props.add(key)
-            stat = leg["stat_type"]
-            predicted[stat].append(leg["predicted_hit_rate"])
-            actual[stat].append(1.0 if leg["outcome"] is True else 0.0)
+    props = _props(sport)
+    by_stat = _tally(props["stat_type"], predicted=props["predicted_hit_rate"],
+                     actual=props["hit"])
 
     rows = []
-    for stat in sorted(predicted):
-        n = len(predicted[stat])
-        p_mean = sum(predicted[stat]) / n if n else 0
-        a_mean = sum(actual[stat]) / n if n else 0
+    for stat, d in by_stat.items():
+        n = d["n"]
+        p_mean = d["predicted"] / n
+        a_mean = d["actual"] / n
         factor = None
         if n >= CAL_MIN_SAMPLES and p_mean > 0:
             raw = a_mean / p_mean
@@ -1094,6 +1903,7 @@ PARLAY_CAL_MIN_FACTOR  = 0.05
 PARLAY_CAL_MAX_FACTOR  = 1.0
 
 
+@_report_cache
 def get_parlay_calibration(sport: str | None = None) -> dict:
     """
     Per-leg-count calibration for whole-parlay probability. Returns {n_legs: factor};
@@ -1109,44 +1919,18 @@ def get_parlay_calibration(sport: str | None = None) -> dict:
 
     Recency-weighted on the same half-life as leg calibration.
     """
-    data = _load()
-    parlays = [p for p in data["parlays"]
-               if p["parlay_hit"] is not None
-               and (not sport or p.get("sport") == sport)
-               # Only grade predictions this model actually made. Every parlay resolved
-               # before the de-vig fix was predicted by a model that never saw the
-               # market; its overconfidence is not this model's overconfidence, and
-               # applying it on top of corrected legs deflates twice — which is how the
-               # board came to report that every parlay on it loses.
-               and p.get("model_epoch") == _MODEL_EPOCH]
-    if not parlays:
+    # Only parlays of the current model epoch are graded — see _cal_state.
+    _load()
+    acc = _PARLAY_CAL.get(sport or None)
+    if acc is None:
         return {}
 
-    week_ords = [_week_ordinal(p.get("iso_week", "")) for p in parlays]
-    week_ords = [w for w in week_ords if w is not None]
-    latest = max(week_ords) if week_ords else None
-
-    predicted: dict[int, float] = defaultdict(float)
-    actual: dict[int, float] = defaultdict(float)
-    weight: dict[int, float] = defaultdict(float)
-
-    for p in parlays:
-        w = 1.0
-        if latest is not None:
-            wk = _week_ordinal(p.get("iso_week", ""))
-            if wk is not None:
-                w = 0.5 ** (max(0, latest - wk) / CAL_HALF_LIFE_WEEKS)
-        n = len(p["legs"])
-        predicted[n] += w * float(p["predicted_prob"])
-        actual[n]    += w * (1.0 if p["parlay_hit"] else 0.0)
-        weight[n]    += w
-
     factors = {}
-    for n, wsum in weight.items():
+    for n, (predicted, actual, wsum) in acc.totals().items():
         if wsum < PARLAY_CAL_MIN_SAMPLES:
             continue
-        p_mean = predicted[n] / wsum
-        a_mean = actual[n] / wsum
+        p_mean = predicted / wsum
+        a_mean = actual / wsum
         if p_mean > 0:
             raw = a_mean / p_mean
             factors[n] = round(max(PARLAY_CAL_MIN_FACTOR,
@@ -1154,10 +1938,45 @@ def get_parlay_calibration(sport: str | None = None) -> dict:
     return factors
 
 
+CAL_HISTORY_PATH = LOG_PATH.with_name("calibration_history.jsonl")
+
+
+def snapshot_calibration(day: date | None = None) -> bool:
+    """
+    Append the day's factors — leg and parlay, blended ("ALL") and per sport — to
+    CAL_HISTORY_PATH, at most once per day. The running sums only ever hold today's
+    numbers; this is what lets a factor's drift be read back after the fact.
+    Returns True when a line was written.
+    """
+    day_str = (day or date.today()).isoformat()
+    try:
+        with open(CAL_HISTORY_PATH, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 4096))
+            lines = f.read().strip().splitlines()
+        if lines and json.loads(lines[-1]).get("date") == day_str:
+            return False
+    except (FileNotFoundError, ValueError):
+        pass
+
+    _load()
+    scopes = [None] + sorted(s for s in _LEG_CAL if s)
+    record = {
+        "date":    day_str,
+        "legs":    {s or "ALL": get_calibration(s) for s in scopes},
+        "parlays": {s or "ALL": {str(n): f for n, f in get_parlay_calibration(s).items()}
+                    for s in scopes},
+    }
+    with open(CAL_HISTORY_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return True
+
+
 DRIFT_MIN_PROPS  = 20    # unique props before a gap is worth calling drift rather than noise
 DRIFT_BIAS_ALERT = 0.15  # actual vs predicted this far apart is real miscalibration
 
 
+@_report_cache
 def get_drift_warnings(sport: str | None = None,
                        min_props: int = DRIFT_MIN_PROPS,
                        bias_alert: float = DRIFT_BIAS_ALERT) -> list:
@@ -1184,40 +2003,169 @@ def get_drift_warnings(sport: str | None = None,
     return sorted(out, key=lambda x: abs(x["bias"]), reverse=True)
 
 
+# ── Export ───────────────────────────────────────────────────────────────────
+# One row per leg, with its parlay's fields alongside. export_legs streams rows
+# for any date range and sport straight to a file in chunks of EXPORT_CHUNK_ROWS:
+# archived weeks are read a line at a time from their partitions (and skipped
+# outright when they can't overlap the range), so a season's export holds one
+# chunk of rows at once rather than the log plus a list of dicts plus a
+# DataFrame built from it.
+EXPORT_COLUMNS = [
+    "week", "sport", "sportsbook", "kind", "model_epoch", "generated_at",
+    "predicted_parlay_prob", "ev", "recommended", "parlay_hit",
+    "player_name", "stat_type", "line_score", "predicted_hit_rate", "implied_prob",
+    "american_odds", "game_label", "outcome",
+]
+EXPORT_CHUNK_ROWS = 5000
+_EXPORT_NUMERIC = {"predicted_parlay_prob", "ev", "line_score", "predicted_hit_rate",
+                   "implied_prob", "american_odds"}
+_EXPORT_BOOL = {"recommended", "parlay_hit"}
+
+
+def _export_rows(parlays):
+    """One flat dict per leg, with its parlay's fields, in EXPORT_COLUMNS order."""
+    for p in parlays:
+        base = {
+            "week":                  p.get("iso_week", ""),
+            "sport":                 p.get("sport", ""),
+            "sportsbook":            p.get("sportsbook", ""),
+            "kind":                  p.get("kind", ""),
+            "model_epoch":           p.get("model_epoch", ""),
+            "generated_at":          p.get("generated_at", ""),
+            "predicted_parlay_prob": p.get("predicted_prob"),
+            "ev":                    p.get("ev"),
+            "recommended":           p.get("recommended"),
+            "parlay_hit":            p.get("parlay_hit"),
+        }
+        for leg in p.get("legs", []):
+            yield {
+                **base,
+                "player_name":        leg.get("player_name", ""),
+                "stat_type":          leg.get("stat_type", ""),
+                "line_score":         leg.get("line_score"),
+                "predicted_hit_rate": leg.get("predicted_hit_rate"),
+                "implied_prob":       leg.get("implied_prob"),
+                "american_odds":      leg.get("american_odds", ""),
+                "game_label":         leg.get("game_label", ""),
+                "outcome":            leg.get("outcome"),
+            }
+
+
+def _export_parlays(start: date | None, end: date | None, sport: str | None):
+    """Parlays generated within [start, end] (either end open), in log order."""
+    lo = start.isoformat() if start else ""
+    hi = end.isoformat() if end else "9999"
+
+    def _keep(p: dict) -> bool:
+        return ((not sport or p.get("sport") == sport)
+                and lo <= str(p.get("generated_at", ""))[:10] <= hi)
+
+    data = _load()
+    hot = list(data["parlays"])          # a stable view; resolvers may append meanwhile
+    for week, summary in sorted(_archive_manifest().items()):
+        if sport and sport not in summary["sports"]:
+            continue
+        try:
+            monday = datetime.strptime(f"{week}-1", "%G-W%V-%u").date()
+        except ValueError:
+            monday = None
+        if monday and ((end and monday > end) or (start and monday + timedelta(days=6) < start)):
+            continue
+        if week in _ARCHIVE["parlays"]:
+            yield from filter(_keep, _ARCHIVE["parlays"][week])
+            continue
+        with gzip.open(ARCHIVE_DIR / summary["file"], "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    p = json.loads(line)
+                    if _keep(p):
+                        yield p
+    yield from filter(_keep, hot)
+
+
+def _chunks(rows, size: int):
+    """Lists of up to `size` rows from an iterator."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_csv(f, rows, chunk_rows: int) -> int:
+    writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    n = 0
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(chunk)
+        n += len(chunk)
+    return n
+
+
+def _write_parquet(path, rows, chunk_rows: int) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from e
+
+    def _num(v):
+        try:
+            return float(v)
+        except (TypeError, ValueError):
+            return None
+
+    def _text(v):
+        return None if v is None else str(v)
+
+    # Fixed types, so every chunk is one row group of the same schema. outcome is
+    # True / False / "void", so it goes out as text, as it reads in the CSV.
+    schema = pa.schema([
+        (c, pa.float64() if c in _EXPORT_NUMERIC else pa.bool_() if c in _EXPORT_BOOL
+         else pa.string()) for c in EXPORT_COLUMNS])
+    convert = {c: _num if c in _EXPORT_NUMERIC else
+               (lambda v: None if v is None else bool(v)) if c in _EXPORT_BOOL else _text
+               for c in EXPORT_COLUMNS}
+    n = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for chunk in _chunks(rows, chunk_rows):
+            writer.write_table(pa.table(
+                {c: [convert[c](r[c]) for r in chunk] for c in EXPORT_COLUMNS}, schema=schema))
+            n += len(chunk)
+    return n
+
+
+def export_legs(path, start: date | None = None, end: date | None = None,
+                sport: str | None = None, fmt: str | None = None,
+                chunk_rows: int = EXPORT_CHUNK_ROWS) -> int:
+    """
+    Stream every logged leg of parlays generated between `start` and `end` (inclusive,
+    either may be open) to `path` as CSV or Parquet. `fmt` defaults from the suffix
+    ('.parquet' -> Parquet, anything else CSV); Parquet needs pyarrow. Returns the
+    number of rows written.
+    """
+    path = Path(path)
+    fmt = (fmt or ("parquet" if path.suffix.lower() == ".parquet" else "csv")).lower()
+    rows = _export_rows(_export_parlays(start, end, sport))
+    if fmt == "parquet":
+        return _write_parquet(path, rows, chunk_rows)
+    if fmt != "csv":
+        raise ValueError(f"unknown export format {fmt!r} (csv or parquet)")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return _write_csv(f, rows, chunk_rows)
+
+
 def export_csv(week: str | None = None, sport: str | None = None) -> str:
     """Return a CSV string of all logged legs for the given week and optional sport."""
     if week is None:
         week = datetime.now().strftime("%G-W%V")
-    data = _load()
-    rows = []
-    for p in data["parlays"]:
-        if p.get("iso_week") != week:
-            continue
-        if sport and p.get("sport") != sport:
-            continue
-        for leg in p["legs"]:
-            rows.append({
-                "week":                 week,
-                "sport":                p["sport"],
-                "sportsbook":           p["sportsbook"],
-                "kind":                 p.get("kind", ""),
-                "generated_at":         p["generated_at"],
-                "predicted_parlay_prob": p["predicted_prob"],
-                "parlay_hit":           p["parlay_hit"],
-                "player_name":          leg["player_name"],
-                "stat_type":            leg["stat_type"],
-                "line_score":           leg["line_score"],
-                "predicted_hit_rate":   leg["predicted_hit_rate"],
-                "american_odds":        leg.get("american_odds", ""),
-                "game_label":           leg.get("game_label", ""),
-                "outcome":              leg["outcome"],
-            })
-    if not rows:
-        cols = ["week","sport","sportsbook","kind","generated_at","predicted_parlay_prob",
-                "parlay_hit","player_name","stat_type","line_score","predicted_hit_rate",
-                "american_odds","game_label","outcome"]
-        return ",".join(cols) + "\n"
-    return pd.DataFrame(rows).to_csv(index=False)
+    parlays = (p for p in _week_parlays(week) if not sport or p.get("sport") == sport)
+    buf = io.StringIO()
+    _write_csv(buf, _export_rows(parlays), EXPORT_CHUNK_ROWS)
+    return buf.getvalue()
 
 
 def _implied_from_odds(american_odds) -> float:
@@ -1249,31 +2197,19 @@ def _leg_implied(leg: dict) -> float:
     return _implied_from_odds(leg.get("american_odds"))
 
 
+@_report_cache
 def get_player_accuracy(sport: str | None = None) -> list[dict]:
     """Per-player, per-stat hit rate table from all resolved legs, sorted by sample count."""
-    data = _load()
-    buckets: dict = defaultdict(lambda: {"predicted": [], "actual": [], "implied": []})
-    seen_props: set = set()
-    for parlay in data["parlays"]:
-        if sport and parlay.get("sport") != sport:
-            continue
-        for leg in parlay["legs"]:
-            if leg["outcome"] is None or leg["outcome"] == "void":
-                continue
-            prop = _prop_key(leg)
-            if prop in seen_props:
-                continue  # one prop, reused across parlays — a single observation
-            seen_props.add(prop)
-            key = (leg["player_name"], leg["stat_type"])
-            buckets[key]["predicted"].append(leg["predicted_hit_rate"])
-            buckets[key]["actual"].append(1.0 if leg["outcome"] is True else 0.0)
-            buckets[key]["implied"].append(_leg_implied(leg))
+    props = _props(sport)
+    by_player = _tally([props["player_name"], props["stat_type"]], sort=False,
+                       predicted=props["predicted_hit_rate"], actual=props["hit"],
+                       implied=props["implied"])
     rows = []
-    for (player, stat), d in buckets.items():
-        n = len(d["predicted"])
-        p_mean = sum(d["predicted"]) / n
-        a_mean = sum(d["actual"]) / n
-        i_mean = sum(d["implied"]) / n
+    for (player, stat), d in by_player.items():
+        n = d["n"]
+        p_mean = d["predicted"] / n
+        a_mean = d["actual"] / n
+        i_mean = d["implied"] / n
         rows.append({
             "player_name":        player,
             "stat_type":          stat,
@@ -1290,6 +2226,53 @@ KELLY_START_BANKROLL = 1000.0
 KELLY_SLATE_CAP = 0.25   # most of the bankroll a single day's slate may risk
 
 
+def _resolved_parlays(sport: str | None) -> pd.DataFrame:
+    """Resolved parlays in generation order (the order they were bet in)."""
+    parlays, _ = _frames()
+    resolved = _sport_rows(parlays, sport)
+    return resolved[resolved["resolved"]].sort_values("generated_at", kind="stable")
+
+
+def _slates(resolved: pd.DataFrame, flat_bet: float, slate_cap: float) -> pd.DataFrame:
+    """
+    One row per day: parlays placed, flat-bet P&L, and Kelly's stake and return as
+    fractions of the morning bankroll. Kelly on net odds b: f = (p*(b+1) - 1) / b,
+    with b = payout - 1; the slate's total is scaled down to slate_cap when it asks
+    for more. Everything a day does to either bankroll is in its row, which is what
+    lets whole paths be settled — and resampled — without visiting parlays again.
+    """
+    payout = resolved["payout"]
+    hit = resolved["hit"]
+    b = payout - 1.0
+    frac = ((resolved["predicted_prob"] * payout - 1.0) / b.where(b > 0)).fillna(0.0).clip(lower=0.0)
+    day = pd.DataFrame({
+        "date":  resolved["generated_at"].str[:10],
+        "n":     1,
+        "flat":  (flat_bet * b.clip(lower=0.0)).where(hit, -flat_bet),
+        "want":  frac,
+        "kelly": frac * b.where(hit, -1.0),
+    }).groupby("date", sort=True).sum()
+    scale = (slate_cap / day["want"].where(day["want"] > slate_cap)).fillna(1.0)
+    day["stake"] = day["want"] * scale
+    day["kelly"] = day["kelly"] * scale
+    return day
+
+
+def _settle_kelly(returns: np.ndarray, start_bankroll: float) -> np.ndarray:
+    """
+    Bankroll after each day for a (paths, days) array of daily returns. Days run in
+    sequence — the 0.01 floor makes the order matter — but each step settles every
+    path at once.
+    """
+    bank = np.empty_like(returns, dtype=float)
+    level = np.full(returns.shape[0], float(start_bankroll))
+    for j in range(returns.shape[1]):
+        level = np.maximum(level * (1.0 + returns[:, j]), 0.01)
+        bank[:, j] = level
+    return bank
+
+
+@_report_cache
 def get_roi_simulation(sport: str | None = None, flat_bet: float = 10.0,
                        slate_cap: float = KELLY_SLATE_CAP,
                        start_bankroll: float = KELLY_START_BANKROLL) -> dict:
@@ -1309,297 +2292,262 @@ def get_roi_simulation(sport: str | None = None, flat_bet: float = 10.0,
     sized off the bankroll as it stood that morning, the slate's total exposure is
     capped at slate_cap of it, and the bankroll settles once at day's end.
     """
-    data = _load()
-    resolved = [p for p in data["parlays"]
-                if p["parlay_hit"] is not None
-                and (not sport or p.get("sport") == sport)]
-    resolved.sort(key=lambda p: p["generated_at"])
-
-    flat_pnl = 0.0
-    total_wagered = 0.0
-    flat_series: list[float] = []
-    dates: list[str] = []
-
-    for p in resolved:
-        payout = float(p.get("payout") or 2.0)
-        net = max(payout - 1.0, 0.0)          # profit per unit staked
-        total_wagered += flat_bet
-        flat_pnl += (flat_bet * net) if p["parlay_hit"] else -flat_bet
-        flat_series.append(round(flat_pnl, 2))
-        dates.append(p["generated_at"][:10])
+    resolved = _resolved_parlays(sport)
+
+    payout = resolved["payout"]
+    hit = resolved["hit"]
+    net = (payout - 1.0).clip(lower=0.0)          # profit per unit staked
+    flat_cum = (flat_bet * net).where(hit, -flat_bet).cumsum()
+    flat_pnl = float(flat_cum.iloc[-1]) if len(flat_cum) else 0.0
+    total_wagered = flat_bet * len(resolved)
+    dates = resolved["generated_at"].str[:10]
 
     # ── Kelly, settled once per slate ────────────────────────────────────────
-    slates: dict[str, list] = defaultdict(list)
-    for p in resolved:
-        slates[p["generated_at"][:10]].append(p)
-
-    kelly_bankroll = start_bankroll
-    kelly_series: list[float] = []
-    kelly_staked = 0.0
-
-    # Days ascend in the same order as `resolved`, and each slate keeps that order,
-    # so kelly_series lines up one-to-one with flat_series and dates.
-    for day in sorted(slates):
-        slate = slates[day]
-        day_open = kelly_bankroll
-
-        fractions = []
-        for p in slate:
-            payout = float(p.get("payout") or 2.0)
-            net = payout - 1.0
-            prob = float(p["predicted_prob"])
-            # Kelly on net odds b: f = (p*(b+1) - 1) / b, with b = payout - 1.
-            f = ((prob * payout) - 1.0) / net if net > 0 else 0.0
-            fractions.append(max(0.0, f))
-
-        wanted = sum(fractions)
-        scale = min(1.0, slate_cap / wanted) if wanted > slate_cap else 1.0
-
-        day_pnl = 0.0
-        for p, f in zip(slate, fractions):
-            payout = float(p.get("payout") or 2.0)
-            stake = day_open * f * scale
-            kelly_staked += stake
-            day_pnl += stake * (payout - 1.0) if p["parlay_hit"] else -stake
-
-        kelly_bankroll = max(day_open + day_pnl, 0.01)
-        kelly_series.extend([round(kelly_bankroll, 2)] * len(slate))
+    slates = _slates(resolved, flat_bet, slate_cap)
+    closes = _settle_kelly(slates["kelly"].to_numpy()[None, :], start_bankroll)[0]
+    opens = np.concatenate(([float(start_bankroll)], closes[:-1]))
+    kelly_bankroll = float(closes[-1]) if len(closes) else start_bankroll
+    kelly_staked = float((opens * slates["stake"].to_numpy()).sum())
+    # Days ascend in the same order as `resolved`, so repeating each close once per
+    # parlay lines kelly_series up one-to-one with flat_series and dates.
+    kelly_series = [round(float(v), 2)
+                    for v, n in zip(closes, slates["n"]) for _ in range(int(n))]
 
     return {
         "n_parlays":      len(resolved),
         "flat_pnl":       round(flat_pnl, 2),
         "total_wagered":  round(total_wagered, 2),
         "roi_pct":        round(flat_pnl / total_wagered * 100, 1) if total_wagered else 0.0,
-        "flat_series":    flat_series,
+        "flat_series":    flat_cum.round(2).tolist(),
         "kelly_bankroll": round(kelly_bankroll, 2),
         "kelly_staked":   round(kelly_staked, 2),
         "kelly_roi_pct":  round((kelly_bankroll - start_bankroll) / start_bankroll * 100, 1),
         "kelly_series":   kelly_series,
-        "dates":          dates,
+        "dates":          dates.tolist(),
     }
 
 
+BOOTSTRAP_SIMS = 2000
+BOOTSTRAP_RUIN_LEVEL = 0.25    # a path is "ruined" once its bankroll touches 25% of the start
+BOOTSTRAP_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@_report_cache
+def get_roi_bootstrap(sport: str | None = None, n_sims: int = BOOTSTRAP_SIMS,
+                      flat_bet: float = 10.0, slate_cap: float = KELLY_SLATE_CAP,
+                      start_bankroll: float = KELLY_START_BANKROLL,
+                      ruin_level: float = BOOTSTRAP_RUIN_LEVEL, seed: int = 0) -> dict:
+    """
+    How much of get_roi_simulation's result is luck. Replays n_sims alternative
+    histories, each the same number of slates drawn with replacement from the real
+    ones, and reports percentiles of ROI and final bankroll for flat and slate-capped
+    Kelly staking, the chance each ends in profit, and risk of ruin — the share of
+    paths whose bankroll ever touches ruin_level of the start (flat staking draws
+    its bets from the same start_bankroll).
+
+    Slates, not parlays, are the resampling unit: a day's parlays share legs and
+    win or lose together, and resampling them one by one would understate the
+    spread. Seeded, so a rerun of the Accuracy tab shows the same bands.
+    """
+    resolved = _resolved_parlays(sport)
+    slates = _slates(resolved, flat_bet, slate_cap)
+    n_days = len(slates)
+    out = {"n_sims": n_sims, "n_days": n_days, "n_parlays": len(resolved),
+           "percentiles": list(BOOTSTRAP_PERCENTILES), "flat": None, "kelly": None}
+    if not n_days:
+        return out
+
+    rng = np.random.default_rng(seed)
+    draw = rng.integers(0, n_days, size=(n_sims, n_days))
+    ruin = ruin_level * start_bankroll
+
+    def _summary(final: np.ndarray, roi: np.ndarray, low: np.ndarray) -> dict:
+        return {
+            "roi_pct":          [round(float(v), 1) for v in
+                                 np.percentile(roi * 100, BOOTSTRAP_PERCENTILES)],
+            "final_bankroll":   [round(float(v), 2) for v in
+                                 np.percentile(final, BOOTSTRAP_PERCENTILES)],
+            "prob_profit_pct":  round(float((roi > 0).mean() * 100), 1),
+            "risk_of_ruin_pct": round(float((low <= ruin).mean() * 100), 1),
+        }
+
+    flat_paths = start_bankroll + slates["flat"].to_numpy()[draw].cumsum(axis=1)
+    wagered = flat_bet * slates["n"].to_numpy()[draw].sum(axis=1)
+    out["flat"] = _summary(flat_paths[:, -1], (flat_paths[:, -1] - start_bankroll) / wagered,
+                           flat_paths.min(axis=1))
+
+    kelly_paths = _settle_kelly(slates["kelly"].to_numpy()[draw], start_bankroll)
+    out["kelly"] = _summary(kelly_paths[:, -1],
+                            (kelly_paths[:, -1] - start_bankroll) / start_bankroll,
+                            kelly_paths.min(axis=1))
+    return out
+
+
+@_report_cache
 def get_leg_count_breakdown(sport: str | None = None) -> list[dict]:
     """Hit rate, ROI, and average EV broken down by parlay leg count."""
-    data = _load()
-    buckets: dict = defaultdict(lambda: {"total": 0, "hits": 0, "bet": 0.0, "returns": 0.0, "ev": 0.0})
-    for p in data["parlays"]:
-        if p["parlay_hit"] is None:
-            continue
-        if sport and p.get("sport") != sport:
-            continue
-        n = len(p.get("legs", []))
-        payout = float(p.get("payout") or 2.0)
-        prob = float(p["predicted_prob"])
-        buckets[n]["total"] += 1
-        buckets[n]["bet"] += 10.0
+    parlays, _ = _frames()
+    resolved = _sport_rows(parlays, sport)
+    resolved = resolved[resolved["resolved"]]
+    by_n = _tally(
+        resolved["n_legs"],
+        hits=resolved["hit"].astype(int),
         # payout is gross, so a win nets (payout - 1): EV = prob*(payout-1) - (1-prob),
         # which reduces to prob*payout - 1. Subtracting only (1-prob) double-counted the
         # returned stake and overstated EV by `prob` on every parlay.
-        buckets[n]["ev"] += prob * payout - 1.0
-        if p["parlay_hit"]:
-            buckets[n]["hits"] += 1
-            buckets[n]["returns"] += 10.0 * payout
+        ev=resolved["predicted_prob"] * resolved["payout"] - 1.0,
+        returns=(10.0 * resolved["payout"]).where(resolved["hit"], 0.0),
+    )
     rows = []
-    for n in sorted(buckets):
-        d = buckets[n]
-        t = d["total"]
+    for n, d in by_n.items():
+        t = d["n"]
+        bet = 10.0 * t
         rows.append({
             "n_legs":       n,
             "total":        t,
             "hits":         d["hits"],
             "hit_rate_pct": round(d["hits"] / t * 100, 1) if t else 0.0,
             "avg_ev":       round(d["ev"] / t, 3) if t else 0.0,
-            "roi_pct":      round((d["returns"] - d["bet"]) / d["bet"] * 100, 1) if d["bet"] else 0.0,
+            "roi_pct":      round((d["returns"] - bet) / bet * 100, 1) if bet else 0.0,
         })
     return rows
 
 
+@_report_cache
 def get_kind_comparison(sport: str | None = None) -> dict:
     """Compare safe vs value parlay performance across all resolved data."""
-    data = _load()
+    parlays, _ = _frames()
+    resolved = _sport_rows(parlays, sport)
+    resolved = resolved[resolved["resolved"]]
     out = {}
     for kind in ("safe", "value"):
-        parlays = [p for p in data["parlays"]
-                   if p["parlay_hit"] is not None
-                   and p.get("kind") == kind
-                   and (not sport or p.get("sport") == sport)]
-        if not parlays:
+        rows = resolved[resolved["kind"] == kind]
+        if rows.empty:
             out[kind] = None
             continue
-        hits = sum(1 for p in parlays if p["parlay_hit"])
-        bet = len(parlays) * 10.0
-        returns = sum(float(p.get("payout") or 2.0) * 10.0 for p in parlays if p["parlay_hit"])
+        total = len(rows)
+        hits = int(rows["hit"].sum())
+        bet = total * 10.0
+        returns = float((rows["payout"] * 10.0)[rows["hit"]].sum())
         out[kind] = {
-            "total":            len(parlays),
+            "total":            total,
             "hits":             hits,
-            "hit_rate_pct":     round(hits / len(parlays) * 100, 1),
+            "hit_rate_pct":     round(hits / total * 100, 1),
             "roi_pct":          round((returns - bet) / bet * 100, 1) if bet else 0.0,
-            "avg_predicted_pct": round(sum(p["predicted_prob"] for p in parlays) / len(parlays) * 100, 1),
+            "avg_predicted_pct": round(float(rows["predicted_prob"].mean()) * 100, 1),
         }
     return out
 
 
+@_report_cache
 def get_sportsbook_comparison(sport: str | None = None) -> dict:
     """Per-sportsbook hit rate and flat-bet ROI."""
-    data = _load()
-    books: dict = defaultdict(lambda: {"total": 0, "hits": 0, "bet": 0.0, "returns": 0.0})
-    for p in data["parlays"]:
-        if p["parlay_hit"] is None:
-            continue
-        if sport and p.get("sport") != sport:
-            continue
-        sb = p.get("sportsbook", "Unknown")
-        payout = float(p.get("payout") or 2.0)
-        books[sb]["total"] += 1
-        books[sb]["bet"] += 10.0
-        if p["parlay_hit"]:
-            books[sb]["hits"] += 1
-            books[sb]["returns"] += 10.0 * payout
+    parlays, _ = _frames()
+    resolved = _sport_rows(parlays, sport)
+    resolved = resolved[resolved["resolved"]]
+    books = _tally(resolved["sportsbook"], sort=False,
+                   hits=resolved["hit"].astype(int),
+                   returns=(10.0 * resolved["payout"]).where(resolved["hit"], 0.0))
     result = {}
     for sb, d in books.items():
+        total = d["n"]
+        bet = 10.0 * total
         result[sb] = {
-            "total":        d["total"],
+            "total":        total,
             "hits":         d["hits"],
-            "hit_rate_pct": round(d["hits"] / d["total"] * 100, 1) if d["total"] else 0.0,
-            "roi_pct":      round((d["returns"] - d["bet"]) / d["bet"] * 100, 1) if d["bet"] else 0.0,
+            "hit_rate_pct": round(d["hits"] / total * 100, 1) if total else 0.0,
+            "roi_pct":      round((d["returns"] - bet) / bet * 100, 1) if bet else 0.0,
         }
     return result
 
 
+@_report_cache
 def get_monthly_trends(sport: str | None = None) -> list[dict]:
     """Month-by-month parlay and leg hit rates from all resolved parlays."""
-    data = _load()
-    months: dict = defaultdict(lambda: {
-        "total": 0, "hits": 0,
-        "leg_total": 0, "leg_hits": 0,
-        "pred_sum": 0.0,
-    })
+    parlays, _ = _frames()
+    resolved = _sport_rows(parlays, sport)
+    resolved = resolved[resolved["resolved"]]
+    months = _tally(resolved["generated_at"].str[:7], hits=resolved["hit"].astype(int),
+                    pred_sum=resolved["predicted_prob"])
     # Parlay counts are per-parlay, but the leg hit rate is per unique prop: the same
     # prop sits in many parlays, and counting it once per parlay would weight the rate
     # by how often the builder happened to reuse it.
-    seen_props: set = set()
-    for p in data["parlays"]:
-        if p["parlay_hit"] is None:
-            continue
-        if sport and p.get("sport") != sport:
-            continue
-        month = p["generated_at"][:7]
-        months[month]["total"] += 1
-        months[month]["pred_sum"] += float(p["predicted_prob"])
-        if p["parlay_hit"]:
-            months[month]["hits"] += 1
-        for leg in p["legs"]:
-            if leg["outcome"] is None or leg["outcome"] == "void":
-                continue
-            prop = _prop_key(leg)
-            if prop in seen_props:
-                continue
-            seen_props.add(prop)
-            months[month]["leg_total"] += 1
-            if leg["outcome"] is True:
-                months[month]["leg_hits"] += 1
+    props = _props(sport, settled_parlays=True)
+    leg_months = _tally(props["generated_at"].str[:7], hits=props["hit"])
+
     rows = []
-    for month in sorted(months):
-        d = months[month]
-        t, lt = d["total"], d["leg_total"]
+    for month, d in months.items():
+        t = d["n"]
+        legs = leg_months.get(month, {"n": 0, "hits": 0})
+        lt = legs["n"]
         rows.append({
             "month":            month,
             "total":            t,
             "hits":             d["hits"],
             "hit_rate_pct":     round(d["hits"] / t * 100, 1) if t else 0.0,
-            "leg_hit_rate_pct": round(d["leg_hits"] / lt * 100, 1) if lt else 0.0,
+            "leg_hit_rate_pct": round(legs["hits"] / lt * 100, 1) if lt else 0.0,
             "avg_pred_pct":     round(d["pred_sum"] / t * 100, 1) if t else 0.0,
         })
     return rows
 
 
+@_report_cache
 def get_streak_info(sport: str | None = None) -> dict:
     """Current hit/miss streak and all-time longest streaks."""
-    data = _load()
-    resolved = [p for p in data["parlays"]
-                if p["parlay_hit"] is not None
-                and (not sport or p.get("sport") == sport)]
-    resolved.sort(key=lambda p: p["generated_at"])
-    if not resolved:
+    parlays, _ = _frames()
+    resolved = _sport_rows(parlays, sport)
+    resolved = resolved[resolved["resolved"]].sort_values("generated_at", kind="stable")
+    if resolved.empty:
         return {"current_streak": 0, "current_type": None,
                 "longest_hit": 0, "longest_miss": 0, "total_resolved": 0}
 
-    last_result = resolved[-1]["parlay_hit"]
-    current_type = "hit" if last_result else "miss"
-    current = sum(1 for _ in __import__("itertools").takewhile(
-        lambda p: p["parlay_hit"] == last_result, reversed(resolved)
-    ))
-
-    longest_hit = longest_miss = run_h = run_m = 0
-    for p in resolved:
-        if p["parlay_hit"]:
-            run_h += 1; run_m = 0
-            longest_hit = max(longest_hit, run_h)
-        else:
-            run_m += 1; run_h = 0
-            longest_miss = max(longest_miss, run_m)
+    # Number the runs of equal outcomes; each run's length is its group size.
+    hit = resolved["hit"].reset_index(drop=True)
+    run_id = (hit != hit.shift()).cumsum()
+    runs = hit.groupby(run_id).agg(["first", "size"])
+    longest = runs.groupby("first")["size"].max()
 
     return {
-        "current_streak":  current,
-        "current_type":    current_type,
-        "longest_hit":     longest_hit,
-        "longest_miss":    longest_miss,
+        "current_streak":  int(runs["size"].iloc[-1]),
+        "current_type":    "hit" if runs["first"].iloc[-1] else "miss",
+        "longest_hit":     int(longest.get(True, 0)),
+        "longest_miss":    int(longest.get(False, 0)),
         "total_resolved":  len(resolved),
     }
 
 
+@_report_cache
 def get_best_worst_week(week: str, sport: str | None = None) -> dict:
     """Best (highest-payout hit) and worst (most-confident miss) parlay for a given week."""
-    data = _load()
-    wk = [p for p in data["parlays"]
-          if p.get("iso_week") == week
-          and p["parlay_hit"] is not None
-          and (not sport or p.get("sport") == sport)]
-    hits   = [p for p in wk if p["parlay_hit"]]
-    misses = [p for p in wk if not p["parlay_hit"]]
+    parlays, _ = _frames(week)
+    wk = _sport_rows(parlays[(parlays["iso_week"] == week) & parlays["resolved"]], sport)
+    log = _archive_parlays(week) if week in _archive_manifest() else _load()["parlays"]
+    hits   = [log[i] for i in wk.loc[wk["hit"], "pos"]]
+    misses = [log[i] for i in wk.loc[~wk["hit"], "pos"]]
     best  = max(hits,   key=lambda p: float(p.get("payout") or 0), default=None)
     worst = max(misses, key=lambda p: float(p["predicted_prob"]),   default=None)
     return {"best": best, "worst": worst}
 
 
+@_report_cache
 def get_calibration_drift(sport: str | None = None, days: int = 30,
                            threshold: float = 0.15) -> list[dict]:
     """
     Flag stat types where rolling-N-day actual hit rate diverges > threshold
     from all-time actual hit rate (signals the model needs recalibration).
     """
-    data = _load()
     cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-    alltime: dict = defaultdict(lambda: {"actual": []})
-    recent:  dict = defaultdict(lambda: {"actual": []})
-    seen_props: set = set()
-    for parlay in data["parlays"]:
-        if sport and parlay.get("sport") != sport:
-            continue
-        is_recent = parlay["generated_at"] >= cutoff
-        for leg in parlay["legs"]:
-            if leg["outcome"] is None or leg["outcome"] == "void":
-                continue
-            prop = _prop_key(leg)
-            if prop in seen_props:
-                continue
-            seen_props.add(prop)
-            a = 1.0 if leg["outcome"] is True else 0.0
-            alltime[leg["stat_type"]]["actual"].append(a)
-            if is_recent:
-                recent[leg["stat_type"]]["actual"].append(a)
+    props = _props(sport)
+    is_recent = props["generated_at"] >= cutoff
+    by_stat = _tally(props["stat_type"], sort=False, hits=props["hit"],
+                     n_recent=is_recent.astype(int), recent_hits=props["hit"].where(is_recent, 0.0))
     alerts = []
-    for stat, at in alltime.items():
-        n_at = len(at["actual"])
-        if n_at < CAL_MIN_SAMPLES:
+    for stat, d in by_stat.items():
+        n_rec = d["n_recent"]
+        if d["n"] < CAL_MIN_SAMPLES or n_rec < 5:
             continue
-        at_rate = sum(at["actual"]) / n_at
-        rec = recent.get(stat, {"actual": []})
-        n_rec = len(rec["actual"])
-        if n_rec < 5:
-            continue
-        rec_rate = sum(rec["actual"]) / n_rec
+        at_rate = d["hits"] / d["n"]
+        rec_rate = d["recent_hits"] / n_rec
         drift = rec_rate - at_rate
         if abs(drift) >= threshold:
             alerts.append({
@@ -1613,43 +2561,26 @@ def get_calibration_drift(sport: str | None = None, days: int = 30,
     return sorted(alerts, key=lambda x: -abs(x["drift_pct"]))
 
 
+@_report_cache
 def get_line_value_analysis(sport: str | None = None) -> dict:
     """
     Split resolved legs into positive-edge (predicted > implied) and
     negative-edge groups, report hit rate for each.
     """
-    data = _load()
-    pos: list[dict] = []
-    neg: list[dict] = []
-    seen_props: set = set()
-    for parlay in data["parlays"]:
-        if sport and parlay.get("sport") != sport:
-            continue
-        for leg in parlay["legs"]:
-            if leg["outcome"] is None or leg["outcome"] == "void":
-                continue
-            prop = _prop_key(leg)
-            if prop in seen_props:
-                continue
-            seen_props.add(prop)
-            implied = _leg_implied(leg)
-            pred    = leg["predicted_hit_rate"]
-            edge    = pred - implied
-            entry   = {"edge": edge, "hit": leg["outcome"] is True,
-                       "stat": leg["stat_type"], "implied": implied, "predicted": pred}
-            (pos if edge > 0 else neg).append(entry)
-
-    def _summary(legs: list) -> dict | None:
-        if not legs:
+    props = _props(sport)
+    edge = props["predicted_hit_rate"] - props["implied"]
+    groups = _tally(edge > 0, hits=props["hit"], edge=edge)
+
+    def _summary(d: dict | None) -> dict | None:
+        if not d:
             return None
-        hits = sum(1 for l in legs if l["hit"])
         return {
-            "n":            len(legs),
-            "hit_rate_pct": round(hits / len(legs) * 100, 1),
-            "avg_edge_pct": round(sum(l["edge"] for l in legs) / len(legs) * 100, 1),
+            "n":            d["n"],
+            "hit_rate_pct": round(d["hits"] / d["n"] * 100, 1),
+            "avg_edge_pct": round(d["edge"] / d["n"] * 100, 1),
         }
 
     return {
-        "positive_edge": _summary(pos),
-        "negative_edge": _summary(neg),
+        "positive_edge": _summary(groups.get(True)),
+        "negative_edge": _summary(groups.get(False)),
     }